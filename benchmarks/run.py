@@ -0,0 +1,303 @@
+# -*- coding: utf-8 -*-
+# run.py
+"""Ytelsestester for spillmotoren, med sammenligning mot en lagret baseline.
+
+    python -m benchmarks.run                              # Kjør og skriv benchmarks/results.json
+    python -m benchmarks.run --update-baseline            # Lagre resultatet som baseline
+    python -m benchmarks.run --tolerance 0.15 --only games
+
+Avslutter med kode 1 hvis et mål er mer enn --tolerance dårligere enn baseline.
+"""
+
+import argparse
+import json
+import os
+import pickle
+import platform
+import random
+import sys
+import time
+import tracemalloc
+from game.rules import compile_rules, load_rulebook, clear_loaded
+from game.tuner import load_raw_rules
+from game.player import Player
+from game.engine import GameEngine
+from game.presenter import NullPresenter
+from game.server import GameSession
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_BASELINE = os.path.join(HERE, "baseline.json")
+DEFAULT_OUTPUT = os.path.join(HERE, "results.json")
+
+# navn -> (funksjon, enhet, høyere er bedre)
+BENCHMARKS = {}
+
+
+def benchmark(name, unit, higher_is_better=False):
+    def register(function):
+        BENCHMARKS[name] = (function, unit, higher_is_better)
+        return function
+    return register
+
+
+def best_of(function, repeat=5):
+    """Korteste tid (sekunder) av repeat kjøringer, så støy fra maskinen teller minst mulig"""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def ai_players(count):
+    return [Player(f"AI_{i+1}", is_human=False) for i in range(count)]
+
+
+class TurnCounter:
+    """Hendelsesmottaker som bare teller turer"""
+
+    def __init__(self):
+        self.turns = 0
+
+    def start(self, engine):
+        pass
+
+    def begin_turn(self, engine, seat):
+        self.turns += 1
+
+    def record(self, kind, *values):
+        pass
+
+    def game_over(self, engine, winner):
+        pass
+
+
+def play_games(game_data, num_players, num_games, seed=0, event_log=None, large_lobby=None):
+    places, cards, npcs = game_data
+    for game in range(num_games):
+        GameEngine(ai_players(num_players), places, cards, npcs, presenter=NullPresenter(),
+                   seed=seed + game, event_log=event_log, large_lobby=large_lobby).start_game()
+
+
+# ---- Oppstart og data ----
+
+@benchmark("data_compile_ms", "ms")
+def bench_data_compile(ctx):
+    raw = load_raw_rules(ctx.data_dir)
+    return best_of(lambda: compile_rules(*raw)) * 1e3
+
+
+@benchmark("data_load_cached_ms", "ms")
+def bench_data_load(ctx):
+    def load():
+        clear_loaded()
+        load_rulebook(ctx.data_dir)
+    load()  # Sørg for at cache-filen finnes
+    return best_of(load) * 1e3
+
+
+@benchmark("engine_startup_us", "µs")
+def bench_engine_startup(ctx):
+    places, cards, npcs = ctx.game_data
+    count = 200
+    return best_of(lambda: [GameEngine(ai_players(4), places, cards, npcs, presenter=NullPresenter(), seed=i)
+                            for i in range(count)]) / count * 1e6
+
+
+# ---- Hele spill ----
+
+def _games_per_sec(num_players):
+    def bench(ctx):
+        count = ctx.games
+        return count / best_of(lambda: play_games(ctx.game_data, num_players, count), repeat=3)
+    return bench
+
+
+for _players in (2, 3, 4):
+    benchmark(f"games_per_sec_{_players}p", "spill/s", higher_is_better=True)(_games_per_sec(_players))
+
+
+@benchmark("games_per_sec_50p_large", "spill/s", higher_is_better=True)
+def bench_large_lobby(ctx):
+    """Ett bord med 50 spillere i stor lobby (hvert spill er mange ganger lengre enn med 4)"""
+    count = max(1, ctx.games // 10)
+    return count / best_of(lambda: play_games(ctx.game_data, 50, count, large_lobby=True), repeat=3)
+
+
+@benchmark("turns_per_sec_4p", "turer/s", higher_is_better=True)
+def bench_turns(ctx):
+    counter = TurnCounter()
+    elapsed = best_of(lambda: play_games(ctx.game_data, 4, ctx.games, event_log=counter), repeat=3)
+    return counter.turns / 3 / elapsed
+
+
+# ---- Enkeltoperasjoner ----
+
+def _engine(ctx):
+    places, cards, npcs = ctx.game_data
+    engine = GameEngine(ai_players(4), places, cards, npcs, presenter=NullPresenter(), seed=1)
+    engine.setup_npcs()
+    engine.begin_phase(engine.phases[0])
+    return engine
+
+
+@benchmark("draw_cards_us", "µs")
+def bench_draw_cards(ctx):
+    engine = _engine(ctx)
+    count = 5000
+    return best_of(lambda: [engine.draw_cards(5) for _ in range(count)]) / count * 1e6
+
+
+@benchmark("roll_dice_us", "µs")
+def bench_roll_dice(ctx):
+    engine = _engine(ctx)
+    player = engine.players[0]
+    count = 20000
+    return best_of(lambda: [engine.roll_dice(player, 4) for _ in range(count)]) / count * 1e6
+
+
+@benchmark("card_play_us", "µs")
+def bench_card_play(ctx):
+    engine = _engine(ctx)
+    player = engine.players[0]
+    # Kort uten spesialeffekt og uten chugging, så bare selve kort-logikken måles
+    plain = [card for card in engine.cards if card.special_effect is None and card.kind is None]
+    count = 20000
+
+    def play():
+        for i in range(count):
+            player.promille_tenths = 0
+            plain[i % len(plain)].play(player, engine.current_place, engine)
+    return best_of(play) / count * 1e6
+
+
+# ---- Minne ----
+
+@benchmark("snapshot_bytes", "bytes")
+def bench_snapshot_size(ctx):
+    engine = _engine(ctx)
+    return len(pickle.dumps(engine.snapshot(), protocol=pickle.HIGHEST_PROTOCOL))
+
+
+@benchmark("engine_memory_kb", "KiB")
+def bench_engine_memory(ctx):
+    places, cards, npcs = ctx.game_data
+    count = 100
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    engines = [GameEngine(ai_players(4), places, cards, npcs, presenter=NullPresenter(), seed=i)
+               for i in range(count)]
+    for engine in engines:
+        engine.setup_npcs()
+        engine.begin_phase(engine.phases[0])
+    after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+    allocated = sum(stat.size_diff for stat in after.compare_to(before, "filename"))
+    return allocated / count / 1024
+
+
+# ---- Server ----
+
+@benchmark("lobby_actions_per_sec", "handlinger/s", higher_is_better=True)
+def bench_lobby(ctx):
+    """Mange samtidige bord i én prosess, med to ekte spillere per bord"""
+    rng = random.Random(0)
+
+    def play():
+        sessions = []
+        for session_id in range(ctx.lobby):
+            session = GameSession(session_id, ctx.rulebook, 4, seed=session_id)
+            session.join("A")
+            session.join("B")
+            session.start()
+            sessions.append(session)
+        actions = 0
+        while sessions:
+            for session in sessions:
+                seat = session.engine.players.index(session.pending.player)
+                session.act(seat, rng.choice(session.legal_choices()))
+                session.engine.presenter.take_lines()
+                actions += 1
+            sessions = [session for session in sessions if not session.finished]
+        return actions
+
+    start = time.perf_counter()
+    actions = play()
+    return actions / (time.perf_counter() - start)
+
+
+class Context:
+    def __init__(self, data_dir, games, lobby):
+        self.data_dir = data_dir
+        self.games = games
+        self.lobby = lobby
+        self.rulebook = load_rulebook(data_dir)
+        self.game_data = self.rulebook.game_data()
+
+
+def run(names, ctx, show=print):
+    results = {}
+    for name in names:
+        function, unit, higher_is_better = BENCHMARKS[name]
+        value = function(ctx)
+        results[name] = {"value": round(value, 3), "unit": unit, "higher_is_better": higher_is_better}
+        show(f"  {name:<24} {value:>12.3f} {unit}")
+    return results
+
+
+def compare(results, baseline, tolerance):
+    """Liste med (navn, baseline, nå, endring) for mål som er mer enn tolerance dårligere"""
+    regressions = []
+    for name, result in results.items():
+        if name not in baseline:
+            continue
+        old, new = baseline[name]["value"], result["value"]
+        if not old:
+            continue
+        change = (new - old) / old
+        worse = -change if result["higher_is_better"] else change
+        if worse > tolerance:
+            regressions.append((name, old, new, change))
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Ytelsestester for SMØR-motoren")
+    parser.add_argument("--data", default="data", help="Mappe med JSON-data")
+    parser.add_argument("--games", type=int, default=300, help="Spill per games/turns-måling")
+    parser.add_argument("--lobby", type=int, default=200, help="Samtidige bord i lobby-målingen")
+    parser.add_argument("--only", action="append", default=[], help="Kjør bare mål som inneholder denne teksten")
+    parser.add_argument("--output", default=DEFAULT_OUTPUT, help="Fil for resultatene (JSON)")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE, help="Baseline å sammenligne med")
+    parser.add_argument("--tolerance", type=float, default=0.10, help="Tillatt forverring (0.10 = 10 %%)")
+    parser.add_argument("--update-baseline", action="store_true", help="Lagre resultatene som ny baseline")
+    args = parser.parse_args(argv)
+
+    names = [name for name in BENCHMARKS if not args.only or any(part in name for part in args.only)]
+    print(f"⏱️  Kjører {len(names)} målinger (Python {platform.python_version()})")
+    results = run(names, Context(args.data, args.games, args.lobby))
+    report = {"python": platform.python_version(), "machine": platform.machine(), "results": results}
+
+    target = args.baseline if args.update_baseline else args.output
+    with open(target, "w", encoding="utf-8") as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+        f.write("\n")
+    print(f"\n💾 Skrev {target}")
+    if args.update_baseline or not os.path.exists(args.baseline):
+        return 0
+
+    with open(args.baseline, encoding="utf-8") as f:
+        baseline = json.load(f)["results"]
+    regressions = compare(results, baseline, args.tolerance)
+    if not regressions:
+        print(f"✅ Ingen mål er mer enn {args.tolerance:.0%} dårligere enn baseline")
+        return 0
+    print(f"❌ {len(regressions)} mål er mer enn {args.tolerance:.0%} dårligere enn baseline:")
+    for name, old, new, change in regressions:
+        print(f"  {name:<24} {old:>12.3f} -> {new:>12.3f} ({change:+.1%})")
+    return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
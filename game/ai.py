@@ -0,0 +1,186 @@
+# -*- coding: utf-8 -*-
+# ai.py
+
+import math
+import os
+import random
+import time
+from collections import deque
+from .player import ROLL_CHUG
+from .probability import chug_expectation
+
+
+class RandomAgent:
+    """Velger uniformt tilfeldig med motorens RNG (samme som standard-AI, men valgene logges)"""
+
+    def choose(self, engine, player, kind, num_options):
+        return engine.rng.randrange(num_options)
+
+
+class OddsAgent:
+    """Velger ut fra eksakte sannsynligheter der de avgjør valget (chugging), ellers tilfeldig"""
+
+    def choose(self, engine, player, kind, num_options):
+        if kind == "chug":
+            standard_bonus, chug_bonus, _ = player.dice_modifiers()[ROLL_CHUG]
+            return 0 if chug_expectation(standard_bonus + chug_bonus) > 0 else 1
+        return engine.rng.randrange(num_options)
+
+
+# Brukes for ekte spillere og andre agenter i rollouts, så de ikke blokkerer på input
+ROLLOUT_AGENT = RandomAgent()
+
+
+class _Node:
+    """Node i et open-loop søketre: statistikk for en sekvens av egne valg"""
+
+    __slots__ = ("visits", "value", "children")
+
+    def __init__(self):
+        self.visits = 0
+        self.value = 0.0
+        self.children = {}  # (kind, valg) -> _Node
+
+
+class _TreeWalker:
+    """Agent for søke-spilleren inne i en rollout: følger treet, utvider én node, spiller så tilfeldig"""
+
+    def __init__(self, root, seed, exploration, rng):
+        self.node = root
+        self.path = [root]
+        self.seed = seed
+        self.exploration = exploration
+        self.rng = rng
+        self.at_root = True
+
+    def choose(self, engine, player, kind, num_options):
+        if self.at_root:
+            # Turen er spilt på nytt frem til beslutningen; herfra trekkes nye utfall
+            engine.rng.seed(self.seed)
+            self.at_root = False
+        node = self.node
+        if node is None:
+            return engine.rng.randrange(num_options)
+
+        children = node.children
+        untried = [i for i in range(num_options) if (kind, i) not in children]
+        if untried:
+            # Utvid én ny node og spill resten tilfeldig
+            choice = self.rng.choice(untried)
+            child = children[(kind, choice)] = _Node()
+            self.path.append(child)
+            self.node = None
+            return choice
+
+        # UCB1 over valgene for denne beslutningen
+        total = sum(children[(kind, i)].visits for i in range(num_options))
+        log_total = math.log(total or 1)
+        best_score = -1.0
+        choice = 0
+        for i in range(num_options):
+            child = children[(kind, i)]
+            score = child.value / child.visits + self.exploration * math.sqrt(log_total / child.visits)
+            if score > best_score:
+                best_score = score
+                choice = i
+        self.node = children[(kind, choice)]
+        self.path.append(self.node)
+        return choice
+
+
+class MCTSAgent:
+    """Monte Carlo Tree Search-AI med fast tids- og/eller iterasjonsbudsjett per beslutning.
+
+    Hver iterasjon gjenoppretter snapshotet fra starten av turen, spiller turen på
+    nytt med de samme valgene frem til beslutningen, og kjører så en rask headless
+    rollout til spillet er slutt. Treet er open-loop (nøkkel er egne valg), så
+    undertreet for valget som ble tatt gjenbrukes ved neste beslutning.
+    """
+
+    def __init__(self, time_budget=0.05, iterations=None, exploration=1.0, seed=None):
+        self.time_budget = time_budget  # Sekunder per beslutning (None = kun iterasjoner)
+        self.iterations = iterations  # Maks antall rollouts per beslutning (None = kun tid)
+        self.exploration = exploration
+        seed = seed if seed is not None else int.from_bytes(os.urandom(8), "big")
+        self.rng = random.Random(seed)  # Egen RNG: søket rører aldri motorens RNG
+        self._engine = None
+        self._root = None
+        self.last_iterations = 0
+
+    def choose(self, engine, player, kind, num_options):
+        if num_options <= 1:
+            return 0
+        if engine is not self._engine or self._root is None:
+            # Nytt spill: start med et tomt tre
+            self._engine = engine
+            self._root = _Node()
+            engine.record_turns = True
+        root = self._root
+
+        if engine.turn_start is None:
+            choice = self.rng.randrange(num_options)
+        else:
+            self._search(engine, player, root)
+            choice = self._best_choice(root, kind, num_options)
+
+        # Gjenbruk undertreet for valget som ble tatt
+        self._root = root.children.setdefault((kind, choice), _Node())
+        return choice
+
+    def _search(self, engine, player, root):
+        """Kjør rollouts fra starten av turen til budsjettet er brukt opp"""
+        snapshot, decisions_before = engine.turn_start
+        prefix = engine.decisions[decisions_before:]
+        seat = engine.players.index(player)
+
+        twin = engine.clone()
+        twin.record_turns = False
+        for other in twin.players:
+            if other.is_human or other.agent is not None:
+                other.agent = ROLLOUT_AGENT
+        me = twin.players[seat]
+
+        start = time.perf_counter()
+        deadline = start + self.time_budget if self.time_budget is not None else None
+        max_iterations = self.iterations if self.iterations is not None else float("inf")
+        if deadline is None and max_iterations == float("inf"):
+            max_iterations = 100
+
+        done = 0
+        while done < max_iterations:
+            now = time.perf_counter()
+            # Ikke start en rollout som forventes å gå over tidsbudsjettet
+            if deadline is not None and done and now + (now - start) / done > deadline:
+                break
+            twin.restore(snapshot)
+            twin.decisions = []
+            twin.replay = deque(prefix)
+            walker = _TreeWalker(root, self.rng.getrandbits(64), self.exploration, self.rng)
+            me.agent = walker
+            twin.run()
+            reward = self._reward(twin.players, seat)
+            for node in walker.path:
+                node.visits += 1
+                node.value += reward
+            done += 1
+        self.last_iterations = done
+
+    def _reward(self, players, seat):
+        """1 for seier (delt seier deles), ellers 0"""
+        best = max(p.memory for p in players)
+        if players[seat].memory != best:
+            return 0.0
+        return 1.0 / sum(1 for p in players if p.memory == best)
+
+    def _best_choice(self, root, kind, num_options):
+        """Velg det mest besøkte valget (tilfeldig hvis søket ikke rakk noe)"""
+        best_visits = 0
+        choice = None
+        for i in range(num_options):
+            child = root.children.get((kind, i))
+            if child is not None and child.visits > best_visits:
+                best_visits = child.visits
+                choice = i
+        if choice is None:
+            choice = self.rng.randrange(num_options)
+        return choice
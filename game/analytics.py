@@ -0,0 +1,251 @@
+# -*- coding: utf-8 -*-
+# analytics.py
+
+import csv
+import os
+from array import array
+from .player import ROLL_TYPES
+from .eventlog import (EVENT_FORMATS, EV_PHASE, EV_TURN, EV_CARD, EV_ROLL, EV_NPC_GAIN, EV_NPC_LOSS, EV_VOMIT,
+                       EV_BOUNCER, EV_GAME_OVER, NO_TARGET, EventLogReader)
+
+# Sluttminner utenfor dette området telles i ytterste bøtte
+MEMORY_RANGE = (-20, 80)
+MAX_TURNS = 255
+
+EVENT_KINDS = {name: kind for kind, (name, _, _) in EVENT_FORMATS.items()}
+
+
+def _counters(size):
+    return array("q", bytes(8 * size))
+
+
+class BalanceStats:
+    """Strømmende balanse-statistikk over mange spill, i fast minne.
+
+    Brukes som hendelsesmottaker (GameEngine(..., event_log=stats)) eller mates med
+    hendelseslogger via consume_log(). Alle tellere er flate int64-arrayer indeksert
+    på (kort/NPC/sted/fase/kast-type), så størrelsen avhenger bare av regelsettet, og
+    delresultater fra flere prosesser slås sammen med merge().
+    """
+
+    def __init__(self):
+        self.names = None  # (kort, steder, NPC-er, faser); settes av første spill
+        self.games = 0
+        # Per spill som pågår
+        self.place = 0
+        self.phase = 0
+        self.turns = 0
+        self.npcs_held = []  # Per plass: NPC-id-er spilleren har nå
+        self.npc_places = []  # Per plass: (NPC, sted)-indekser spilleren har hatt NPC-en på
+        self.cards_played = []  # Per plass: (kort, sted, fase)-indekser spilt i dette spillet
+
+    def _allocate(self, cards, places, npcs, phases):
+        self.names = (list(cards), list(places), list(npcs), list(phases))
+        num_cards, num_places, num_npcs, num_phases = len(cards), len(places), len(npcs), len(phases)
+        cell = num_places * num_phases
+        self.num_places, self.num_phases, self.cells = num_places, num_phases, cell
+        self.card_plays = _counters(num_cards * cell)
+        self.card_winner_plays = _counters(num_cards * cell)
+        self.npc_games = _counters(num_npcs * num_places)
+        self.npc_wins = _counters(num_npcs * num_places)
+        self.npc_player_games = _counters(num_npcs)  # Hver (spiller, NPC) telles én gang per spill
+        self.npc_player_wins = _counters(num_npcs)
+        self.roll_attempts = _counters(len(ROLL_TYPES) * cell)
+        self.roll_successes = _counters(len(ROLL_TYPES) * cell)
+        self.phase_visits = _counters(cell)
+        self.vomits = _counters(cell)
+        self.bouncer_attempts = _counters(cell)
+        self.bouncer_denied = _counters(cell)
+        self.memory_histogram = _counters(MEMORY_RANGE[1] - MEMORY_RANGE[0] + 1)
+        self.turn_histogram = _counters(MAX_TURNS + 1)
+
+    # ---- Hendelsesmottaker (samme grensesnitt som EventLog) ----
+
+    def start(self, engine):
+        self.begin_game([card.name for card in engine.cards], [place.name for place in engine.places],
+                        [npc.name for npc in engine.npc_prototypes], engine.phases, len(engine.players))
+
+    def begin_game(self, cards, places, npcs, phases, num_players):
+        if self.names is None:
+            self._allocate(cards, places, npcs, phases)
+        elif self.names != (list(cards), list(places), list(npcs), list(phases)):
+            raise ValueError("Spillet bruker et annet regelsett enn statistikken")
+        self.place = self.phase = self.turns = 0
+        self.npcs_held = [[] for _ in range(num_players)]
+        self.npc_places = [set() for _ in range(num_players)]
+        self.cards_played = [[] for _ in range(num_players)]
+
+    def begin_turn(self, engine, seat):
+        self.turns += 1
+
+    def record(self, kind, *values):
+        cell = self.place * self.num_phases + self.phase
+        if kind == EV_CARD:
+            seat, card = values
+            index = card * self.cells + cell
+            self.card_plays[index] += 1
+            self.cards_played[seat].append(index)
+        elif kind == EV_ROLL and values[5] != NO_TARGET:  # Kast uten mål er verken forsøk eller feil
+            roll_type, success = values[1], values[6]
+            index = roll_type * self.cells + cell
+            self.roll_attempts[index] += 1
+            if success:
+                self.roll_successes[index] += 1
+        elif kind == EV_NPC_GAIN:
+            seat, npc = values
+            self.npcs_held[seat].append(npc)
+            self.npc_places[seat].add(npc * self.num_places + self.place)
+        elif kind == EV_NPC_LOSS:
+            seat, npc = values
+            self.npcs_held[seat].remove(npc)
+        elif kind == EV_PHASE:
+            self.phase, self.place = values
+            self.phase_visits[self.place * self.num_phases + self.phase] += 1
+            for seat, held in enumerate(self.npcs_held):
+                for npc in held:
+                    self.npc_places[seat].add(npc * self.num_places + self.place)
+        elif kind == EV_VOMIT:
+            self.vomits[cell] += 1
+        elif kind == EV_BOUNCER:
+            self.bouncer_attempts[cell] += 1
+            if not values[1]:
+                self.bouncer_denied[cell] += 1
+
+    def game_over(self, engine, winner):
+        """Avslutt spillet (engine er None når hendelsene kommer fra en logg uten sluttminner)"""
+        self.games += 1
+        self.turn_histogram[min(self.turns, MAX_TURNS)] += 1
+        if engine is not None:
+            low, high = MEMORY_RANGE
+            for player in engine.players:
+                self.memory_histogram[min(max(player.memory, low), high) - low] += 1
+        # Vinneren er den motoren kåret (første med flest minner ved delt seier)
+        for seat, pairs in enumerate(self.npc_places):
+            won = seat == winner
+            for index in pairs:
+                self.npc_games[index] += 1
+                if won:
+                    self.npc_wins[index] += 1
+            for npc in {index // self.num_places for index in pairs}:
+                self.npc_player_games[npc] += 1
+                if won:
+                    self.npc_player_wins[npc] += 1
+            if won:
+                for index in self.cards_played[seat]:
+                    self.card_winner_plays[index] += 1
+
+    # ---- Innlesing og sammenslåing ----
+
+    def consume_log(self, path):
+        """Legg til et spill fra en hendelseslogg (sluttminner finnes ikke i loggen)"""
+        reader = EventLogReader(path)
+        header = reader.header
+        self.begin_game(header["cards"], header["places"], header["npcs"], header["phases"], len(header["players"]))
+        for _, name, values in reader.events(0):
+            if name == "keyframe":
+                continue
+            kind = EVENT_KINDS[name]
+            if kind == EV_GAME_OVER:
+                self.game_over(None, values["winner"])
+            elif kind == EV_TURN:
+                self.begin_turn(None, values["player"])
+            else:
+                self.record(kind, *values.values())
+        return self
+
+    def merge(self, other):
+        """Slå sammen delresultater (f.eks. fra en annen prosess)"""
+        if other.names is None:
+            return self
+        if self.names is None:
+            self._allocate(*other.names)
+        elif self.names != other.names:
+            raise ValueError("Kan ikke slå sammen statistikk fra ulike regelsett")
+        self.games += other.games
+        for name in ("card_plays", "card_winner_plays", "npc_games", "npc_wins", "npc_player_games",
+                     "npc_player_wins", "roll_attempts",
+                     "roll_successes", "phase_visits", "vomits", "bouncer_attempts", "bouncer_denied",
+                     "memory_histogram", "turn_histogram"):
+            mine, theirs = getattr(self, name), getattr(other, name)
+            for index, value in enumerate(theirs):
+                if value:
+                    mine[index] += value
+        return self
+
+    def __getstate__(self):
+        # Per-spill-tilstanden trengs ikke når statistikken sendes mellom prosesser
+        state = dict(self.__dict__)
+        state.update(npcs_held=[], npc_places=[], cards_played=[])
+        return state
+
+    # ---- Eksport ----
+
+    def tables(self):
+        """Kolonnebaserte tabeller: {navn: {kolonne: liste}} (bare rader med data)"""
+        cards, places, npcs, phases = self.names
+        cells = [(place, phase) for place in places for phase in phases]
+
+        def table(columns, rows):
+            data = {column: [] for column in columns}
+            for row in rows:
+                for column, value in zip(columns, row):
+                    data[column].append(value)
+            return data
+
+        return {
+            "cards": table(("card", "place", "phase", "plays", "winner_plays"), (
+                (card, place, phase, self.card_plays[i], self.card_winner_plays[i])
+                for i, (card, (place, phase)) in enumerate((c, cell) for c in cards for cell in cells)
+                if self.card_plays[i])),
+            "npcs": table(("npc", "place", "player_games", "wins"), (
+                (npc, place, self.npc_games[i], self.npc_wins[i])
+                for i, (npc, place) in enumerate((n, p) for n in npcs for p in places) if self.npc_games[i])),
+            "npc_totals": table(("npc", "player_games", "wins"), (
+                (npc, self.npc_player_games[i], self.npc_player_wins[i])
+                for i, npc in enumerate(npcs) if self.npc_player_games[i])),
+            "rolls": table(("roll_type", "place", "phase", "attempts", "successes"), (
+                (roll_type, place, phase, self.roll_attempts[i], self.roll_successes[i])
+                for i, (roll_type, (place, phase)) in enumerate((r, cell) for r in ROLL_TYPES for cell in cells)
+                if self.roll_attempts[i])),
+            "places": table(("place", "phase", "visits", "vomits", "bouncer_attempts", "bouncer_denied"), (
+                (place, phase, self.phase_visits[i], self.vomits[i], self.bouncer_attempts[i], self.bouncer_denied[i])
+                for i, (place, phase) in enumerate(cells) if self.phase_visits[i])),
+            "memory": table(("memory", "players"), (
+                (MEMORY_RANGE[0] + i, count) for i, count in enumerate(self.memory_histogram) if count)),
+            "turns": table(("turns", "games"), (
+                (i, count) for i, count in enumerate(self.turn_histogram) if count)),
+        }
+
+    def to_numpy(self):
+        """Tabellene som {navn: {kolonne: numpy-array}} (krever numpy)"""
+        import numpy as np
+
+        return {name: {column: np.asarray(values) for column, values in columns.items()}
+                for name, columns in self.tables().items()}
+
+    def to_csv(self, directory):
+        """Skriv hver tabell til directory/<navn>.csv og returner filene"""
+        os.makedirs(directory, exist_ok=True)
+        paths = []
+        for name, columns in self.tables().items():
+            path = os.path.join(directory, f"{name}.csv")
+            with open(path, "w", newline="", encoding="utf-8") as f:
+                writer = csv.writer(f)
+                writer.writerow(columns)
+                writer.writerows(zip(*columns.values()))
+            paths.append(path)
+        return paths
+
+    def win_rate(self, npc, place):
+        """Andel spillere som vant blant dem som hadde NPC-en på stedet"""
+        _, places, npcs, _ = self.names
+        index = npcs.index(npc) * len(places) + places.index(place)
+        games = self.npc_games[index]
+        return self.npc_wins[index] / games if games else None
+
+    def roll_failure_rate(self, roll_type, place, phase):
+        """Andel mislykte kast av gitt type på stedet i fasen"""
+        _, places, _, phases = self.names
+        index = (ROLL_TYPES.index(roll_type) * len(places) + places.index(place)) * len(phases) + phases.index(phase)
+        attempts = self.roll_attempts[index]
+        return 1 - self.roll_successes[index] / attempts if attempts else None
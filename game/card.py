@@ -1,46 +1,59 @@
 # -*- coding: utf-8 -*-
 # card.py
 
+from .presenter import DEFAULT_PRESENTER
+from .effects import resolve_card_play
+from .eventlog import EV_CARD
+
 class Card:
-    def __init__(self, name, promille_change=0, minne_change=0, special_effect=None, display_text=""):
+    __slots__ = ("id", "name", "promille_change", "minne_change", "special_effect", "display_text", "kind")
+
+    def __init__(self, name, promille_change=0, minne_change=0, special_effect=None, display_text="", card_id=None, kind=None):
+        self.id = card_id  # Liten heltalls-id (indeks i kortlisten), brukes i snapshots
         self.name = name
         self.promille_change = promille_change
         self.minne_change = minne_change
         self.special_effect = special_effect  # spesialeffekt som "call_friend"
         self.display_text = display_text
+        self.kind = kind  # "beer", "drink" eller None; regler bruker dette i stedet for navnet
 
     def play(self, player, place, game_engine=None):
+        presenter = game_engine.presenter if game_engine else DEFAULT_PRESENTER
+
+        if game_engine and game_engine.event_log is not None:
+            game_engine.log_event(EV_CARD, player, self.id)
+
+        # Slå opp ferdig utregnet effekt for kort, sted, fase og spillerens NPC-effekter
+        if game_engine:
+            resolution = game_engine.card_effects.lookup(self, place, game_engine.current_phase, player.npc_flags())
+        else:
+            resolution = resolve_card_play(self, place, None, player.npc_flags())
+
         # Håndter chugging først for øl-kort
-        if self.name == "Drikk en øl" and game_engine:
+        if resolution.chug and game_engine:
             game_engine.handle_beer_chug(player)
-        
+
         # Endre promille og minner
-        player.add_promille(self.promille_change)
-        player.add_memory(self.minne_change)
+        player.add_promille(resolution.promille_change)
+        player.add_memory(resolution.minne_change)
         player.last_drink_card = self.name
-        player.last_card_promille = self.promille_change
-
-        print(f"{player.name} spiller {self.name} -> Promille: {player.promille}, Minne: {player.memory}")
-
-        # Sjekk om stedet gir ekstra effekt
-        current_phase = game_engine.current_phase if game_engine else None
-        place.apply_phase_effect(player, current_phase)
-        
-        # Sjekk NPC-effekter
-        enhanced_effect = None
-        for npc in player.npcs:
-            result = npc.apply_card_effects(player, self.name)
-            if result:
-                enhanced_effect = result
-        
+        player.last_card_promille = resolution.promille_change
+
+        presenter.say("{} spiller {} -> Promille: {}, Minne: {}", player.name, self.name, player.promille, player.memory)
+
+        # Ekstra effekter fra stedet og NPC-ene
+        for text, args, promille_change, minne_change, npc_flag in resolution.steps:
+            if presenter.verbose:
+                if npc_flag:
+                    npc_name = next(npc.name for npc in player.npcs if npc_flag in npc.effects)
+                    presenter.say(text, player.name, npc_name, *args)
+                else:
+                    presenter.say(text, player.name, *args)
+            if promille_change:
+                player.add_promille(promille_change)
+            if minne_change:
+                player.add_memory(minne_change)
+
         # Håndter spesialeffekter
-        if self.special_effect == "call_friend" and game_engine:
-            game_engine.offer_npc_interaction(player)
-        elif self.special_effect == "know_beer" and game_engine:
-            game_engine.handle_know_beer_effect(player, enhanced_effect)
-        elif self.special_effect == "bong_choice" and game_engine:
-            game_engine.handle_bong_choice(player)
-        elif self.special_effect == "round_drinks" and game_engine:
-            game_engine.handle_round_drinks(player)
-        elif self.special_effect == "icing" and game_engine:
-            game_engine.handle_icing(player)
+        if resolution.handler and game_engine:
+            getattr(game_engine, resolution.handler)(player, *resolution.handler_args)
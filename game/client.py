@@ -0,0 +1,82 @@
+# -*- coding: utf-8 -*-
+# client.py
+"""Enkel test-klient for spillserveren (står i for web-UI-et mot game/server.py)"""
+
+import asyncio
+import json
+import random
+
+
+async def _send(writer, message):
+    writer.write((json.dumps(message, ensure_ascii=False) + "\n").encode("utf-8"))
+    await writer.drain()
+
+
+async def _ask(prompt):
+    """Les en linje fra terminalen uten å blokkere event-loopen"""
+    return await asyncio.get_running_loop().run_in_executor(None, input, prompt)
+
+
+async def run_client(host="127.0.0.1", port=8765, name="Spiller", session=None, players=4, seed=None,
+                     bot=False, start=False, quiet=False):
+    """Koble til serveren og spill ett spill. Returnerer game_over-meldingen (eller None).
+
+    Uten session opprettes et nytt bord. Med bot=True velger klienten tilfeldig blant
+    de lovlige alternativene; med start=True startes spillet straks (ledige plasser blir AI).
+    """
+    rng = random.Random(seed)
+    show = (lambda *args: None) if quiet else print
+    reader, writer = await asyncio.open_connection(host, port)
+    try:
+        if session is None:
+            await _send(writer, {"type": "create", "name": name, "players": players, "seed": seed})
+        else:
+            await _send(writer, {"type": "join", "session": session, "name": name})
+
+        while True:
+            line = await reader.readline()
+            if not line:
+                show("🔌 Serveren koblet fra")
+                return None
+            message = json.loads(line)
+            kind = message["type"]
+
+            if kind == "joined":
+                show(f"🪑 Sesjon {message['session']}, plass {message['seat'] + 1}: {message['players']}")
+                if session is None:
+                    if not (start or bot):
+                        await _ask("Trykk Enter for å starte spillet (ledige plasser blir AI)...")
+                    await _send(writer, {"type": "start"})
+            elif kind == "log":
+                for text in message["lines"]:
+                    show(text)
+            elif kind == "waiting":
+                show(f"⏳ Venter på {message['player']} ({message['kind']})...")
+            elif kind == "prompt":
+                options = message["options"]
+                if bot:
+                    choice = rng.choice(options)["choice"]
+                else:
+                    state = message["state"]
+                    show(f"\n📍 {state['place']} ({state['phase']})")
+                    for number, option in enumerate(options, 1):
+                        show(f"  {number}. {option['label']}")
+                    choice = None
+                    while choice is None:
+                        answer = (await _ask(f"🎯 Velg ({message['kind']}): ")).strip()
+                        if answer.isdigit() and 1 <= int(answer) <= len(options):
+                            choice = options[int(answer) - 1]["choice"]
+                        else:
+                            show("❌ Ugyldig valg!")
+                await _send(writer, {"type": "action", "choice": choice})
+            elif kind == "state":
+                show(json.dumps(message["state"], ensure_ascii=False, indent=2))
+            elif kind == "error":
+                show(f"❌ {message['message']}")
+            elif kind == "game_over":
+                show(f"\n🏁 Vinner: {message['winner']}")
+                for row in message["standings"]:
+                    show(f"  {row['name']:<12} {row['memory']:>3} minner  {row['promille']:.1f} promille")
+                return message
+    finally:
+        writer.close()
@@ -0,0 +1,145 @@
+# -*- coding: utf-8 -*-
+# clock.py
+"""Animasjonsklokke: alle pauser i terminal-spillet går gjennom AnimationClock.sleep().
+
+- scale ganges med alle pauser (0.5 = dobbel fart, 0 = ingen pauser)
+- Når ingen ekte spillere har noe å gjøre (rene AI-spill, eller alle ekte spillere er
+  ferdige med kortene i fasen) spoles det automatisk med fast_forward
+- Et tastetrykk under en pause hopper over resten av animasjonen, helt til spillet
+  spør en ekte spiller om noe igjen. Tastetrykket leses mens klokken uansett venter,
+  så motoren blir aldri blokkert av at ingen trykker
+- Det som skrives under animasjonen tas vare på og blir starten av neste svar (vises
+  etter spørsmålet). Mellomrom og Enter først er bare for å hoppe over og tas bort
+"""
+
+import os
+import sys
+import time
+
+# Skalering av pausene når ingen ekte spillere følger med
+FAST_FORWARD = 0.05
+
+# Pauser kortere enn dette (sekunder) sover uten å lytte etter tastetrykk
+MIN_KEY_WAIT = 0.01
+
+
+class AnimationClock:
+    """Felles klokke for alle pauser og animasjoner i en presenter"""
+
+    def __init__(self, scale=1.0, fast_forward=FAST_FORWARD, skip_on_key=True):
+        self.scale = scale
+        self.fast_forward = fast_forward
+        self.engine = None  # Motoren som følges (for automatisk spoling)
+        self.humans = []  # Ekte spillere i motoren (så en stor lobby ikke gås gjennom for hver pause)
+        self.skipping = False  # Et tastetrykk har hoppet over resten av animasjonen
+        self.typed = ""  # Det som er skrevet under animasjonen, til neste svar
+        self.keys = _KeyWatcher.for_stdin() if skip_on_key else None
+
+    def watch(self, engine):
+        """Følg motoren, så klokken kan spole når ingen ekte spillere venter på noe"""
+        self.engine = engine
+        self.humans = [player for player in engine.players if player.is_human]
+
+    def factor(self):
+        """Hvor mye pausene skal skaleres akkurat nå (0 = hopp over)"""
+        if self.skipping:
+            return 0.0
+        engine = self.engine
+        if engine is not None and not self._humans_watching(engine, self.humans):
+            return self.scale * self.fast_forward
+        return self.scale
+
+    @staticmethod
+    def _humans_watching(engine, humans):
+        """True hvis en ekte spiller fortsatt har noe å gjøre (mellom faser følger alle med)"""
+        if engine.turn_index is None:
+            return bool(humans)
+        return any(player.hand for player in humans)
+
+    def sleep(self, duration):
+        """Vent duration sekunder skalert (avbrytes av et tastetrykk)"""
+        duration *= self.factor()
+        if duration <= 0:
+            return
+        if self.keys is None or duration < MIN_KEY_WAIT:
+            time.sleep(duration)
+            return
+        typed = self.keys.wait(duration)
+        if typed:
+            self.skipping = True
+            for char in typed:
+                if char in "\x7f\b":
+                    self.typed = self.typed[:-1]
+                else:
+                    self.typed += char
+
+    def reset(self):
+        """Ny animasjon (kalles før spillet spør en ekte spiller om noe)"""
+        self.skipping = False
+
+    def typed_answer(self):
+        """(tekst, ferdig): svaret som ble skrevet under animasjonen; ferdig hvis Enter ble trykket etter det"""
+        line, newline, self.typed = self.typed.lstrip().partition("\n")
+        return line, bool(newline)
+
+
+class _KeyWatcher:
+    """Venter på tastetrykk fra terminalen med tidsavbrudd (uten å vente på Enter)"""
+
+    @staticmethod
+    def for_stdin():
+        """KeyWatcher for stdin, eller None hvis stdin ikke er en terminal"""
+        try:
+            if not sys.stdin.isatty():
+                return None
+        except (AttributeError, ValueError):
+            return None
+        if os.name == "nt":
+            return _WindowsKeys()
+        try:
+            import termios  # noqa: F401
+        except ImportError:
+            return None
+        return _PosixKeys(sys.stdin.fileno())
+
+
+class _PosixKeys(_KeyWatcher):
+    def __init__(self, fd):
+        self.fd = fd
+
+    def wait(self, timeout):
+        """Sov i timeout sekunder, eller til en tast trykkes; returner det som ble skrevet ("" = ingenting).
+
+        Tastene leses uten ekko; AnimationClock viser dem igjen etter neste spørsmål.
+        Også det som ble skrevet mens klokken ikke lyttet (korte pauser) leses her.
+        """
+        import select
+        import termios
+        import tty
+
+        old = termios.tcgetattr(self.fd)
+        try:
+            tty.setcbreak(self.fd, termios.TCSANOW)
+            ready, _, _ = select.select([self.fd], [], [], timeout)
+            if not ready:
+                return ""
+            return os.read(self.fd, 1024).decode("utf-8", errors="ignore")
+        finally:
+            termios.tcsetattr(self.fd, termios.TCSADRAIN, old)
+
+
+class _WindowsKeys(_KeyWatcher):
+    def wait(self, timeout):
+        import msvcrt
+
+        deadline = time.monotonic() + timeout
+        while True:
+            if msvcrt.kbhit():
+                typed = ""
+                while msvcrt.kbhit():
+                    typed += msvcrt.getwch()
+                return typed.replace("\r", "\n")  # Se _PosixKeys.wait
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return ""
+            time.sleep(min(remaining, 0.02))
@@ -1,13 +1,97 @@
-# game/deck.py
-from .card import Card
-
-def create_deck():
-    """Lag en enkel demo-deck med kort og effektfunksjoner"""
-    deck = [
-        Card("Drikk en øl", promille_change=0.5),
-        Card("Drikk vann", promille_change=-0.5),
-        Card("Karaoke", minne_change=1),
-    ] * 5  # 5 kopier av hver for demo
-    import random
-    random.shuffle(deck)
-    return deck
+# -*- coding: utf-8 -*-
+# deck.py
+
+
+class Deck:
+    """Kortstokk med kastebunke, lagret som kort-id-er over delte, uforanderlige kortprototyper.
+
+    Toppen av bunken er slutten av listen. Når bunken er tom stokkes kastebunken inn
+    igjen; er begge tomme (alle kort er på hendene) åpnes et nytt sett med kort.
+    Stokkingen tar motorens RNG som argument, så kopier av spillet aldri deler RNG.
+
+    counts holder antall igjen i trekkbunken per kort-id (bunken som multimengde),
+    så korttelling er eksakt og bytte-tilbud kan trekkes uten å se gjennom bunken.
+    """
+
+    __slots__ = ("cards", "copies", "pile", "discard_pile", "counts")
+
+    def __init__(self, cards, copies=5):
+        self.cards = cards  # Prototyper, indeksert på kort-id
+        self.copies = copies  # Kopier av hvert kort per sett
+        self.pile = []  # Trekkbunke (kort-id-er)
+        self.discard_pile = []  # Spilte og kastede kort (kort-id-er)
+        self.counts = [0] * len(cards)  # Kort-id -> antall i trekkbunken
+
+    def __len__(self):
+        return len(self.pile)
+
+    def remaining(self, card):
+        """Antall eksemplarer av kortet som er igjen i trekkbunken"""
+        return self.counts[card.id]
+
+    def open_new_set(self, rng):
+        """Legg et helt sett med kort i bunken og stokk"""
+        self.pile.extend([card.id for card in self.cards for _ in range(self.copies)])
+        for card in self.cards:
+            self.counts[card.id] += self.copies
+        rng.shuffle(self.pile)
+
+    def reshuffle(self, rng):
+        """Stokk kastebunken inn som ny trekkbunke (på stedet, uten nye lister)"""
+        self.pile, self.discard_pile = self.discard_pile, self.pile
+        for card_id in self.pile:
+            self.counts[card_id] += 1
+        rng.shuffle(self.pile)
+
+    def draw(self, rng):
+        """Trekk det øverste kortet (prototypen)"""
+        if not self.pile:
+            if self.discard_pile:
+                self.reshuffle(rng)
+            else:
+                self.open_new_set(rng)
+        card_id = self.pile.pop()
+        self.counts[card_id] -= 1
+        return self.cards[card_id]
+
+    def draw_offers(self, num, rng):
+        """Trekk num tilfeldige kort fra bunken uten tilbakelegging (O(1) per kort)"""
+        pile = self.pile
+        offers = []
+        for _ in range(num):
+            # Bytt et tilfeldig kort til toppen og ta det
+            index = rng.randrange(len(pile))
+            pile[index], pile[-1] = pile[-1], pile[index]
+            card_id = pile.pop()
+            self.counts[card_id] -= 1
+            offers.append(self.cards[card_id])
+        return offers
+
+    def put_back(self, card, rng):
+        """Legg et kort tilbake på en tilfeldig plass i bunken (O(1))"""
+        pile = self.pile
+        pile.append(card.id)
+        self.counts[card.id] += 1
+        index = rng.randrange(len(pile))
+        pile[index], pile[-1] = pile[-1], pile[index]
+
+    def discard(self, card):
+        """Legg et kort i kastebunken"""
+        self.discard_pile.append(card.id)
+
+    def copy(self):
+        """Ny kortstokk med samme kort og innhold"""
+        twin = Deck(self.cards, self.copies)
+        twin.pile = list(self.pile)
+        twin.discard_pile = list(self.discard_pile)
+        twin.counts = list(self.counts)
+        return twin
+
+    def snapshot(self):
+        return bytes(self.pile), bytes(self.discard_pile), bytes(self.counts)
+
+    def restore(self, state):
+        pile, discard_pile, counts = state
+        self.pile[:] = pile
+        self.discard_pile[:] = discard_pile
+        self.counts[:] = counts
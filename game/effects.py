@@ -0,0 +1,125 @@
+# -*- coding: utf-8 -*-
+# effects.py
+
+# NPC-effekter som endrer kortspill; hver får én bit i spillerens NPC-maske
+NPC_CARD_FLAGS = ("double_beer", "enhance_know_beer")
+NPC_FLAG_BITS = {flag: 1 << bit for bit, flag in enumerate(NPC_CARD_FLAGS)}
+
+# special_effect i kortdataene -> metode i GameEngine som håndterer effekten
+SPECIAL_HANDLERS = {
+    "call_friend": "offer_npc_interaction",
+    "know_beer": "handle_know_beer_effect",
+    "bong_choice": "handle_bong_choice",
+    "round_drinks": "handle_round_drinks",
+    "icing": "handle_icing",
+}
+
+# Kort-typer (kind i cards.json) som regnes som øl/drink av sted- og NPC-effekter
+DRINK_KINDS = ("beer", "drink")
+
+# Kompilerte tabeller, delt mellom alle motorer som bruker de samme kort/steder
+_compiled = {}
+
+
+def npc_flag_mask(npcs):
+    """Bitmaske over hvilke kort-relevante NPC-effekter spilleren har"""
+    mask = 0
+    for npc in npcs:
+        for effect_key in npc.effects:
+            mask |= NPC_FLAG_BITS.get(effect_key, 0)
+    return mask
+
+
+class CardResolution:
+    """Ferdig utregnet effekt av ett kort på ett sted, i én fase, med gitte NPC-effekter.
+
+    steps er ekstra effekter fra sted og NPC-er i samme rekkefølge som før:
+    (melding, meldings-argumenter, promille, minner, NPC-effekt). Meldingen formateres
+    med spillerens navn først, og NPC-ens navn etter hvis steget kommer fra en NPC-effekt.
+    """
+
+    __slots__ = ("chug", "promille_change", "minne_change", "steps", "handler", "handler_args")
+
+    def __init__(self, chug, promille_change, minne_change, steps, handler, handler_args):
+        self.chug = chug  # Øl-kort: spilleren får tilbud om å chugge først
+        self.promille_change = promille_change
+        self.minne_change = minne_change
+        self.steps = steps
+        self.handler = handler  # Navn på metode i GameEngine, eller None
+        self.handler_args = handler_args
+
+    def fields(self):
+        return (self.chug, self.promille_change, self.minne_change, self.steps, self.handler, self.handler_args)
+
+    def __reduce__(self):
+        # Kompakt pickle (regel-cachen har hundrevis av slike)
+        return CardResolution, self.fields()
+
+
+def resolve_card_play(card, place, phase, npc_mask):
+    """Regn ut hva som skjer når kortet spilles (brukes når tabellen kompileres)"""
+    steps = []
+    is_drink = card.kind in DRINK_KINDS
+
+    # Sted-effekter
+    if place.effects.get("beer_double") and is_drink:
+        steps.append(("{0} får dobbel promille på grunn av {1}!", (place.name,), card.promille_change, 0, None))
+
+    # Oslo Plaza effekt: øl-kort telles som drink-kort (0.5% 1m)
+    if place.effects.get("beer_as_drink") and card.kind == "beer":
+        # Øl gir normalt 0.5% promille, drink gir 0.5% promille + 1 minnepoeng
+        # Så vi legger til 1 minnepoeng (som drink-kortet ville gitt)
+        steps.append(("{0} får drink-effekt på øl-kortet på grunn av {1}!", (place.name,), 0, 1, None))
+
+    # Herslebs Vors-effekt: +0.5 bonus på promille-kort
+    if place.effects.get("vors_promille_bonus") and phase == "Vors" and card.promille_change > 0:
+        bonus = place.effects["vors_promille_bonus"]
+        steps.append(("{0} får {2} ekstra promille på grunn av {1} (Vors)!", (place.name, bonus), bonus, 0, None))
+
+    # NPC-effekter
+    if npc_mask & NPC_FLAG_BITS["double_beer"] and is_drink:
+        steps.append(("{1} dobler {2}-effekten for {0}!", (card.name.lower(),), 0.5, 0, "double_beer"))
+
+    handler = SPECIAL_HANDLERS.get(card.special_effect)
+    handler_args = ()
+    if card.special_effect == "know_beer" and npc_mask & NPC_FLAG_BITS["enhance_know_beer"]:
+        # Sjefen sin spesialeffekt for "Kjenner dere ølet!"
+        steps.append(("{1} forsterker effekten av '{2}'!", (card.name,), 0, 0, "enhance_know_beer"))
+        handler_args = ("enhanced_know_beer",)  # Signal til GameEngine om forsterket effekt
+
+    return CardResolution(card.kind == "beer", card.promille_change, card.minne_change,
+                          tuple(steps), handler, handler_args)
+
+
+class CardEffectTable:
+    """Alle kortspill forhåndsregnet, nøkkel (kort-id, steds-id, fase, NPC-maske)"""
+
+    def __init__(self, cards, places, phases):
+        self.entries = {}
+        shared = {}  # Like utfall deler samme objekt
+        for card in cards:
+            for place in places:
+                for phase in phases:
+                    for npc_mask in range(1 << len(NPC_CARD_FLAGS)):
+                        resolution = resolve_card_play(card, place, phase, npc_mask)
+                        resolution = shared.setdefault(resolution.fields(), resolution)
+                        self.entries[(card.id, place.id, phase, npc_mask)] = resolution
+
+    def lookup(self, card, place, phase, npc_mask):
+        return self.entries[(card.id, place.id, phase, npc_mask)]
+
+
+def register_card_effects(table, cards, places, phases):
+    """Gjenbruk en ferdig kompilert tabell (f.eks. fra regel-cachen) for disse objektene"""
+    _compiled[(tuple(cards), tuple(places), tuple(phases))] = table
+
+
+def compile_card_effects(cards, places, phases):
+    """Kompiler (eller gjenbruk) tabellen for disse kort-/stedsobjektene"""
+    key = (tuple(cards), tuple(places), tuple(phases))
+    table = _compiled.get(key)
+    if table is None:
+        if len(_compiled) >= 32:
+            _compiled.clear()  # Mange ulike regelsett (f.eks. balansering): ikke hold på alle
+        table = _compiled[key] = CardEffectTable(cards, places, phases)
+    return table
@@ -1,586 +1,676 @@
 # -*- coding: utf-8 -*-
 # game_engine.py
 
+import copy
+import os
 import random
-import time
-from .player import Player
-from .card import Card
+from bisect import bisect_left
+from collections import deque
+from .player import Player, ROLL_SKILL, ROLL_RESCUE, ROLL_BOUNCER, ROLL_AUCTION, ROLL_CHUG, ROLL_ICING
+from .deck import Deck
 from .place import Place
-from .npc import NPC
+from .npc import NPCPool
+from .rules import PHASES
+from .presenter import NullPresenter, TerminalPresenter
+from .effects import compile_card_effects
+from .probability import roll_success, auction_odds, icing_matches
+from .eventlog import (EV_PHASE, EV_ROLL, EV_NPC_GAIN, EV_NPC_LOSS, EV_VOMIT, EV_BOUNCER, ROLL_TYPE_IDS,
+                       NO_TARGET)
+from .lobby import LARGE_LOBBY, Leaderboard, summarize_names
+
+# Presenter for utskrift som slås sammen til et sammendrag i stor lobby
+QUIET = NullPresenter()
+
+SPECIAL_OPTIONS = -1  # Kortvalg som åpner menyen for spesielle alternativer (tast 9)
+NO_CHOICE = -1  # Ekte spiller valgte "Ikke nå"/ugyldig alternativ
+
+# action_description i roll_dice -> kast-type i spillerens bonustabell (resten er ferdighetskast)
+ROLL_TYPE_BY_ACTION = {"redningskast": ROLL_RESCUE, "å komme inn": ROLL_BOUNCER}
 
 class GameEngine:
-    def __init__(self, players, places, cards, npcs_data):
+    def __init__(self, players, places, cards, npcs, presenter=None, seed=None, replay=None, ai_trading=False,
+                 event_log=None, profiler=None, large_lobby=None):
         self.players = players
+        # Stor lobby (game/lobby.py): sammendrag, gruppekast og leaderboard. Standard: flere enn 4 spillere
+        self.large_lobby = len(players) > LARGE_LOBBY if large_lobby is None else large_lobby
+        self.leaderboard = Leaderboard(players) if self.large_lobby else None
         self.places = places
         self.cards = cards
-        self.npcs_data = npcs_data  # NPC-data fra JSON
-        self.phases = ["Vors", "Fest", "Nach"]
+        # Kort og steder får små heltalls-id-er (indeks), så tilstanden kan lagres kompakt
+        for card_id, card in enumerate(cards):
+            card.id = card_id
+        for place_id, place in enumerate(places):
+            place.id = place_id
+        # NPC-prototyper fra regelsettet; NPC-er i spillet er delte, uforanderlige objekter
+        self.npc_prototypes = npcs
+        for npc_id, npc in enumerate(npcs):
+            npc.id = npc_id
+        self.presenter = presenter or TerminalPresenter()  # All utskrift, input og pauser
+        self.presenter.attach(self)
+        # Egen RNG per motor: all terning, stokking og AI-valg trekkes herfra
+        self.seed = seed if seed is not None else int.from_bytes(os.urandom(8), "big")
+        self.rng = random.Random(self.seed)
+        self.decisions = []  # Valg fra ekte spillere og agenter (0-baserte indekser), for replay
+        self.replay = deque(replay or ())  # Logg med valg som spilles av før spillerne blir spurt
+        self.ai_trading = ai_trading  # AI kan velge spesielle alternativer (bytte kort, sende vekk venn)
+        self.phases = list(PHASES)
         self.current_phase_index = 0
+        self.current_phase = self.phases[0]
+        # Kort-effekter forhåndsregnet per (kort, sted, fase, NPC-maske)
+        self.card_effects = compile_card_effects(cards, places, self.phases)
+        self.turn_index = None  # Hvem sin tur det er i fasen (None før fasen har startet)
+        # Snapshot + antall valg ved starten av hver tur, slik at søk-agenter kan spille turen på nytt
+        self.record_turns = any(player.agent is not None for player in players)
+        self.turn_start = None
         self.current_place = places[0]
         self.npcs_in_town = []  # NPC-er "ute på byen"
-        self.deck = self.create_deck()
-        self.visited_places = set()  # Spor hvilke steder som er besøkt
-        self.used_npcs = set()  # Spor hvilke NPC-er som er i bruk
-
-    def create_deck(self):
-        """Opprett en kortstokk med alle kort"""
-        deck = []
-        for card_data in self.cards:
-            # Legg til flere kopier av hvert kort
-            for _ in range(5):  # 5 kopier av hvert kort
-                deck.append(Card(
-                    card_data.name, 
-                    card_data.promille_change, 
-                    card_data.minne_change,
-                    getattr(card_data, 'special_effect', None),
-                    getattr(card_data, 'display_text', '')
-                ))
-        random.shuffle(deck)
-        return deck
-
-    def typewriter_print(self, text, speed=0.03):
+        self.trade_offers = ()  # Kortene som tilbys i et kortbytte mens spilleren velger (for agenter)
+        # Kortstokken er id-er over de delte kortprototypene i self.cards
+        self.cards_by_name = {card.name: card for card in cards}
+        self.deck = Deck(cards)
+        self.deck.open_new_set(self.rng)
+        self.visited_places = set()  # Spor hvilke steder (id) som er besøkt
+        self.npc_pool = NPCPool(self.npc_prototypes)  # NPC-er som ikke er i bruk
+        # Mottaker av alle tilstandsendrende hendelser (EventLog, BalanceStats) eller None
+        self.event_log = event_log
+        if event_log is not None:
+            event_log.start(self)
+        # Profiler som måler metodene i denne motoren (game/profiler.py) eller None
+        self.profiler = None
+        if profiler is not None:
+            profiler.attach(self)
+
+    def snapshot(self):
+        """Kompakt, uforanderlig øyeblikksbilde av hele spilltilstanden.
+
+        Kort, NPC-er og steder lagres som id-bytes og promille som tideler, så et
+        snapshot er billig å ta, gjenopprette, sammenligne og pickle.
+        """
+        return (self.rng.getstate(), self.current_phase_index, self.current_phase, self.turn_index,
+                self.current_place.id, bytes(sorted(self.visited_places)), self.npc_pool.snapshot(),
+                bytes([npc.id for npc in self.npcs_in_town]), self.deck.snapshot(),
+                tuple([player.snapshot() for player in self.players]))
+
+    def restore(self, snapshot):
+        """Gjenopprett spilltilstanden fra snapshot() (spillerne må være de samme)"""
+        (rng_state, self.current_phase_index, self.current_phase, self.turn_index,
+         place_id, visited, pool, town, deck, players) = snapshot
+        self.rng.setstate(rng_state)
+        self.current_place = self.places[place_id]
+        self.visited_places = set(visited)
+        self.npc_pool.restore(pool)
+        self.npcs_in_town = [self.npc_prototypes[i] for i in town]
+        self.deck.restore(deck)
+        for player, state in zip(self.players, players):
+            player.restore(state, self.cards, self.npc_prototypes)
+        if self.leaderboard is not None:
+            self.leaderboard = Leaderboard(self.players)  # Minnene er satt direkte
+
+    def clone(self, presenter=None):
+        """Lag en uavhengig kopi av spillet (deler kort, steder og NPC-prototyper).
+
+        Kopien får NullPresenter hvis ingen annen oppgis, og kan spilles videre med run().
+        """
+        twin = copy.copy(self)
+        twin.presenter = presenter or NullPresenter()
+        twin.event_log = None  # Søk i kopier skal ikke havne i loggen
+        if self.profiler is not None:
+            self.profiler.detach(twin)  # Heller ikke i målingene
+        twin.players = [Player(player.name, player.is_human, player.agent) for player in self.players]
+        twin.deck = self.deck.copy()
+        twin.npc_pool = NPCPool(self.npc_prototypes)
+        twin.rng = random.Random(0)
+        twin.decisions = list(self.decisions)
+        twin.replay = deque()
+        twin.restore(self.snapshot())
+        return twin
+
+    def decide(self, player, kind, num_options, ask=None):
+        """Hent et valg (0-basert indeks) for spilleren.
+
+        kind beskriver beslutningen ("card", "npc", "chug", "bong", "discard", ...).
+        ask brukes for ekte spillere og skal returnere en gyldig indeks; spillere med
+        agent spør agenten. Tilfeldige AI-valg trekkes fra motorens RNG og følger
+        dermed av seed; alle andre valg logges i self.decisions slik at
+        (seed, decisions) spiller av spillet nøyaktig.
+        """
+        if player.agent is None and not player.is_human:
+            return self.rng.randrange(num_options)
+        if self.replay:
+            choice = self.replay.popleft()
+        elif player.agent is not None:
+            choice = player.agent.choose(self, player, kind, num_options)
+        else:
+            choice = ask()
+        self.decisions.append(choice)
+        return choice
+
+    def ask_number(self, prompt, low, high, invalid="❌ Ugyldig valg!", exclude=None):
+        """Spør en ekte spiller om et tall mellom low og high til svaret er gyldig"""
+        while True:
+            try:
+                choice = int(self.presenter.ask(prompt))
+                if low <= choice <= high and choice != exclude:
+                    return choice
+                self.presenter.say(invalid)
+            except ValueError:
+                self.presenter.say("❌ Vennligst skriv inn et tall!")
+
+    def typewriter_print(self, text, *args, speed=0.03):
         """Skriv ut tekst bokstav for bokstav med typewriter-effekt"""
-        for char in text:
-            print(char, end="", flush=True)
-            time.sleep(speed)
-        print()  # Ny linje etter teksten
+        self.presenter.typewriter(text, *args, speed=speed)
 
-    def loading_effect(self, message, duration=1.5):
+    def loading_effect(self, message, *args, duration=1.5):
         """Vis en loading-effekt med melding"""
-        print(f"⏳ {message}", end="", flush=True)
-        time.sleep(duration)
-        print(" ✅")
+        self.presenter.loading(message, *args, duration=duration)
+
+    def log_event(self, kind, player, *values):
+        """Skriv en hendelse for spilleren til hendelsesloggen (hvis spillet logges)"""
+        if self.event_log is not None:
+            self.event_log.record(kind, self.players.index(player), *values)
+
+    def log_roll(self, player, roll_type, base_roll, bonus, special_bonus, target_number, success):
+        if self.event_log is not None:
+            self.event_log.record(EV_ROLL, self.players.index(player), ROLL_TYPE_IDS[roll_type], base_roll,
+                                  bonus, special_bonus, target_number, success)
 
     def quick_delay(self, duration=0.8):
         """Kort delay for bedre flyt"""
-        time.sleep(duration)
+        self.presenter.quick_delay(duration)
 
     def long_delay(self, duration=1.2):
         """Lengre delay for viktige hendelser"""
-        time.sleep(duration)
-
-    def show_place_effects(self):
-        """Vis sted-effekter på en lesbar måte basert på JSON-data"""
-        effects_text = []
-        
-        # Gå gjennom alle effekter og bruk beskrivelser fra JSON
-        for effect_key, effect_value in self.current_place.effects.items():
-            if effect_key in self.current_place.effect_descriptions:
-                # Sjekk om effekten gjelder for nåværende fase
-                show_effect = True
-                
-                # Herslebs Vors-effekt: vis kun i Vors-fase
-                if effect_key == "vors_promille_bonus" and self.current_phase != "Vors":
-                    show_effect = False
-                
-                # Herslebs Nach-effekt: vis kun i Nach-fase
-                if effect_key == "nach_rescue_threshold" and self.current_phase != "Nach":
-                    show_effect = False
-                
-                if show_effect:
-                    # Bruk beskrivelse fra JSON
-                    description = self.current_place.effect_descriptions[effect_key]
-                    # Erstatt eventuelle placeholders med faktiske verdier
-                    if isinstance(effect_value, (int, float)) and effect_value != 0:
-                        description = description.replace("1", str(effect_value))
-                    effects_text.append(description)
-        
-        if effects_text:
-            self.typewriter_print(f"⚡ Sted-effekter: {', '.join(effects_text)}")
-        else:
-            self.typewriter_print("⚡ Ingen spesielle sted-effekter")
+        self.presenter.long_delay(duration)
 
     def handle_bouncer(self):
         """Håndter dørvakt for alle spillere"""
-        self.typewriter_print(f"\n🚪 DØRVAKT PÅ {self.current_place.name.upper()}")
+        self.typewriter_print("\n🚪 DØRVAKT PÅ {}", self.current_place.name.upper())
         self.typewriter_print("Alle spillere må kaste terning for å komme inn!")
         self.typewriter_print("Du må kaste høyere enn din promille for å komme inn.")
         self.long_delay()
-        
+
+        if self.large_lobby:
+            self.handle_group_bouncer()
+            return
+
         for player in self.players:
             # Target er spilleren sin promille (rundet opp)
             target_number = int(player.promille) + 1
-            self.typewriter_print(f"\n🎲 {player.name} prøver å komme inn...")
-            self.typewriter_print(f"Du må kaste {target_number} eller høyere (promille: {player.promille})")
+            self.typewriter_print("\n🎲 {} prøver å komme inn...", player.name)
+            self.typewriter_print("Du må kaste {} eller høyere (promille: {})", target_number, player.promille)
             self.long_delay()
-            
+
             # Bruk generell terningkast-metode med standard target
-            if self.roll_dice(player, target_number=target_number, action_description="å komme inn"):
-                self.typewriter_print(f"✅ {player.name} kommer inn på {self.current_place.name}!")
+            admitted = self.roll_dice(player, target_number=target_number, action_description="å komme inn")
+            self.log_event(EV_BOUNCER, player, admitted)
+            if admitted:
+                self.typewriter_print("✅ {} kommer inn på {}!", player.name, self.current_place.name)
             else:
-                self.typewriter_print(f"❌ {player.name} blir nektet inngang til {self.current_place.name}!")
-                self.typewriter_print(f"😢 {player.name} må vente utenfor denne runden...")
+                self.typewriter_print("❌ {} blir nektet inngang til {}!", player.name, self.current_place.name)
+                self.typewriter_print("😢 {} må vente utenfor denne runden...", player.name)
                 # Marker spilleren som inaktiv for denne runden
                 player.status = "blocked"
-            
+
             self.quick_delay()
 
+    def handle_group_bouncer(self):
+        """Dørvakt i stor lobby: alle kaster i én omgang, og resultatet vises samlet"""
+        refused = []
+        for player in self.players:
+            admitted = self.quick_roll(player, int(player.promille) + 1, ROLL_BOUNCER)
+            self.log_event(EV_BOUNCER, player, admitted)
+            if not admitted:
+                player.status = "blocked"
+                refused.append(player)
+        self.presenter.say("✅ {} av {} kommer inn på {}!", len(self.players) - len(refused), len(self.players),
+                           self.current_place.name)
+        if refused:
+            self.presenter.say("❌ Nektet inngang: {}", summarize_names(refused))
+        self.long_delay()
+
+    def quick_roll(self, player, target_number, roll_type):
+        """Terningkast uten utskrift og pauser (gruppekast i stor lobby), samme RNG-bruk som roll_dice"""
+        base_roll = self.rng.randint(1, 6)
+        bonus, special_bonus, _ = player.dice_modifiers()[roll_type]
+        success = base_roll + bonus + special_bonus >= target_number
+        self.log_roll(player, roll_type, base_roll, bonus, special_bonus, target_number, success)
+        return success
+
     def draw_cards(self, num=5):
-        """Trekk kort fra kortstokken"""
-        drawn = []
-        for _ in range(num):
-            if self.deck:
-                drawn.append(self.deck.pop())
-            else:
-                # Hvis kortstokken er tom, bland den på nytt
-                self.deck = self.create_deck()
-                if self.deck:
-                    drawn.append(self.deck.pop())
-        return drawn
+        """Trekk kort fra kortstokken (kastebunken stokkes inn når bunken er tom)"""
+        return [self.deck.draw(self.rng) for _ in range(num)]
 
-    def setup_npcs(self, npcs_data):
+    def setup_npcs(self):
         """Sett opp 3 NPC-er ute på byen fra JSON-data"""
         self.npcs_in_town = []
-        self.used_npcs = set()
-        
+        self.npc_pool.reset()
+
         # Velg 3 tilfeldige NPC-er fra alle tilgjengelige
-        available_npcs = [npc for npc in npcs_data if npc["name"] not in self.used_npcs]
-        
-        for _ in range(3):
-            if available_npcs:
-                npc_data = random.choice(available_npcs)
-                available_npcs.remove(npc_data)  # Unngå duplikater
-                npc = NPC(npc_data["name"], npc_data.get("effects", {}), npc_data.get("displayText", ""))
-                self.npcs_in_town.append(npc)
-                self.used_npcs.add(npc_data["name"])
+        self.refill_npcs()
 
     def refill_npcs(self):
         """Fyll opp NPC-listen til 3 når noen blir ringt"""
         while len(self.npcs_in_town) < 3:
-            # Finn tilgjengelige NPC-er som ikke er i bruk
-            available_npcs = [npc for npc in self.npcs_data if npc["name"] not in self.used_npcs]
-            
-            if available_npcs:
-                npc_data = random.choice(available_npcs)
-                npc = NPC(npc_data["name"], npc_data.get("effects", {}), npc_data.get("displayText", ""))
-                self.npcs_in_town.append(npc)
-                self.used_npcs.add(npc_data["name"])
-            else:
+            npc = self.npc_pool.take_random(self.rng)
+            if npc is None:
                 # Hvis alle NPC-er er i bruk, ikke fyll mer
                 break
+            self.npcs_in_town.append(npc)
 
     def start_game(self):
         """Start hele spillet med alle faser"""
-        print("\n--- SMØR: Sjefen og Sårds ølduell ---")
-        print("Spillet starter!")
-        
+        self.presenter.say("\n--- SMØR: Sjefen og Sårds ølduell ---")
+        self.presenter.say("Spillet starter!")
+
         # Sett opp NPC-er
         self.loading_effect("Setter opp NPC-er...")
-        self.setup_npcs(self.npcs_data)
+        self.setup_npcs()
         self.quick_delay()
-        
-        # Kjør alle faser
-        for i, phase in enumerate(self.phases):
-            self.play_phase(phase)
-            
+
+        return self.run()
+
+    def run(self):
+        """Spill fra nåværende posisjon til spillet er slutt (også etter restore()/clone())"""
+        # Kjør alle (gjenstående) faser
+        while self.current_phase_index < len(self.phases):
+            phase = self.phases[self.current_phase_index]
+            if self.turn_index is None:
+                self.begin_phase(phase)
+            self.play_turns()
+            self.finish_phase()
+
             # Vis fase-overgang (ikke etter siste fase)
-            if i < len(self.phases) - 1:
-                self.show_phase_transition(phase, self.phases[i + 1])
-            
+            if self.current_phase_index < len(self.phases):
+                self.show_phase_transition(phase, self.phases[self.current_phase_index])
+
         # Vis endelig resultat
-        self.end_game()
+        return self.end_game()
 
     def play_phase(self, phase):
         """Spill en fase (Vors, Fest, eller Nach)"""
+        self.begin_phase(phase)
+        self.play_turns()
+        self.finish_phase()
+
+    def begin_phase(self, phase):
+        """Start en fase: velg sted, håndter dørvakt og del ut kort"""
         self.current_phase = phase
-        
+
         # Velg tilfeldig sted for denne fasen
-        self.current_place = random.choice(self.places)
-        
-        print(f"\n{'='*50}")
-        self.typewriter_print(f"🎯 FASE: {phase}")
-        self.typewriter_print(f"📍 Sted: {self.current_place.name}")
-        
-        # Vis sted-beskrivelse
-        if self.current_place.display_text:
-            self.typewriter_print(f"📖 {self.current_place.display_text}")
-        
-        # Vis sted-effekter
-        self.show_place_effects()
-        
+        self.current_place = self.rng.choice(self.places)
+        if self.event_log is not None:
+            self.event_log.record(EV_PHASE, self.current_phase_index, self.current_place.id)
+
+        # Vis fase, sted og sted-effekter
+        self.presenter.show_phase_header(self)
+
         # Håndter dørvakt hvis dette er første gang på stedet
-        if self.current_place.has_bouncer and self.current_place.name not in self.visited_places:
+        if self.current_place.has_bouncer and self.current_place.id not in self.visited_places:
             self.handle_bouncer()
-        
+
         # Marker stedet som besøkt
-        self.visited_places.add(self.current_place.name)
-        
-        print(f"👥 NPC-er ute på byen:")
-        for npc in self.npcs_in_town:
-            if npc.display_text:
-                print(f"  • {npc.name} - {npc.display_text}")
-            else:
-                print(f"  • {npc.name}")
-        print(f"{'='*50}")
+        self.visited_places.add(self.current_place.id)
+
+        self.presenter.say("👥 NPC-er ute på byen:")
+        self.presenter.show_npcs_in_town(self)
+        self.presenter.say("=" * 50)
         self.long_delay()
-        
+
         # Gi alle aktive spillere 5 nye kort og bruk sted-effekter
+        if self.large_lobby:
+            self.loading_effect("Deler ut kort til {} spillere...", len(self.players))
+            for player in self.players:
+                if player.status == "active":
+                    player.hand = self.draw_cards(5)
+                    self.current_place.apply_round_start(player, QUIET)
+            self.turn_index = 0
+            return
         for player in self.players:
             if player.status == "active":
-                self.loading_effect(f"Gir {player.name} 5 kort...")
+                self.loading_effect("Gir {} 5 kort...", player.name)
                 player.hand = self.draw_cards(5)
-                self.current_place.apply_round_start(player)
+                self.current_place.apply_round_start(player, self.presenter)
             else:
-                self.typewriter_print(f"😢 {player.name} er blokkert og får ingen kort denne runden.")
+                self.typewriter_print("😢 {} er blokkert og får ingen kort denne runden.", player.name)
             self.quick_delay()
-        
-        # Spill til alle har brukt opp kortene sine
+        self.turn_index = 0
+
+    def play_turns(self):
+        """Spill til alle har brukt opp kortene sine (fortsetter fra self.turn_index)"""
+        if self.large_lobby:
+            self.play_scheduled_turns()
+            return
         while any(player.hand for player in self.players):
-            for player in self.players:
+            while self.turn_index < len(self.players):
+                player = self.players[self.turn_index]
                 if player.hand and player.status == "active":
+                    if self.record_turns:
+                        self.turn_start = (self.snapshot(), len(self.decisions))
+                    if self.event_log is not None:
+                        self.event_log.begin_turn(self, self.turn_index)
+                    self.player_turn(player)
+                self.turn_index += 1
+            self.turn_index = 0
+
+    def play_scheduled_turns(self):
+        """Som play_turns, men hver runde går bare gjennom plassene som fortsatt har kort.
+
+        Blokkerte spillere får aldri kort, og en spiller som er tom for kort får ikke nye
+        i fasen, så listen bare krymper. Rekkefølgen på turene er den samme som i play_turns.
+        """
+        players = self.players
+        seats = [seat for seat, player in enumerate(players) if player.hand and player.status == "active"]
+        start = bisect_left(seats, self.turn_index)
+        while seats:
+            for seat in seats[start:]:
+                player = players[seat]
+                if player.hand:
+                    self.turn_index = seat
+                    if self.record_turns:
+                        self.turn_start = (self.snapshot(), len(self.decisions))
+                    if self.event_log is not None:
+                        self.event_log.begin_turn(self, seat)
                     self.player_turn(player)
-        
+            self.turn_index = start = 0
+            seats = [seat for seat in seats if players[seat].hand]
+
+    def finish_phase(self):
+        """Avslutt fasen og gå videre til neste"""
         # Reset alle spillere til aktiv status for neste fase
         for player in self.players:
             player.status = "active"
+        self.turn_index = None
+        self.current_phase_index += 1
 
     def show_phase_transition(self, current_phase, next_phase):
         """Vis tydelig overgang mellom faser"""
-        print(f"\n{'='*60}")
-        print(f"🎉 {current_phase.upper()} ER FERDIG! 🎉")
-        print(f"{'='*60}")
+        self.presenter.say("\n{}", "=" * 60)
+        self.presenter.say("🎉 {} ER FERDIG! 🎉", current_phase.upper())
+        self.presenter.say("=" * 60)
         self.long_delay()
-        
-        print(f"\n{'='*60}")
-        print(f"🚀 GÅR VIDERE TIL {next_phase.upper()}! 🚀")
-        print(f"{'='*60}")
+
+        self.presenter.say("\n{}", "=" * 60)
+        self.presenter.say("🚀 GÅR VIDERE TIL {}! 🚀", next_phase.upper())
+        self.presenter.say("=" * 60)
         self.long_delay()
-        
+
         # Vis status for alle spillere
-        print(f"\n📊 STATUS ETTER {current_phase.upper()}:")
-        print(f"{'Spiller':<12} {'Promille':<8} {'Minner':<7} {'NPC-er'}")
-        print("-" * 40)
-        for player in self.players:
-            npc_names = ", ".join([npc.name for npc in player.npcs]) if player.npcs else "Ingen"
-            print(f"{player.name:<12} {player.promille:<8.1f} {player.memory:<7} {npc_names}")
-        print()
+        self.presenter.show_standings(self, f"STATUS ETTER {current_phase.upper()}")
         self.long_delay()
 
     def show_game_status(self):
         """Vis oversiktlig status for alle spillere"""
-        print(f"\n📊 SPILLSTATUS:")
-        print(f"{'Spiller':<12} {'Promille':<8} {'Minner':<7} {'Kort':<5} {'NPC-er'}")
-        print("-" * 45)
-        for player in self.players:
-            npc_names = ", ".join([npc.name for npc in player.npcs]) if player.npcs else "Ingen"
-            print(f"{player.name:<12} {player.promille:<8.1f} {player.memory:<7} {len(player.hand):<5} {npc_names}")
-        print()
+        self.presenter.show_standings(self, "SPILLSTATUS", show_cards=True)
 
     def player_turn(self, player):
         """En spiller sin tur"""
-        print(f"\n{'='*60}")
-        print(f"🎮 {player.name.upper()} SIN TUR")
-        print(f"{'='*60}")
-        
+        self.presenter.say("\n{}", "=" * 60)
+        self.presenter.say("🎮 {} SIN TUR", player.name.upper())
+        self.presenter.say("=" * 60)
+
         # Sjekk for turn-start effekter
         for npc in player.npcs:
             if "turn_start_promille" in npc.effects:
                 promille_bonus = npc.effects["turn_start_promille"]
                 player.add_promille(promille_bonus)
-                print(f"👼 {npc.name} gir {promille_bonus} promille ved starten av turen!")
-            
+                self.presenter.say("👼 {} gir {} promille ved starten av turen!", npc.name, promille_bonus)
+
             if "turn_start_memory" in npc.effects:
                 memory_bonus = npc.effects["turn_start_memory"]
                 player.add_memory(memory_bonus)
-                print(f"🧠 {npc.name} gir {memory_bonus} minnepoeng ved starten av turen!")
-        
+                self.presenter.say("🧠 {} gir {} minnepoeng ved starten av turen!", npc.name, memory_bonus)
+
         # Sjekk redningskast hvis spilleren har 4+ promille
         if not self.check_rescue_roll(player):
             return  # Spilleren kastet opp og turen er over
-        
+
         # Sjekk NPC-effekter som påvirker turen
         if not self.check_npc_turn_effects(player):
             return  # Spilleren må stå over runden
-        
-        # Vis sted og fase info
-        print(f"📍 Sted: {self.current_place.name}")
-        print(f"🎯 Fase: {self.current_phase}")
-        
-        # Vis stedseffekter
-        if self.current_place.effects:
-            print(f"\n⚡ Stedseffekter:")
-            for effect_key, effect_value in self.current_place.effects.items():
-                if effect_key in self.current_place.effect_descriptions:
-                    description = self.current_place.effect_descriptions[effect_key]
-                    if isinstance(effect_value, (int, float)) and effect_value != 0:
-                        description = description.replace("1", str(effect_value))
-                    print(f"  • {description}")
-        
-        # Vis NPC-er på byen
-        print(f"\n👥 NPC-er ute på byen:")
-        for npc in self.npcs_in_town:
-            if npc.display_text:
-                print(f"  • {npc.name} - {npc.display_text}")
-            else:
-                print(f"  • {npc.name}")
-        
-        # Vis spilleren sin status
-        print(f"\n👤 {player.name} sin status:")
-        print(f"  🍺 Promille: {player.promille}")
-        print(f"  🧠 Minner: {player.memory}")
-        print(f"  🃏 Kort på hånden: {len(player.hand)}")
-        
-        if player.npcs:
-            print(f"  👥 NPC-er:")
-            for npc in player.npcs:
-                print(f"    • {npc.name} - {npc.display_text}")
-        else:
-            print(f"  👥 NPC-er: Ingen")
-        
-        # Vis oversikt over alle spillere
-        print(f"\n📊 Alle spillere:")
-        for p in self.players:
-            if p == player:
-                print(f"  👤 {p.name}: {p.promille} promille, {p.memory} minner, {len(p.hand)} kort, {len(p.npcs)} NPC-er ⭐")
-            else:
-                print(f"  👤 {p.name}: {p.promille} promille, {p.memory} minner, {len(p.hand)} kort, {len(p.npcs)} NPC-er")
-        
-        # Vis kort på hånden
-        print(f"\n📋 Hånden din:")
-        for idx, card in enumerate(player.hand):
-            if card.display_text:
-                print(f"  {idx+1}. {card.name} - {card.display_text}")
-            else:
-                print(f"  {idx+1}. {card.name}")
-        
-        print(f"{'='*60}")
-        
-        if player.is_human:
-            choice = input(f"\n🎯 Velg kort (nummer) eller 9 for spesielle alternativer: ")
-            if choice == "9":
-                self.handle_special_options(player)
-                return
-            if not choice.isdigit() or int(choice)-1 not in range(len(player.hand)):
-                print("❌ Ugyldig valg. Prøv igjen.")
-                return
-            card_idx = int(choice)-1
+
+        # Vis sted, fase, NPC-er, status og hånd
+        self.presenter.show_turn_overview(self, player)
+
+        if self.ai_trading and not player.is_human:
+            # Siste alternativ (etter kortene) er menyen med spesielle alternativer
+            card_idx = self.decide(player, "card", len(player.hand) + 1)
+            if card_idx == len(player.hand):
+                card_idx = SPECIAL_OPTIONS
         else:
+            card_idx = self.decide(player, "card", len(player.hand), lambda: self.ask_card_choice(player))
+        if card_idx == SPECIAL_OPTIONS:
+            self.handle_special_options(player)
+            return
+        if not player.is_human:
             # AI velger tilfeldig kort
-            card_idx = random.randint(0, len(player.hand)-1)
-            self.typewriter_print(f"🤖 {player.name} tenker...")
+            self.typewriter_print("🤖 {} tenker...", player.name)
             self.long_delay()
-            self.loading_effect(f"{player.name} velger kort...")
-            self.typewriter_print(f"🤖 {player.name} velger kort {card_idx+1}")
+            self.loading_effect("{} velger kort...", player.name)
+            self.typewriter_print("🤖 {} velger kort {}", player.name, card_idx+1)
             self.quick_delay()
-        
+
         # Spill kortet
-        self.loading_effect(f"{player.name} spiller kort...")
+        self.loading_effect("{} spiller kort...", player.name)
         selected_card = player.hand.pop(card_idx)
         selected_card.play(player, self.current_place, self)
+        self.deck.discard(selected_card)
         self.quick_delay()
 
+    def ask_card_choice(self, player):
+        """Spør en ekte spiller om kort (0-basert indeks) eller SPECIAL_OPTIONS for meny 9"""
+        while True:
+            choice = self.presenter.ask(f"\n🎯 Velg kort (nummer) eller 9 for spesielle alternativer: ")
+            if choice == "9":
+                return SPECIAL_OPTIONS
+            if choice.isdigit() and int(choice)-1 in range(len(player.hand)):
+                return int(choice)-1
+            self.presenter.say("❌ Ugyldig valg. Prøv igjen.")
+
     def roll_dice(self, player, target_number=3, action_description="terningkast"):
         """Generell terningkast-metode med bonus-system"""
-        self.typewriter_print(f"\n🎲 {player.name} kaster terning...")
+        self.typewriter_print("\n🎲 {} kaster terning...", player.name)
         self.long_delay()
         self.loading_effect("Terningen ruller...")
-        
-        base_roll = random.randint(1, 6)
-        bonus = player.get_dice_bonus()
-        
-        # Sjekk for spesielle terningkast-bonuser fra NPC-er
-        special_bonus = 0
-        bonus_description = ""
-        
-        if action_description == "redningskast":
-            for npc in player.npcs:
-                if "rescue_bonus" in npc.effects:
-                    special_bonus += npc.effects["rescue_bonus"]
-                    bonus_description += f" + {npc.effects['rescue_bonus']} (redningskast-bonus fra {npc.name})"
-                    self.typewriter_print(f"🏆 {npc.name} gir {npc.effects['rescue_bonus']} bonus på redningskast!")
-        
-        elif action_description == "å komme inn":
-            for npc in player.npcs:
-                if "bouncer_bonus" in npc.effects:
-                    special_bonus += npc.effects["bouncer_bonus"]
-                    bonus_description += f" + {npc.effects['bouncer_bonus']} (dørvakt-bonus fra {npc.name})"
-                    self.typewriter_print(f"🏆 {npc.name} gir {npc.effects['bouncer_bonus']} bonus på dørvaktkast!")
-        
-        # Sjekk for ferdighetskast-bonus fra William (gjelder alle terningkast)
-        for npc in player.npcs:
-            if "skill_bonus" in npc.effects:
-                special_bonus += npc.effects["skill_bonus"]
-                bonus_description += f" + {npc.effects['skill_bonus']} (ferdighetskast-bonus fra {npc.name})"
-                self.typewriter_print(f"🏆 {npc.name} gir {npc.effects['skill_bonus']} bonus på ferdighetskast!")
-        
+
+        base_roll = self.rng.randint(1, 6)
+
+        # Promille-bonus og NPC-bonuser (redning/dørvakt + ferdighetskast) fra spillerens bonustabell
+        roll_type = ROLL_TYPE_BY_ACTION.get(action_description, ROLL_SKILL)
+        bonus, special_bonus, sources = player.dice_modifiers()[roll_type]
+        if self.presenter.verbose:
+            for npc_name, value, label in sources:
+                self.typewriter_print("🏆 {} gir {} bonus på {}!", npc_name, value, label)
+
         total_roll = base_roll + bonus + special_bonus
-        
+
         # Vis terningkast-resultat
         if special_bonus != 0:
-            self.typewriter_print(f"🎲 {player.name} kaster terning for {action_description}: {base_roll} + {bonus} + {special_bonus} = {total_roll}")
+            self.typewriter_print("🎲 {} kaster terning for {}: {} + {} + {} = {}", player.name, action_description, base_roll, bonus, special_bonus, total_roll)
         else:
-            self.typewriter_print(f"🎲 {player.name} kaster terning for {action_description}: {base_roll} + {bonus} = {total_roll}")
-        
+            self.typewriter_print("🎲 {} kaster terning for {}: {} + {} = {}", player.name, action_description, base_roll, bonus, total_roll)
+
         if bonus > 0:
-            self.typewriter_print(f"🍺 {player.name} får {bonus} bonus på terningen!")
+            self.typewriter_print("🍺 {} får {} bonus på terningen!", player.name, bonus)
             self.quick_delay()
-        
+
         success = total_roll >= target_number
+        self.log_roll(player, roll_type, base_roll, bonus, special_bonus, target_number, success)
         if success:
-            self.typewriter_print(f"✅ Suksess! ({total_roll} >= {target_number})")
+            self.typewriter_print("✅ Suksess! ({} >= {})", total_roll, target_number)
         else:
-            self.typewriter_print(f"❌ Feil! ({total_roll} < {target_number})")
-        
+            self.typewriter_print("❌ Feil! ({} < {})", total_roll, target_number)
+
         self.long_delay()
         return success
 
     def offer_npc_interaction(self, player):
         """Tilby spilleren å hente en NPC med terningkast"""
         if not self.npcs_in_town:
-            print("📞 Ingen NPC-er tilgjengelige ute på byen.")
+            self.presenter.say("📞 Ingen NPC-er tilgjengelige ute på byen.")
             return
-            
+
         if player.is_human:
-            self.typewriter_print(f"\n📞 RING EN VENN")
-            print(f"👥 Tilgjengelige NPC-er:")
-            for idx, npc in enumerate(self.npcs_in_town):
-                if npc.display_text:
-                    print(f"  {idx+1}. {npc.name} - {npc.display_text}")
-                else:
-                    print(f"  {idx+1}. {npc.name}")
-            self.typewriter_print(f"  0. Ikke nå")
-            
-            choice = input(f"\n🎯 Velg NPC (nummer): ")
-            if choice.isdigit() and 1 <= int(choice) <= len(self.npcs_in_town):
+            self.typewriter_print("\n📞 RING EN VENN")
+            self.presenter.say("👥 Tilgjengelige NPC-er:")
+            self.presenter.show_npcs_in_town(self, numbered=True)
+            self.typewriter_print("  0. Ikke nå")
+
+            npc_idx = self.decide(player, "npc", len(self.npcs_in_town), self.ask_npc_choice)
+            if npc_idx != NO_CHOICE:
                 # Sjekk for Los Tacos bonus på "Ring en venn"
                 target_number = 3  # Standard
-                if self.current_place.name == "Los Tacos":
+                if "call_friend_target" in self.current_place.effects:
+                    target_number = self.current_place.effects["call_friend_target"]
                     if self.current_phase == "Vors":
-                        target_number = 2  # +2 bonus (3-2=1, men vi setter target til 2)
-                        print(f"🍺 Los Tacos gir +2 bonus på 'Ring en venn' i Vors-fasen!")
+                        self.presenter.say("🍺 {} gir +2 bonus på 'Ring en venn' i Vors-fasen!", self.current_place.name)
                     else:
-                        target_number = 2  # +1 bonus (3-1=2)
-                        print(f"🍺 Los Tacos gir +1 bonus på 'Ring en venn'!")
-                
+                        self.presenter.say("🍺 {} gir +{} bonus på 'Ring en venn'!", self.current_place.name, 3 - target_number)
+
                 # Bruk generell terningkast-metode
                 if self.roll_dice(player, target_number=target_number, action_description="å ringe en venn"):
-                    npc_idx = int(choice) - 1
                     npc = self.npcs_in_town.pop(npc_idx)
-                    self.loading_effect(f"{player.name} henter {npc.name}...")
-                    player.add_npc(npc)
-                    print(f"✅ {player.name} henter {npc.name}!")
-                    
+                    self.loading_effect("{} henter {}...", player.name, npc.name)
+                    player.add_npc(npc, self.presenter)
+                    self.log_event(EV_NPC_GAIN, player, npc.id)
+                    self.presenter.say("✅ {} henter {}!", player.name, npc.name)
+
                     # Gi 1 minnepoeng for suksessfull "ring en venn"
                     player.add_memory(1)
-                    print(f"🎉 {player.name} får 1 minnepoeng for å ringe en venn!")
-                    
+                    self.presenter.say("🎉 {} får 1 minnepoeng for å ringe en venn!", player.name)
+
                     # Sjekk for Eddie's "brings_random_npc" effekt
                     if "brings_random_npc" in npc.effects:
                         self.handle_eddie_brings_npc(player, npc)
-                    
+
                     # Bruk NPC-effekter umiddelbart
-                    npc.apply_effects(player)
-                    
+                    npc.apply_effects(player, self.presenter)
+
                     # Fyll opp NPC-listen
                     self.refill_npcs()
                 else:
-                    print(f"❌ {player.name} får ikke kontakt med {self.npcs_in_town[int(choice)-1].name}...")
-                    print("📞 Du trenger 3 eller høyere for å få kontakt!")
-                    
+                    self.presenter.say("❌ {} får ikke kontakt med {}...", player.name, self.npcs_in_town[npc_idx].name)
+                    self.presenter.say("📞 Du trenger 3 eller høyere for å få kontakt!")
+
                     # Gi tilfeldig NPC som trøst
                     self.give_random_npc_on_failure(player)
         else:
             # AI-spiller - automatisk prøve å ringe en venn
             if self.npcs_in_town:
-                npc_idx = random.randint(0, len(self.npcs_in_town) - 1)
+                npc_idx = self.decide(player, "npc", len(self.npcs_in_town))
                 npc = self.npcs_in_town[npc_idx]
-                self.typewriter_print(f"🤖 {player.name} prøver å ringe {npc.name}...")
+                self.typewriter_print("🤖 {} prøver å ringe {}...", player.name, npc.name)
                 self.long_delay()
-                
+
                 if self.roll_dice(player, target_number=3, action_description="å ringe en venn"):
                     npc = self.npcs_in_town.pop(npc_idx)
-                    self.loading_effect(f"{player.name} henter {npc.name}...")
-                    player.add_npc(npc)
-                    print(f"✅ {player.name} henter {npc.name}!")
-                    
+                    self.loading_effect("{} henter {}...", player.name, npc.name)
+                    player.add_npc(npc, self.presenter)
+                    self.log_event(EV_NPC_GAIN, player, npc.id)
+                    self.presenter.say("✅ {} henter {}!", player.name, npc.name)
+
                     # Gi 1 minnepoeng for suksessfull "ring en venn"
                     player.add_memory(1)
-                    print(f"🎉 {player.name} får 1 minnepoeng for å ringe en venn!")
-                    
+                    self.presenter.say("🎉 {} får 1 minnepoeng for å ringe en venn!", player.name)
+
                     # Sjekk for Eddie's "brings_random_npc" effekt
                     if "brings_random_npc" in npc.effects:
                         self.handle_eddie_brings_npc(player, npc)
-                    
+
                     # Bruk NPC-effekter umiddelbart
-                    npc.apply_effects(player)
-                    
+                    npc.apply_effects(player, self.presenter)
+
                     # Fyll opp NPC-listen
                     self.refill_npcs()
                 else:
-                    print(f"❌ {player.name} får ikke kontakt med {npc.name}...")
-                    
+                    self.presenter.say("❌ {} får ikke kontakt med {}...", player.name, npc.name)
+
                     # Gi tilfeldig NPC som trøst
                     self.give_random_npc_on_failure(player)
 
+    def ask_npc_choice(self):
+        """Spør en ekte spiller om NPC (0-basert indeks) eller NO_CHOICE for 'Ikke nå'"""
+        choice = self.presenter.ask(f"\n🎯 Velg NPC (nummer): ")
+        if choice.isdigit() and 1 <= int(choice) <= len(self.npcs_in_town):
+            return int(choice) - 1
+        return NO_CHOICE
+
     def give_random_npc_on_failure(self, player):
         """Gi en tilfeldig NPC når spilleren feiler ved å ringe en venn"""
-        # Finn tilgjengelige NPC-er som ikke er i bruk
-        available_npcs = [npc for npc in self.npcs_data if npc["name"] not in self.used_npcs]
-        
-        if available_npcs:
-            npc_data = random.choice(available_npcs)
-            npc = NPC(npc_data["name"], npc_data.get("effects", {}), npc_data.get("displayText", ""))
-            
-            self.loading_effect(f"{player.name} får uventet besøk...")
-            player.add_npc(npc)
-            print(f"🎁 {player.name} får uventet besøk av {npc.name}!")
-            
+        # Ta en tilfeldig NPC som ikke er i bruk
+        npc = self.npc_pool.take_random(self.rng)
+
+        if npc is not None:
+            self.loading_effect("{} får uventet besøk...", player.name)
+            player.add_npc(npc, self.presenter)
+            self.log_event(EV_NPC_GAIN, player, npc.id)
+            self.presenter.say("🎁 {} får uventet besøk av {}!", player.name, npc.name)
+
             # Bruk NPC-effekter umiddelbart
-            npc.apply_effects(player)
-            
-            # Marker NPC som i bruk
-            self.used_npcs.add(npc_data["name"])
+            npc.apply_effects(player, self.presenter)
         else:
-            print(f"😔 Ingen flere NPC-er tilgjengelige for {player.name}...")
+            self.presenter.say("😔 Ingen flere NPC-er tilgjengelige for {}...", player.name)
 
     def handle_eddie_brings_npc(self, player, eddie_npc):
         """Håndter Eddie's effekt som tar med en tilfeldig NPC"""
-        # Finn tilgjengelige NPC-er som ikke er i bruk
-        available_npcs = [npc for npc in self.npcs_data if npc["name"] not in self.used_npcs]
-        
-        if available_npcs:
-            npc_data = random.choice(available_npcs)
-            random_npc = NPC(npc_data["name"], npc_data.get("effects", {}), npc_data.get("displayText", ""))
-            
-            self.loading_effect(f"{eddie_npc.name} tar med en venn...")
-            player.add_npc(random_npc)
-            print(f"🎁 {eddie_npc.name} tar med {random_npc.name}!")
-            
+        # Ta en tilfeldig NPC som ikke er i bruk
+        random_npc = self.npc_pool.take_random(self.rng)
+
+        if random_npc is not None:
+            self.loading_effect("{} tar med en venn...", eddie_npc.name)
+            player.add_npc(random_npc, self.presenter)
+            self.log_event(EV_NPC_GAIN, player, random_npc.id)
+            self.presenter.say("🎁 {} tar med {}!", eddie_npc.name, random_npc.name)
+
             # Bruk NPC-effekter umiddelbart
-            random_npc.apply_effects(player)
-            
-            # Marker NPC som i bruk
-            self.used_npcs.add(npc_data["name"])
+            random_npc.apply_effects(player, self.presenter)
         else:
-            print(f"😔 {eddie_npc.name} kunne ikke finne noen å ta med...")
+            self.presenter.say("😔 {} kunne ikke finne noen å ta med...", eddie_npc.name)
 
     def handle_know_beer_effect(self, player, enhanced_effect=None):
         """Håndter 'Kjenner dere ølet!' kort-effekten"""
-        print(f"\n🍺 {player.name} roper: 'Kjenner dere ølet!'")
+        self.presenter.say("\n🍺 {} roper: 'Kjenner dere ølet!'", player.name)
         self.long_delay()
-        
+
         # Bestem hvor mange minnepoeng som gis (2 eller 4 hvis spilleren har Sjefen)
         memory_bonus = 4 if enhanced_effect == "enhanced_know_beer" else 2
-        
+
         # Sjekk alle spillere for bonus
+        if self.large_lobby:
+            self.handle_group_know_beer(player, memory_bonus)
+            return
         for p in self.players:
             if p.promille >= 2:
                 # Hvis spilleren som spiller kortet har Sjefen, gi forsterket bonus
                 if p == player and enhanced_effect == "enhanced_know_beer":
                     p.add_memory(memory_bonus)
-                    print(f"🍺 {p.name} har {p.promille} promille og får {memory_bonus} minnepoeng (forsterket av Sjefen)!")
+                    self.presenter.say("🍺 {} har {} promille og får {} minnepoeng (forsterket av Sjefen)!", p.name, p.promille, memory_bonus)
                 else:
                     p.add_memory(2)  # Standard bonus
-                    print(f"🍺 {p.name} har {p.promille} promille og får 2 minnepoeng!")
-        
+                    self.presenter.say("🍺 {} har {} promille og får 2 minnepoeng!", p.name, p.promille)
+
         # Kun spilleren som spiller kortet mister minnepoeng hvis de har under 2 promille
         if player.promille < 2:
             if player.memory > 0:  # Bare mist minne hvis spilleren har minner
                 player.add_memory(-1)
-                print(f"😔 {player.name} har bare {player.promille} promille og mister 1 minnepoeng...")
+                self.presenter.say("😔 {} har bare {} promille og mister 1 minnepoeng...", player.name, player.promille)
             else:
-                print(f"😔 {player.name} har bare {player.promille} promille, men har ingen minner å miste...")
-        
+                self.presenter.say("😔 {} har bare {} promille, men har ingen minner å miste...", player.name, player.promille)
+
+        self.long_delay()
+
+    def handle_group_know_beer(self, player, memory_bonus):
+        """'Kjenner dere ølet!' i stor lobby: samme regler, men vist som et sammendrag"""
+        drinkers = 0
+        for p in self.players:
+            if p.promille >= 2:
+                p.add_memory(memory_bonus if p == player else 2)
+                drinkers += 1
+        self.presenter.say("🍺 {} av {} spillere har minst 2 promille og får 2 minnepoeng!", drinkers, len(self.players))
+        if player.promille >= 2 and memory_bonus != 2:
+            self.presenter.say("🍺 {} får {} minnepoeng (forsterket av Sjefen)!", player.name, memory_bonus)
+        if player.promille < 2 and player.memory > 0:
+            player.add_memory(-1)
+            self.presenter.say("😔 {} har bare {} promille og mister 1 minnepoeng...", player.name, player.promille)
         self.long_delay()
 
     def check_rescue_roll(self, player):
@@ -588,501 +678,504 @@ class GameEngine:
         # Bestem redningskast-terskel basert på sted og fase
         rescue_threshold = 5  # Standard (ny kapp)
         dice_target = 4  # Standard terningkrav
-        
+
         # Herslebs Nach-effekt: redningskast ved 4 promille (ny kapp)
-        if (self.current_place.name == "Herslebs" and 
-            self.current_phase == "Nach" and 
-            "nach_rescue_threshold" in self.current_place.effects):
-            rescue_threshold = 4  # Herslebs Nach: 4 promille
+        if self.current_phase == "Nach" and "nach_rescue_threshold" in self.current_place.effects:
+            rescue_threshold = self.current_place.effects["nach_rescue_threshold"]  # Herslebs Nach: 4 promille
             dice_target = 3  # Herslebs Nach: terningkrav 3
-        
+
         if player.promille >= rescue_threshold:
-            print(f"\n🤮 {player.name} har {player.promille} promille og trenger redningskast!")
-            print(f"Du må kaste {dice_target} eller høyere for å unngå å kaste opp!")
+            self.presenter.say("\n🤮 {} har {} promille og trenger redningskast!", player.name, player.promille)
+            self.presenter.say("Du må kaste {} eller høyere for å unngå å kaste opp!", dice_target)
             self.long_delay()
-            
+
             # Kast terning for redningskast
             if self.roll_dice(player, target_number=dice_target, action_description="redningskast"):
-                print(f"✅ {player.name} klarer redningskastet og kan spille videre!")
+                self.presenter.say("✅ {} klarer redningskastet og kan spille videre!", player.name)
                 return True
             else:
-                print(f"🤮 {player.name} kaster opp!")
+                self.presenter.say("🤮 {} kaster opp!", player.name)
                 self.handle_vomiting(player)
                 return False
-        
+
         return True  # Ingen redningskast nødvendig
 
     def handle_special_options(self, player):
         """Håndter spesielle alternativer for spilleren"""
-        print(f"\n🔮 Spesielle alternativer for {player.name}:")
-        print("1. Bytt 2 kort mot 1 nytt kort")
-        print("2. Send vekk venn")
-        print("0. Tilbake til hovedmenyen")
-        
-        choice = input("Velg alternativ: ")
-        
-        if choice == "1":
+        self.presenter.say("\n🔮 Spesielle alternativer for {}:", player.name)
+        self.presenter.say("1. Bytt 2 kort mot 1 nytt kort")
+        self.presenter.say("2. Send vekk venn")
+        self.presenter.say("0. Tilbake til hovedmenyen")
+
+        choice = self.decide(player, "special", 3, lambda: self.ask_number("Velg alternativ: ", 0, 2))
+
+        if choice == 1:
             self.handle_card_trade(player)
-        elif choice == "2":
+        elif choice == 2:
             self.handle_send_away_venn(player)
-        elif choice == "0":
-            print("Tilbake til hovedmenyen...")
-            return
         else:
-            print("❌ Ugyldig valg!")
-            self.handle_special_options(player)
+            self.presenter.say("Tilbake til hovedmenyen...")
 
     def handle_card_trade(self, player):
         """Håndter kort-byttemekanisme: 2 kort mot 1 nytt"""
         if len(player.hand) < 2:
-            print("❌ Du må ha minst 2 kort for å bytte!")
+            self.presenter.say("❌ Du må ha minst 2 kort for å bytte!")
             return
-        
-        print(f"\n🔄 {player.name} bytter 2 kort mot 1 nytt kort!")
-        
+
+        self.presenter.say("\n🔄 {} bytter 2 kort mot 1 nytt kort!", player.name)
+
         # Velg første kort å kaste
-        print(f"\n📋 Hånden din:")
-        for i, card in enumerate(player.hand, 1):
-            print(f"  {i}. {card.name} - {card.display_text}")
-        
-        while True:
-            try:
-                choice1 = int(input(f"\n🎯 Velg første kort å kaste (nummer): "))
-                if 1 <= choice1 <= len(player.hand):
-                    break
-                else:
-                    print("❌ Ugyldig valg!")
-            except ValueError:
-                print("❌ Vennligst skriv inn et tall!")
-        
+        self.presenter.show_hand(player)
+
+        choice1 = 1 + self.decide(player, "trade_discard", len(player.hand), lambda: self.ask_number(
+            f"\n🎯 Velg første kort å kaste (nummer): ", 1, len(player.hand)) - 1)
+
         # Velg andre kort å kaste
-        print(f"\n📋 Hånden din (uten det valgte kortet):")
-        for i, card in enumerate(player.hand, 1):
-            if i != choice1:
-                print(f"  {i}. {card.name} - {card.display_text}")
-        
-        while True:
-            try:
-                choice2 = int(input(f"\n🎯 Velg andre kort å kaste (nummer): "))
-                if 1 <= choice2 <= len(player.hand) and choice2 != choice1:
-                    break
-                else:
-                    print("❌ Ugyldig valg!")
-            except ValueError:
-                print("❌ Vennligst skriv inn et tall!")
-        
+        self.presenter.show_hand(player, "📋 Hånden din (uten det valgte kortet):", skip=choice1)
+
+        # Andre valg er en indeks i hånden uten det første kortet
+        choice2 = 1 + self.decide(player, "trade_discard", len(player.hand) - 1,
+                                  lambda: self.ask_second_discard(player, choice1))
+
         # Kaste de valgte kortene
         card1 = player.hand.pop(choice1 - 1)
-        if choice2 > choice1:
-            choice2 -= 1  # Juster indeks etter første pop
         card2 = player.hand.pop(choice2 - 1)
-        
-        print(f"🗑️ {player.name} kaster {card1.name} og {card2.name}")
-        
+
+        self.presenter.say("🗑️ {} kaster {} og {}", player.name, card1.name, card2.name)
+
         # Trekke 3 tilfeldige kort fra bunken
-        available_cards = [card for card in self.deck if card not in player.hand]
-        if len(available_cards) < 3:
-            print("❌ Ikke nok kort i bunken for å bytte!")
+        if len(self.deck) < 3:
+            self.presenter.say("❌ Ikke nok kort i bunken for å bytte!")
             # Legg tilbake kortene
             player.hand.append(card1)
             player.hand.append(card2)
             return
-        
-        import random
-        random.shuffle(available_cards)
-        new_cards = available_cards[:3]
-        
-        print(f"\n🎲 Trekker 3 tilfeldige kort...")
+        self.deck.discard(card1)
+        self.deck.discard(card2)
+
+        new_cards = self.deck.draw_offers(3, self.rng)
+
+        self.presenter.say("\n🎲 Trekker 3 tilfeldige kort...")
         self.long_delay()
-        
-        print(f"\n🃏 Velg et av disse kortene:")
+
+        self.presenter.say("\n🃏 Velg et av disse kortene:")
         for i, card in enumerate(new_cards, 1):
-            print(f"  {i}. {card.name} - {card.display_text}")
-        
-        while True:
-            try:
-                choice = int(input(f"\n🎯 Velg kort (1-3): "))
-                if 1 <= choice <= 3:
-                    break
-                else:
-                    print("❌ Ugyldig valg!")
-            except ValueError:
-                print("❌ Vennligst skriv inn et tall!")
-        
+            self.presenter.say("  {}. {} - {}", i, card.name, card.display_text)
+
+        self.trade_offers = new_cards
+        try:
+            choice = 1 + self.decide(player, "trade_pick", 3, lambda: self.ask_number(f"\n🎯 Velg kort (1-3): ", 1, 3) - 1)
+        finally:
+            self.trade_offers = ()
+
         # Legge det nye kortet til hånden
         new_card = new_cards[choice - 1]
         player.hand.append(new_card)
-        
-        print(f"✅ {player.name} får {new_card.name}!")
-        
+
+        self.presenter.say("✅ {} får {}!", player.name, new_card.name)
+
         # Legge de andre kortene tilbake i bunken
-        for card in new_cards:
-            if card != new_card:
-                self.deck.append(card)
+        for i, card in enumerate(new_cards, 1):
+            if i != choice:
+                self.deck.put_back(card, self.rng)
+
+    def ask_second_discard(self, player, choice1):
+        """Spør om andre kort å kaste (nummer i hele hånden) og gi indeksen uten det første kortet"""
+        number = self.ask_number(f"\n🎯 Velg andre kort å kaste (nummer): ", 1, len(player.hand), exclude=choice1)
+        return number - 2 if number > choice1 else number - 1
 
     def handle_send_away_venn(self, player):
         """Håndter 'Send vekk venn' mekanismen"""
         if not player.npcs:
-            print("❌ Du har ingen NPC-er å sende vekk!")
+            self.presenter.say("❌ Du har ingen NPC-er å sende vekk!")
             return
-        
+
         if not player.hand:
-            print("❌ Du må ha minst 1 kort for å sende vekk en venn!")
+            self.presenter.say("❌ Du må ha minst 1 kort for å sende vekk en venn!")
             return
-        
-        print(f"\n👋 {player.name} vil sende vekk en venn!")
-        
+
+        self.presenter.say("\n👋 {} vil sende vekk en venn!", player.name)
+
         # Velg kort å kaste bort
-        print(f"\n📋 Hånden din:")
-        for i, card in enumerate(player.hand, 1):
-            print(f"  {i}. {card.name} - {card.display_text}")
-        
-        while True:
-            try:
-                card_choice = int(input(f"\n🎯 Velg kort å kaste bort (nummer): "))
-                if 1 <= card_choice <= len(player.hand):
-                    break
-                else:
-                    print("❌ Ugyldig valg!")
-            except ValueError:
-                print("❌ Vennligst skriv inn et tall!")
-        
+        self.presenter.show_hand(player)
+
+        card_choice = 1 + self.decide(player, "send_away_card", len(player.hand), lambda: self.ask_number(
+            f"\n🎯 Velg kort å kaste bort (nummer): ", 1, len(player.hand)) - 1)
+
         # Kaste det valgte kortet
         discarded_card = player.hand.pop(card_choice - 1)
-        print(f"🗑️ {player.name} kaster {discarded_card.name}")
-        
+        self.deck.discard(discarded_card)
+        self.presenter.say("🗑️ {} kaster {}", player.name, discarded_card.name)
+
         # Velg NPC å sende vekk
-        print(f"\n👥 Dine NPC-er:")
+        self.presenter.say("\n👥 Dine NPC-er:")
         for i, npc in enumerate(player.npcs, 1):
-            print(f"  {i}. {npc.name} - {npc.display_text}")
-        
-        while True:
-            try:
-                npc_choice = int(input(f"\n🎯 Velg NPC å sende vekk (nummer): "))
-                if 1 <= npc_choice <= len(player.npcs):
-                    break
-                else:
-                    print("❌ Ugyldig valg!")
-            except ValueError:
-                print("❌ Vennligst skriv inn et tall!")
-        
+            self.presenter.say("  {}. {} - {}", i, npc.name, npc.display_text)
+
+        npc_choice = 1 + self.decide(player, "send_away_npc", len(player.npcs), lambda: self.ask_number(
+            f"\n🎯 Velg NPC å sende vekk (nummer): ", 1, len(player.npcs)) - 1)
+
         # Fjern NPC-en fra spilleren
-        npc_to_send = player.npcs.pop(npc_choice - 1)
-        print(f"👋 {player.name} sender vekk {npc_to_send.name}!")
-        
+        npc_to_send = player.remove_npc(npc_choice - 1)
+        self.log_event(EV_NPC_LOSS, player, npc_to_send.id)
+        self.presenter.say("👋 {} sender vekk {}!", player.name, npc_to_send.name)
+
         # Spilleren må kaste ferdighetskast for å sende vekk
-        print(f"\n🎲 {player.name} må kaste 4+ for å sende vekk {npc_to_send.name}!")
+        self.presenter.say("\n🎲 {} må kaste 4+ for å sende vekk {}!", player.name, npc_to_send.name)
         if self.roll_dice(player, target_number=4, action_description="å sende vekk venn"):
-            print(f"✅ {player.name} klarte å sende vekk {npc_to_send.name}!")
+            self.presenter.say("✅ {} klarte å sende vekk {}!", player.name, npc_to_send.name)
             self.handle_npc_auction(npc_to_send, player)
         else:
-            print(f"❌ {player.name} klarte ikke å sende vekk {npc_to_send.name}!")
-            print(f"😔 {npc_to_send.name} kommer tilbake til {player.name}!")
+            self.presenter.say("❌ {} klarte ikke å sende vekk {}!", player.name, npc_to_send.name)
+            self.presenter.say("😔 {} kommer tilbake til {}!", npc_to_send.name, player.name)
             # Legg NPC-en tilbake til spilleren
-            player.add_npc(npc_to_send)
+            player.add_npc(npc_to_send, self.presenter)
+            self.log_event(EV_NPC_GAIN, player, npc_to_send.id)
 
     def handle_npc_auction(self, npc, sender):
         """Håndter auksjon hvor spillere kaster for å få NPC-en"""
-        print(f"\n🏆 AUKSJON FOR {npc.name.upper()}!")
-        print(f"Alle spillere (unntatt {sender.name}) kaster ferdighetskast!")
-        print(f"Den som får lavest kast får {npc.name}!")
+        self.presenter.say("\n🏆 AUKSJON FOR {}!", npc.name.upper())
+        self.presenter.say("Alle spillere (unntatt {}) kaster ferdighetskast!", sender.name)
+        self.presenter.say("Den som får lavest kast får {}!", npc.name)
         self.long_delay()
-        
+
         # Finn spillere som kan delta (alle unntatt senderen)
         eligible_players = [p for p in self.players if p != sender]
-        
+
         if not eligible_players:
-            print(f"😔 Ingen andre spillere kan få {npc.name}!")
-            print(f"🗑️ {npc.name} forsvinner...")
+            self.presenter.say("😔 Ingen andre spillere kan få {}!", npc.name)
+            self.presenter.say("🗑️ {} forsvinner...", npc.name)
+            self.npc_pool.give_back(npc)  # Tilbake i bunken med ledige NPC-er
             return
-        
+        if self.presenter.verbose and not self.large_lobby:
+            modifiers = tuple(sum(p.dice_modifiers()[ROLL_AUCTION][:2]) for p in eligible_players)
+            odds = auction_odds(modifiers)
+            self.presenter.say("🎯 Sjanse for å vinne: {}", ", ".join(
+                f"{p.name} {float(chance):.0%}" for p, chance in zip(eligible_players, odds)))
+
         round_number = 1
         while True:
-            print(f"\n{'='*50}")
-            print(f"🎲 RUNDE {round_number} - AUKSJON FOR {npc.name}")
-            print(f"{'='*50}")
-            
+            if self.profiler is not None:
+                self.profiler.count("auction_round")
+            self.presenter.say("\n{}", "=" * 50)
+            self.presenter.say("🎲 RUNDE {} - AUKSJON FOR {}", round_number, npc.name)
+            self.presenter.say("=" * 50)
+
             # Alle spillere kaster
             rolls = []
             for player in eligible_players:
-                print(f"\n🎲 {player.name} kaster ferdighetskast...")
+                self.presenter.say("\n🎲 {} kaster ferdighetskast...", player.name)
                 self.long_delay()
                 self.loading_effect("Terningen ruller...")
-                
-                # Bruk roll_dice for ferdighetskast (William's bonus gjelder)
-                base_roll = random.randint(1, 6)
-                bonus = player.get_dice_bonus()
-                
-                # Sjekk for William's skill_bonus
-                skill_bonus = 0
-                for npc_obj in player.npcs:
-                    if "skill_bonus" in npc_obj.effects:
-                        skill_bonus += npc_obj.effects["skill_bonus"]
-                        print(f"🏆 {npc_obj.name} gir {npc_obj.effects['skill_bonus']} bonus på ferdighetskast!")
-                
+
+                # Ferdighetskast (William's bonus gjelder)
+                base_roll = self.rng.randint(1, 6)
+                bonus, skill_bonus, sources = player.dice_modifiers()[ROLL_AUCTION]
+                for npc_name, value, label in sources:
+                    self.presenter.say("🏆 {} gir {} bonus på {}!", npc_name, value, label)
+
                 total_roll = base_roll + bonus + skill_bonus
+                self.log_roll(player, ROLL_AUCTION, base_roll, bonus, skill_bonus, NO_TARGET, False)
                 if skill_bonus > 0:
-                    print(f"🎲 {player.name} kastet: {base_roll} + {bonus} + {skill_bonus} = {total_roll}")
+                    self.presenter.say("🎲 {} kastet: {} + {} + {} = {}", player.name, base_roll, bonus, skill_bonus, total_roll)
                 else:
-                    print(f"🎲 {player.name} kastet: {base_roll} + {bonus} = {total_roll}")
-                
+                    self.presenter.say("🎲 {} kastet: {} + {} = {}", player.name, base_roll, bonus, total_roll)
+
                 rolls.append((player, total_roll))
                 self.quick_delay()
-            
+
             # Vis resultater
-            print(f"\n📊 RESULTATER RUNDE {round_number}:")
-            for player, roll in sorted(rolls, key=lambda x: x[1]):
-                print(f"  {player.name}: {roll}")
-            
+            if self.presenter.verbose:
+                self.presenter.say("\n📊 RESULTATER RUNDE {}:", round_number)
+                for player, roll in sorted(rolls, key=lambda x: x[1]):
+                    self.presenter.say("  {}: {}", player.name, roll)
+
             # Finn laveste kast
             min_roll = min(rolls, key=lambda x: x[1])[1]
             winners = [player for player, roll in rolls if roll == min_roll]
-            
+
             if len(winners) == 1:
                 # Vi har en vinner!
                 winner = winners[0]
-                print(f"\n🏆 {winner.name} vinner auksjonen med {min_roll}!")
-                print(f"🎉 {winner.name} får {npc.name}!")
-                
+                self.presenter.say("\n🏆 {} vinner auksjonen med {}!", winner.name, min_roll)
+                self.presenter.say("🎉 {} får {}!", winner.name, npc.name)
+
                 # Gi NPC-en til vinneren
-                winner.add_npc(npc)
-                npc.apply_effects(winner)
-                
+                winner.add_npc(npc, self.presenter)
+                self.log_event(EV_NPC_GAIN, winner, npc.id)
+                npc.apply_effects(winner, self.presenter)
+
                 self.long_delay()
                 break
             else:
                 # Uavgjort - fortsett til neste runde
-                print(f"\n🤝 Uavgjort! {len(winners)} spillere fikk {min_roll}")
-                print(f"🔄 Fortsetter til neste runde...")
+                self.presenter.say("\n🤝 Uavgjort! {} spillere fikk {}", len(winners), min_roll)
+                self.presenter.say("🔄 Fortsetter til neste runde...")
                 eligible_players = winners
                 round_number += 1
                 self.long_delay()
 
     def handle_vomiting(self, player):
         """Håndter når en spiller kaster opp"""
-        print(f"💀 {player.name} mister 50% av minnepoengene sine!")
-        print(f"🤮 {player.name} mister 1 promille på grunn av å kaste opp!")
-        
+        self.presenter.say("💀 {} mister 50% av minnepoengene sine!", player.name)
+        self.presenter.say("🤮 {} mister 1 promille på grunn av å kaste opp!", player.name)
+
         # Beregn 50% tap av minnepoeng
         memory_loss = int(player.memory * 0.5)
         player.add_memory(-memory_loss)
-        
+        self.log_event(EV_VOMIT, player, memory_loss)
+
         # Mister 1 promille
         player.add_promille(-1)
-        
-        print(f"😢 {player.name} mistet {memory_loss} minnepoeng og har nå {player.memory} minnepoeng.")
-        
+
+        self.presenter.say("😢 {} mistet {} minnepoeng og har nå {} minnepoeng.", player.name, memory_loss, player.memory)
+
         # Spilleren må kaste et valgfritt kort
         if player.hand:
-            print(f"\n🗑️ {player.name} må kaste et kort på grunn av å kaste opp!")
+            self.presenter.say("\n🗑️ {} må kaste et kort på grunn av å kaste opp!", player.name)
             self.discard_card_after_vomiting(player)
-        
+
         # Alle andre spillere får 3 minnepoeng
-        for other_player in self.players:
-            if other_player != player:
-                other_player.add_memory(3)
-                print(f"🎉 {other_player.name} får 3 minnepoeng fordi {player.name} kastet opp!")
-        
+        if self.large_lobby:
+            for other_player in self.players:
+                if other_player != player:
+                    other_player.add_memory(3)
+            self.presenter.say("🎉 Alle de {} andre spillerne får 3 minnepoeng fordi {} kastet opp!",
+                               len(self.players) - 1, player.name)
+        else:
+            for other_player in self.players:
+                if other_player != player:
+                    other_player.add_memory(3)
+                    self.presenter.say("🎉 {} får 3 minnepoeng fordi {} kastet opp!", other_player.name, player.name)
+
         self.long_delay()
 
     def discard_card_after_vomiting(self, player):
         """La spilleren kaste et kort etter å ha kastet opp"""
         if not player.hand:
             return
-        
-        print(f"\n📋 Hånden din:")
-        for i, card in enumerate(player.hand, 1):
-            print(f"  {i}. {card.name} - {card.display_text}")
-        
-        if player.is_human:
-            while True:
-                try:
-                    choice = int(input(f"\n🎯 Velg kort å kaste (nummer): "))
-                    if 1 <= choice <= len(player.hand):
-                        break
-                    else:
-                        print("❌ Ugyldig valg!")
-                except ValueError:
-                    print("❌ Vennligst skriv inn et tall!")
-        else:
-            # AI-spiller velger tilfeldig kort
-            import random
-            choice = random.randint(1, len(player.hand))
-        
+
+        self.presenter.show_hand(player)
+
+        # La spilleren velge kort å kaste (AI velger tilfeldig)
+        choice = 1 + self.decide(player, "discard", len(player.hand), lambda: self.ask_number(
+            f"\n🎯 Velg kort å kaste (nummer): ", 1, len(player.hand)) - 1)
+
         # Kaste det valgte kortet
         discarded_card = player.hand.pop(choice - 1)
-        print(f"🗑️ {player.name} kaster {discarded_card.name} på grunn av å kaste opp!")
+        self.deck.discard(discarded_card)
+        self.presenter.say("🗑️ {} kaster {} på grunn av å kaste opp!", player.name, discarded_card.name)
 
     def handle_beer_chug(self, player):
         """Håndter chug-mekanisme for øl-kort"""
-        print(f"\n🍺 {player.name} har drukket en øl!")
-        print("Vil du prøve å chugge ølen?")
-        print("1. Chug ølen (kast 6+ for 2 minnepoeng, feil = -1 minnepoeng)")
-        print("2. Feig ut (ingen risiko)")
-        
-        if player.is_human:
-            while True:
-                try:
-                    choice = int(input("Velg alternativ (1-2): "))
-                    if choice in [1, 2]:
-                        break
-                    else:
-                        print("❌ Ugyldig valg! Velg 1 eller 2.")
-                except ValueError:
-                    print("❌ Vennligst skriv inn et tall!")
-        else:
+        self.presenter.say("\n🍺 {} har drukket en øl!", player.name)
+        self.presenter.say("Vil du prøve å chugge ølen?")
+        self.presenter.say("1. Chug ølen (kast 6+ for 2 minnepoeng, feil = -1 minnepoeng)")
+        self.presenter.say("2. Feig ut (ingen risiko)")
+        if self.presenter.verbose:
+            standard_bonus, chug_bonus, _ = player.dice_modifiers()[ROLL_CHUG]
+            self.presenter.say("🎯 Sjanse for å klare chuggen: {:.0%}", float(roll_success(6, standard_bonus + chug_bonus)))
+
+        choice = 1 + self.decide(player, "chug", 2, lambda: self.ask_number(
+            "Velg alternativ (1-2): ", 1, 2, invalid="❌ Ugyldig valg! Velg 1 eller 2.") - 1)
+        if not player.is_human:
             # AI-spiller velger tilfeldig
-            import random
-            choice = random.randint(1, 2)
-            print(f"🤖 {player.name} velger alternativ {choice}")
-        
+            self.presenter.say("🤖 {} velger alternativ {}", player.name, choice)
+
         if choice == 1:
             # Prøv å chugge
-            print(f"\n🍺 {player.name} prøver å chugge ølen!")
-            print("Du må kaste 6 eller høyere for å klare det!")
-            
-            # Sjekk for Tord's chug-bonus
-            chug_bonus = 0
-            for npc in player.npcs:
-                if "chug_bonus" in npc.effects:
-                    chug_bonus += npc.effects["chug_bonus"]
-                    print(f"🏆 {npc.name} gir {npc.effects['chug_bonus']} bonus på chuggekast!")
-            
+            self.presenter.say("\n🍺 {} prøver å chugge ølen!", player.name)
+            self.presenter.say("Du må kaste 6 eller høyere for å klare det!")
+
+            # Tord's chug-bonus
+            standard_bonus, chug_bonus, sources = player.dice_modifiers()[ROLL_CHUG]
+            for npc_name, value, label in sources:
+                self.presenter.say("🏆 {} gir {} bonus på {}!", npc_name, value, label)
+
             # Kast terning for chug med bonus
-            self.typewriter_print(f"\n🎲 {player.name} kaster terning...")
+            self.typewriter_print("\n🎲 {} kaster terning...", player.name)
             self.long_delay()
             self.loading_effect("Terningen ruller...")
-            
-            import random
-            base_roll = random.randint(1, 6)
-            standard_bonus = player.get_dice_bonus()
+
+            base_roll = self.rng.randint(1, 6)
             total_result = base_roll + standard_bonus + chug_bonus
-            
-            print(f"🎲 {player.name} kaster terning for chugge øl: {base_roll} + {standard_bonus} + {chug_bonus} = {total_result}")
-            
+            self.log_roll(player, ROLL_CHUG, base_roll, standard_bonus, chug_bonus, 6, total_result >= 6)
+
+            self.presenter.say("🎲 {} kaster terning for chugge øl: {} + {} + {} = {}", player.name, base_roll, standard_bonus, chug_bonus, total_result)
+
             if total_result >= 6:
-                print(f"🏆 {player.name} klarte å chugge ølen!")
-                print(f"🎉 {player.name} får 2 minnepoeng for å chugge!")
+                self.presenter.say("🏆 {} klarte å chugge ølen!", player.name)
+                self.presenter.say("🎉 {} får 2 minnepoeng for å chugge!", player.name)
                 player.add_memory(2)
             else:
-                print(f"😔 {player.name} klarte ikke å chugge ølen...")
-                print(f"💀 {player.name} mister 1 minnepoeng!")
+                self.presenter.say("😔 {} klarte ikke å chugge ølen...", player.name)
+                self.presenter.say("💀 {} mister 1 minnepoeng!", player.name)
                 player.add_memory(-1)
         else:
-            print(f"😅 {player.name} feiger ut og drikker ølen normalt.")
+            self.presenter.say("😅 {} feiger ut og drikker ølen normalt.", player.name)
 
     def handle_bong_choice(self, player):
         """Håndter Bong-kortet hvor spilleren kan velge mellom øl, drink eller shot"""
-        print(f"\n🌿 {player.name} spiller Bong-kortet!")
-        print("Velg hva du vil bytte mot:")
-        print("1. Øl (0.5% promille)")
-        print("2. Drink (0.5% promille, 1 minnepoeng)")
-        print("3. Shot (1% promille, 1 minnepoeng)")
-        
-        if player.is_human:
-            choice = input("Velg alternativ (1-3): ")
-        else:
+        self.presenter.say("\n🌿 {} spiller Bong-kortet!", player.name)
+        self.presenter.say("Velg hva du vil bytte mot:")
+        self.presenter.say("1. Øl (0.5% promille)")
+        self.presenter.say("2. Drink (0.5% promille, 1 minnepoeng)")
+        self.presenter.say("3. Shot (1% promille, 1 minnepoeng)")
+
+        choice = 1 + self.decide(player, "bong", 3, self.ask_bong_choice)
+        if not player.is_human:
             # AI-spiller velger tilfeldig
-            import random
-            choice = str(random.randint(1, 3))
-            print(f"🤖 {player.name} velger alternativ {choice}")
-        
+            self.presenter.say("🤖 {} velger alternativ {}", player.name, choice)
+
         # Finn det valgte kortet og spill det
         chosen_card = None
-        if choice == "1":
-            print(f"🍺 {player.name} velger øl!")
+        if choice == 1:
+            self.presenter.say("🍺 {} velger øl!", player.name)
             chosen_card = self.find_card_by_name("Drikk en øl")
-        elif choice == "2":
-            print(f"🍹 {player.name} velger drink!")
+        elif choice == 2:
+            self.presenter.say("🍹 {} velger drink!", player.name)
             chosen_card = self.find_card_by_name("Drikk en drink")
-        elif choice == "3":
-            print(f"🥃 {player.name} velger shot!")
+        elif choice == 3:
+            self.presenter.say("🥃 {} velger shot!", player.name)
             chosen_card = self.find_card_by_name("Shot")
         else:
-            print("Ugyldig valg, velger øl som standard.")
+            self.presenter.say("Ugyldig valg, velger øl som standard.")
             chosen_card = self.find_card_by_name("Drikk en øl")
-        
+
         if chosen_card:
             # Spill det valgte kortet med alle regler og effekter
             chosen_card.play(player, self.current_place, self)
 
+    def ask_bong_choice(self):
+        """Spør en ekte spiller om Bong-valget (ugyldig svar gir NO_CHOICE, som betyr øl)"""
+        choice = self.presenter.ask("Velg alternativ (1-3): ")
+        if choice in ("1", "2", "3"):
+            return int(choice) - 1
+        return NO_CHOICE
+
     def handle_round_drinks(self, player):
         """Håndter 'Ta en runde' kortet hvor alle får øl-effekt og kan chugge"""
-        print(f"\n🍻 {player.name} spiller 'Ta en runde'!")
-        print("Alle spillere får øl-effekt og kan velge å chugge!")
-        
+        self.presenter.say("\n🍻 {} spiller 'Ta en runde'!", player.name)
+        self.presenter.say("Alle spillere får øl-effekt og kan velge å chugge!")
+
         # Finn øl-kortet
         beer_card = self.find_card_by_name("Drikk en øl")
         if not beer_card:
-            print("Feil: Kunne ikke finne øl-kortet!")
+            self.presenter.say("Feil: Kunne ikke finne øl-kortet!")
+            return
+
+        if self.large_lobby:
+            self.handle_group_round_drinks(beer_card)
             return
-        
+
         # Gå gjennom alle spillere
         for p in self.players:
-            print(f"\n{'='*40}")
-            print(f"🍺 {p.name.upper()} SIN TUR")
-            print(f"{'='*40}")
-            
+            self.presenter.say("\n{}", "=" * 40)
+            self.presenter.say("🍺 {} SIN TUR", p.name.upper())
+            self.presenter.say("=" * 40)
+
             # Spill øl-kortet for spilleren (med alle regler og effekter)
             beer_card.play(p, self.current_place, self)
-            
+
             self.long_delay()
-        
-        print(f"\n🍻 Runden er ferdig! Alle har fått øl-effekt.")
+
+        self.presenter.say("\n🍻 Runden er ferdig! Alle har fått øl-effekt.")
+
+    def handle_group_round_drinks(self, beer_card):
+        """'Ta en runde' i stor lobby: tilfeldige AI-er drikker uten utskrift, andre spiller som vanlig"""
+        memory_before = sum(p.memory for p in self.players)
+        presenter = self.presenter
+        for p in self.players:
+            if p.is_human or p.agent is not None:
+                presenter.say("\n🍺 {} SIN TUR", p.name.upper())
+                beer_card.play(p, self.current_place, self)
+                continue
+            self.presenter = QUIET
+            try:
+                beer_card.play(p, self.current_place, self)
+            finally:
+                self.presenter = presenter
+        gained = sum(p.memory for p in self.players) - memory_before
+        presenter.say("\n🍻 Runden er ferdig! {} spillere fikk øl-effekt ({:+} minnepoeng totalt).",
+                      len(self.players), gained)
+        self.long_delay()
 
     def handle_icing(self, player):
         """Håndter Ice'ing kortet hvor alle kaster terning og matcher får ice"""
-        print(f"\n🧊 {player.name} spiller Ice'ing!")
-        print("Alle spillere kaster terning. De som matcher får ice (+0.5% promille)!")
-        
+        self.presenter.say("\n🧊 {} spiller Ice'ing!", player.name)
+        self.presenter.say("Alle spillere kaster terning. De som matcher får ice (+0.5% promille)!")
+        if self.presenter.verbose and not self.large_lobby:
+            others = tuple(p.dice_modifiers()[ROLL_ICING][0] for p in self.players if p != player)
+            expected = sum(k * p for k, p in enumerate(icing_matches(player.dice_modifiers()[ROLL_ICING][0], others)))
+            self.presenter.say("🎯 Forventet antall som matcher: {:.1f}", float(expected))
+
         # Spilleren kaster først (kun standard promille-bonus, ikke ferdighetskast)
-        print(f"\n🎲 {player.name} kaster terning...")
+        self.presenter.say("\n🎲 {} kaster terning...", player.name)
         self.long_delay()
         self.loading_effect("Terningen ruller...")
-        
-        import random
-        base_roll = random.randint(1, 6)
-        bonus = player.get_dice_bonus()  # Kun standard promille-bonus
-        
+
+        base_roll = self.rng.randint(1, 6)
+        bonus = player.dice_modifiers()[ROLL_ICING][0]  # Kun standard promille-bonus
+
         player_roll = base_roll + bonus
-        print(f"🎲 {player.name} kastet: {base_roll} + {bonus} = {player_roll}")
-        
+        self.log_roll(player, ROLL_ICING, base_roll, bonus, 0, NO_TARGET, False)
+        self.presenter.say("🎲 {} kastet: {} + {} = {}", player.name, base_roll, bonus, player_roll)
+
         # Alle andre spillere kaster (kun standard promille-bonus)
         matches = 0
-        for other_player in self.players:
-            if other_player != player:
-                print(f"\n🎲 {other_player.name} kaster terning...")
-                self.long_delay()
-                self.loading_effect("Terningen ruller...")
-                
-                other_base_roll = random.randint(1, 6)
-                other_bonus = other_player.get_dice_bonus()  # Kun standard promille-bonus
-                
-                other_roll = other_base_roll + other_bonus
-                print(f"🎲 {other_player.name} kastet: {other_base_roll} + {other_bonus} = {other_roll}")
-                
-                if abs(other_roll - player_roll) <= 1:
-                    print(f"🧊 {other_player.name} matcher! Får ice (+0.5% promille)!")
-                    other_player.add_promille(0.5)
-                    matches += 1
-                else:
-                    print(f"❄️ {other_player.name} matcher ikke.")
-        
+        if self.large_lobby:
+            matches = self.handle_group_icing(player, player_roll)
+        else:
+            for other_player in self.players:
+                if other_player != player:
+                    self.presenter.say("\n🎲 {} kaster terning...", other_player.name)
+                    self.long_delay()
+                    self.loading_effect("Terningen ruller...")
+
+                    other_base_roll = self.rng.randint(1, 6)
+                    other_bonus = other_player.dice_modifiers()[ROLL_ICING][0]  # Kun standard promille-bonus
+
+                    other_roll = other_base_roll + other_bonus
+                    # Målet er spillerens kast; suksess = matcher (innen 1)
+                    self.log_roll(other_player, ROLL_ICING, other_base_roll, other_bonus, 0, player_roll,
+                                  abs(other_roll - player_roll) <= 1)
+                    self.presenter.say("🎲 {} kastet: {} + {} = {}", other_player.name, other_base_roll, other_bonus, other_roll)
+
+                    if abs(other_roll - player_roll) <= 1:
+                        self.presenter.say("🧊 {} matcher! Får ice (+0.5% promille)!", other_player.name)
+                        other_player.add_promille(0.5)
+                        matches += 1
+                    else:
+                        self.presenter.say("❄️ {} matcher ikke.", other_player.name)
+
         # Spilleren får minnepoeng basert på antall matches
         if matches > 0:
-            print(f"\n🎉 {player.name} får {matches} minnepoeng fordi {matches} spillere matchet!")
+            self.presenter.say("\n🎉 {} får {} minnepoeng fordi {} spillere matchet!", player.name, matches, matches)
             player.add_memory(matches)
         else:
-            print(f"\n😔 Ingen matchet {player.name}s kast. Ingen minnepoeng.")
-        
+            self.presenter.say("\n😔 Ingen matchet {}s kast. Ingen minnepoeng.", player.name)
+
         self.long_delay()
 
+    def handle_group_icing(self, player, player_roll):
+        """Ice'ing i stor lobby: alle andre kaster i én omgang; returnerer antall som matchet"""
+        matched = []
+        for other_player in self.players:
+            if other_player != player:
+                other_base_roll = self.rng.randint(1, 6)
+                other_bonus = other_player.dice_modifiers()[ROLL_ICING][0]
+                match = abs(other_base_roll + other_bonus - player_roll) <= 1
+                self.log_roll(other_player, ROLL_ICING, other_base_roll, other_bonus, 0, player_roll, match)
+                if match:
+                    other_player.add_promille(0.5)
+                    matched.append(other_player)
+        if matched:
+            self.presenter.say("🧊 Matcher og får ice (+0.5% promille): {}", summarize_names(matched))
+        return len(matched)
+
     def find_card_by_name(self, card_name):
         """Finn et kort basert på navn"""
-        for card in self.cards:
-            if card.name == card_name:
-                return card
-        return None
+        return self.cards_by_name.get(card_name)
 
     def check_npc_turn_effects(self, player):
         """Sjekk NPC-effekter som påvirker om spilleren kan spille denne runden"""
@@ -1093,63 +1186,37 @@ class GameEngine:
 
     def handle_dring_effect(self, player, dring_npc):
         """Håndter Dring NPC-effekten"""
-        print(f"\n🍺 {player.name} er dringa!")
-        print(f"Du må kaste 3 eller høyere for å kunne spille denne runden!")
+        self.presenter.say("\n🍺 {} er dringa!", player.name)
+        self.presenter.say("Du må kaste 3 eller høyere for å kunne spille denne runden!")
         self.long_delay()
-        
+
         # Kast terning
         if self.roll_dice(player, target_number=3, action_description="å kunne spille"):
-            print(f"✅ {player.name} kan spille denne runden!")
+            self.presenter.say("✅ {} kan spille denne runden!", player.name)
             return True
         else:
-            print(f"❌ {player.name} må stå over runden!")
-            print(f"Du må kaste bort et kort uten å få effekt av det.")
-            
+            self.presenter.say("❌ {} må stå over runden!", player.name)
+            self.presenter.say("Du må kaste bort et kort uten å få effekt av det.")
+
             # Vis kort på hånden
-            print(f"\n📋 Hånden din:")
-            for idx, card in enumerate(player.hand):
-                if card.display_text:
-                    print(f"  {idx+1}. {card.name} - {card.display_text}")
-                else:
-                    print(f"  {idx+1}. {card.name}")
-            
-            # La spilleren velge kort å kaste
-            if player.is_human:
-                while True:
-                    choice = input(f"\n🎯 Velg kort å kaste (nummer): ")
-                    if choice.isdigit() and 1 <= int(choice) <= len(player.hand):
-                        card_idx = int(choice) - 1
-                        discarded_card = player.hand.pop(card_idx)
-                        print(f"🗑️ {player.name} kaster {discarded_card.name} uten effekt!")
-                        return False
-                    else:
-                        print("❌ Ugyldig valg. Prøv igjen.")
-            else:
-                # AI-spiller velger tilfeldig kort
-                card_idx = random.randint(0, len(player.hand) - 1)
-                discarded_card = player.hand.pop(card_idx)
-                print(f"🗑️ {player.name} kaster {discarded_card.name} uten effekt!")
-                return False
+            self.presenter.show_hand(player)
+
+            # La spilleren velge kort å kaste (AI velger tilfeldig)
+            card_idx = self.decide(player, "dring_discard", len(player.hand), lambda: self.ask_number(
+                f"\n🎯 Velg kort å kaste (nummer): ", 1, len(player.hand), invalid="❌ Ugyldig valg. Prøv igjen.") - 1)
+            discarded_card = player.hand.pop(card_idx)
+            self.deck.discard(discarded_card)
+            self.presenter.say("🗑️ {} kaster {} uten effekt!", player.name, discarded_card.name)
+            return False
 
     def end_game(self):
         """Avslutt spillet og vis resultater"""
-        print(f"\n{'='*50}")
-        self.typewriter_print(f"🏁 SPILLET ER SLUTT!")
-        print(f"{'='*50}")
-        self.long_delay()
-        
-        self.typewriter_print(f"\n📊 ENDELIG RESULTAT:")
-        print(f"{'Spiller':<12} {'Minner':<7} {'Promille':<8} {'Status'}")
-        print("-" * 40)
-        
-        for player in self.players:
-            status = "🏆 VINNER!" if player.memory == max(p.memory for p in self.players) else "💀 Taper"
-            self.typewriter_print(f"{player.name:<12} {player.memory:<7} {player.promille:<8.1f} {status}")
-            self.quick_delay()
-        
         # Finn vinneren
-        winner = max(self.players, key=lambda p: p.memory)
-        self.long_delay()
-        self.typewriter_print(f"\n🎉 GRATULERER {winner.name.upper()}! 🎉")
-        self.typewriter_print(f"🏆 Du vant med {winner.memory} minnepoeng! 🏆")
-        print(f"{'='*50}")
+        if self.leaderboard is not None:
+            winner = self.leaderboard.leader()
+        else:
+            winner = max(self.players, key=lambda p: p.memory)
+        if self.event_log is not None:
+            self.event_log.game_over(self, self.players.index(winner))
+        self.presenter.show_final_result(self, winner)
+        return winner
@@ -0,0 +1,279 @@
+# -*- coding: utf-8 -*-
+# eventlog.py
+"""Binær, komprimert hendelseslogg for ett spill, med keyframes for å hoppe til en tur.
+
+Filformat:
+  MAGIC, u32 lengde + JSON-header (seed, spillere, navn på kort/steder/NPC-er)
+  blokker: BLOCK_HEADER (komprimert lengde, rå lengde, første tur, flagg) + data
+
+Hver hendelse er én byte med type fulgt av faste felt (EVENT_FORMATS). Blokkene
+komprimeres hver for seg (zlib eller lzma), og hver keyframe_every-te tur starter en ny
+blokk med et snapshot av motoren (som JSON), slik at en leser kan hoppe rett til nærmeste
+keyframe før en gitt tur. Logger kan komme fra andre, så ingenting i dem kjøres som kode. Blokkene skrives etter hvert som de fylles, så en avbrutt
+logg kan leses frem til siste hele blokk.
+
+Motoren snakker med loggen (og andre mottakere, som analytics.BalanceStats) gjennom
+start(engine), begin_turn(engine, plass), record(type, *felt) og game_over(engine, vinner).
+"""
+
+import json
+import lzma
+import struct
+import zlib
+from .player import ROLL_TYPES
+
+LOG_VERSION = 2  # Versjon 2: keyframes som JSON (versjon 1 brukte pickle)
+MAGIC = b"SMORLOG" + bytes([LOG_VERSION])
+BLOCK_HEADER = struct.Struct("<IIIB")
+LENGTH = struct.Struct("<I")
+
+# Flagg i blokk-headeren
+BLOCK_KEYFRAME = 1  # Blokken starter med et snapshot
+BLOCK_LZMA = 2  # Komprimert med lzma (ellers zlib)
+
+# Hendelsestyper
+EV_PHASE = 1
+EV_TURN = 2
+EV_CARD = 3
+EV_ROLL = 4
+EV_NPC_GAIN = 5
+EV_NPC_LOSS = 6
+EV_VOMIT = 7
+EV_BOUNCER = 8
+EV_GAME_OVER = 9
+EV_KEYFRAME = 10
+
+# type -> (navn, felt, struct for feltene)
+EVENT_FORMATS = {
+    EV_PHASE: ("phase", ("phase", "place"), struct.Struct("<BB")),
+    EV_TURN: ("turn", ("player",), struct.Struct("<B")),
+    EV_CARD: ("card", ("player", "card"), struct.Struct("<BB")),
+    EV_ROLL: ("roll", ("player", "roll_type", "base", "bonus", "npc_bonus", "target", "success"),
+              struct.Struct("<BBBbbbB")),
+    EV_NPC_GAIN: ("npc_gain", ("player", "npc"), struct.Struct("<BB")),
+    EV_NPC_LOSS: ("npc_loss", ("player", "npc"), struct.Struct("<BB")),
+    EV_VOMIT: ("vomit", ("player", "memory_lost"), struct.Struct("<Bh")),
+    EV_BOUNCER: ("bouncer", ("player", "admitted"), struct.Struct("<BB")),
+    EV_GAME_OVER: ("game_over", ("winner",), struct.Struct("<B")),
+}
+
+ROLL_TYPE_IDS = {roll_type: index for index, roll_type in enumerate(ROLL_TYPES)}
+
+# Mål for kast som ikke kan lykkes eller feile (auksjonskast og Ice'ing-kasterens eget kast)
+NO_TARGET = 0
+
+
+class EventLog:
+    """Skriver hendelser fra ett spill til fil (GameEngine(..., event_log=EventLog(sti))).
+
+    Hendelsene samles i en buffer og skrives som komprimerte blokker; close() skriver
+    resten. Kan brukes som context manager.
+    """
+
+    def __init__(self, path, keyframe_every=16, codec="zlib", block_size=1 << 16):
+        if codec not in ("zlib", "lzma"):
+            raise ValueError(f"Ukjent codec: {codec!r}")
+        self.path = path
+        self.keyframe_every = keyframe_every
+        self.codec = codec
+        self.block_size = block_size
+        self.file = None
+        self.buffer = bytearray()
+        self.turn = 0  # Antall turer startet så langt (tur 0 er oppsettet før første tur)
+        self.block_turn = 0  # Første tur i blokken som bygges
+        self.block_flags = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def start(self, engine):
+        """Åpne filen og skriv headeren (kalles av GameEngine)"""
+        header = {
+            "format": LOG_VERSION,
+            "seed": engine.seed,
+            "players": [player.name for player in engine.players],
+            "phases": list(engine.phases),
+            "cards": [card.name for card in engine.cards],
+            "places": [place.name for place in engine.places],
+            "npcs": [npc.name for npc in engine.npc_prototypes],
+            "keyframe_every": self.keyframe_every,
+        }
+        data = json.dumps(header, ensure_ascii=False).encode("utf-8")
+        self.file = open(self.path, "wb")
+        self.file.write(MAGIC + LENGTH.pack(len(data)) + data)
+
+    def record(self, kind, *values):
+        self.buffer.append(kind)
+        self.buffer += EVENT_FORMATS[kind][2].pack(*values)
+        if len(self.buffer) >= self.block_size:
+            self.flush_block()
+
+    def begin_turn(self, engine, seat):
+        """Ny tur; hver keyframe_every-te tur starter en ny blokk med et snapshot"""
+        self.turn += 1
+        if (self.turn - 1) % self.keyframe_every == 0:
+            self.flush_block()
+            self.block_flags = BLOCK_KEYFRAME
+            snapshot = encode_snapshot(engine.snapshot())
+            self.buffer.append(EV_KEYFRAME)
+            self.buffer += LENGTH.pack(len(snapshot)) + snapshot
+        self.record(EV_TURN, seat)
+
+    def game_over(self, engine, winner):
+        self.record(EV_GAME_OVER, winner)
+        self.flush_block()
+
+    def flush_block(self):
+        """Komprimer og skriv bufferen som én blokk"""
+        if self.buffer:
+            raw = bytes(self.buffer)
+            flags = self.block_flags
+            if self.codec == "lzma":
+                data = lzma.compress(raw)
+                flags |= BLOCK_LZMA
+            else:
+                data = zlib.compress(raw)
+            self.file.write(BLOCK_HEADER.pack(len(data), len(raw), self.block_turn, flags) + data)
+            self.buffer.clear()
+        self.block_turn = self.turn
+        self.block_flags = 0
+
+    def close(self):
+        if self.file is not None:
+            self.flush_block()
+            self.file.close()
+            self.file = None
+
+
+def encode_snapshot(snapshot):
+    """GameEngine.snapshot() som kompakt JSON (id-bytes som lister med tall)"""
+    (rng_state, phase_index, phase, turn_index, place, visited, pool, town, deck, players) = snapshot
+    version, internal, gauss = rng_state
+    return json.dumps({
+        "rng": [version, internal, gauss], "phase_index": phase_index, "phase": phase, "turn_index": turn_index,
+        "place": place, "visited": list(visited), "pool": list(pool), "town": list(town),
+        "deck": [list(part) for part in deck],
+        "players": [[promille, memory, list(hand), list(npcs), last_card, last_promille, status]
+                    for promille, memory, hand, npcs, last_card, last_promille, status in players],
+    }, separators=(",", ":")).encode("ascii")
+
+
+def decode_snapshot(raw):
+    """Motsatt av encode_snapshot: samme tuppel som GameEngine.snapshot() gir"""
+    try:
+        data = json.loads(raw.decode("ascii"))
+        version, internal, gauss = data["rng"]
+        return ((version, tuple(internal), gauss), data["phase_index"], data["phase"], data["turn_index"],
+                data["place"], bytes(data["visited"]), bytes(data["pool"]), bytes(data["town"]),
+                tuple(bytes(part) for part in data["deck"]),
+                tuple((promille, memory, bytes(hand), bytes(npcs), last_card, last_promille, status)
+                      for promille, memory, hand, npcs, last_card, last_promille, status in data["players"]))
+    except (KeyError, TypeError, ValueError) as error:
+        raise ValueError(f"Ugyldig keyframe i hendelsesloggen: {error}") from error
+
+
+class EventLogReader:
+    """Leser en hendelseslogg: header, blokk-indeks og hendelser fra en gitt tur.
+
+    Hendelser gis som (tur, navn, {felt: verdi}); keyframes som (tur, "keyframe", snapshot).
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.blocks = []  # (posisjon, komprimert lengde, første tur, flagg)
+        with open(path, "rb") as f:
+            if f.read(len(MAGIC)) != MAGIC:
+                raise ValueError(f"{path} er ikke en hendelseslogg")
+            (length,) = LENGTH.unpack(f.read(LENGTH.size))
+            self.header = json.loads(f.read(length).decode("utf-8"))
+            # Bare blokk-headerne leses; dataene hoppes over
+            while True:
+                head = f.read(BLOCK_HEADER.size)
+                if len(head) < BLOCK_HEADER.size:
+                    break
+                size, _, first_turn, flags = BLOCK_HEADER.unpack(head)
+                offset = f.tell()
+                if len(f.read(size)) < size:
+                    break  # Avbrutt skriving: resten er ufullstendig
+                self.blocks.append((offset, size, first_turn, flags))
+
+    def keyframe_block(self, turn):
+        """Indeks til siste blokk med keyframe ved eller før turen"""
+        start = 0
+        for index, (_, _, first_turn, flags) in enumerate(self.blocks):
+            if first_turn > turn:
+                break
+            if flags & BLOCK_KEYFRAME:
+                start = index
+        return start
+
+    def events(self, from_turn=0):
+        """Alle hendelser fra nærmeste keyframe før from_turn og utover"""
+        blocks = self.blocks[self.keyframe_block(from_turn):]
+        if not blocks:
+            return
+        _, _, turn, flags = blocks[0]
+        if flags & BLOCK_KEYFRAME:
+            turn -= 1  # Turen starter med EV_TURN rett etter keyframen
+        with open(self.path, "rb") as f:
+            for offset, size, _, flags in blocks:
+                f.seek(offset)
+                data = f.read(size)
+                raw = lzma.decompress(data) if flags & BLOCK_LZMA else zlib.decompress(data)
+                position = 0
+                while position < len(raw):
+                    kind = raw[position]
+                    position += 1
+                    if kind == EV_KEYFRAME:
+                        (length,) = LENGTH.unpack_from(raw, position)
+                        position += LENGTH.size
+                        yield turn + 1, "keyframe", decode_snapshot(raw[position:position + length])
+                        position += length
+                        continue
+                    name, fields, layout = EVENT_FORMATS[kind]
+                    values = layout.unpack_from(raw, position)
+                    position += layout.size
+                    if kind == EV_TURN:
+                        turn += 1
+                    yield turn, name, dict(zip(fields, values))
+
+    def seek(self, turn):
+        """(tur, snapshot) for nærmeste keyframe ved eller før turen, og hendelsene etter den"""
+        events = self.events(turn)
+        for event in events:
+            if event[1] == "keyframe":
+                return event[0], event[2], events
+            break
+        return 0, None, self.events(0)
+
+    def describe(self, name, values):
+        """Lesbar tekst for en hendelse"""
+        header = self.header
+        player = header["players"][values["player"]] if "player" in values else None
+        if name == "phase":
+            return f"🌃 {header['phases'][values['phase']]} på {header['places'][values['place']]}"
+        if name == "turn":
+            return f"🎮 {player} sin tur"
+        if name == "card":
+            return f"🃏 {player} spiller {header['cards'][values['card']]}"
+        if name == "roll":
+            total = values["base"] + values["bonus"] + values["npc_bonus"]
+            roll = (f"🎲 {player} ({ROLL_TYPES[values['roll_type']]}): {values['base']} + {values['bonus']} + "
+                    f"{values['npc_bonus']} = {total}")
+            if values["target"] == NO_TARGET:
+                return roll
+            return f"{roll} mot {values['target']} {'✅' if values['success'] else '❌'}"
+        if name == "npc_gain":
+            return f"➕ {player} får {header['npcs'][values['npc']]}"
+        if name == "npc_loss":
+            return f"➖ {player} mister {header['npcs'][values['npc']]}"
+        if name == "vomit":
+            return f"🤮 {player} kaster opp og mister {values['memory_lost']} minner"
+        if name == "bouncer":
+            return f"🚪 {player} {'kommer inn' if values['admitted'] else 'blir nektet inngang'}"
+        if name == "game_over":
+            return f"🏁 {header['players'][values['winner']]} vinner"
+        return name
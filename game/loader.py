@@ -0,0 +1,8 @@
+# -*- coding: utf-8 -*-
+# loader.py
+
+from .rules import load_rulebook
+
+def load_game_data(data_dir="data"):
+    """Les steder, kort og NPC-prototyper fra JSON-filene i data_dir (validert og cachet)"""
+    return load_rulebook(data_dir).game_data()
@@ -0,0 +1,92 @@
+# -*- coding: utf-8 -*-
+# lobby.py
+"""Stor lobby (party-modus): spill med mange spillere (20-100) ved samme bord.
+
+Reglene er de samme som med 2-4 spillere, og RNG-en brukes i samme rekkefølge, så et
+spill gir samme resultat med og uten stor lobby. Det som endres er arbeidet per tur:
+  - Leaderboard holder minnene sortert i bøtter og oppdateres ved hver endring, så
+    leder og plassering finnes uten å gå gjennom alle spillerne
+  - Gruppekast (dørvakt, Ice'ing, "Ta en runde") kastes i én omgang og vises som et
+    sammendrag i stedet for én blokk med pauser per spiller
+  - Tur-planleggingen går bare gjennom spillerne som fortsatt har kort i fasen
+  - Stillingen vises som toppliste pluss plassering, ikke som hele tabellen
+"""
+
+# Stor lobby slås på automatisk for flere spillere enn dette
+LARGE_LOBBY = 4
+
+# Flest spillere ved ett bord (setup_players)
+MAX_PLAYERS = 100
+
+# Antall spillere i topplister og navn i sammendrag
+LEADERS_SHOWN = 5
+STANDINGS_SHOWN = 10
+NAMES_SHOWN = 8
+
+
+class Leaderboard:
+    """Spillerne gruppert på minner (minner -> plasser), oppdatert av Player.add_memory.
+
+    version øker ved hver endring, så presenteren kan se om stillingen er ny uten å
+    sammenligne alle spillerne.
+    """
+
+    __slots__ = ("players", "seats", "buckets", "top", "version")
+
+    def __init__(self, players):
+        self.players = players
+        self.seats = {player: seat for seat, player in enumerate(players)}
+        self.buckets = {}  # minner -> sett med plasser
+        for seat, player in enumerate(players):
+            self.buckets.setdefault(player.memory, set()).add(seat)
+            player.leaderboard = self
+        self.top = max(self.buckets, default=0)
+        self.version = 0
+
+    def moved(self, player, old_memory):
+        """Spilleren gikk fra old_memory til player.memory minner"""
+        new_memory = player.memory
+        if new_memory == old_memory:
+            return
+        seat = self.seats[player]
+        bucket = self.buckets[old_memory]
+        bucket.discard(seat)
+        if not bucket:
+            del self.buckets[old_memory]
+        self.buckets.setdefault(new_memory, set()).add(seat)
+        if new_memory > self.top:
+            self.top = new_memory
+        else:
+            while self.top not in self.buckets:
+                self.top -= 1
+        self.version += 1
+
+    def leader(self):
+        """Spilleren med flest minner (ved likhet den første, som max())"""
+        return self.players[min(self.buckets[self.top])]
+
+    def leaders(self, count):
+        """De count beste spillerne, sortert på minner og så plass"""
+        result = []
+        for memory in sorted(self.buckets, reverse=True):
+            for seat in sorted(self.buckets[memory]):
+                result.append(self.players[seat])
+                if len(result) == count:
+                    return result
+        return result
+
+    def rank(self, player):
+        """Plassering (1 = flest minner; delt plass ved likt antall)"""
+        return 1 + sum(len(seats) for memory, seats in self.buckets.items() if memory > player.memory)
+
+    def detach(self):
+        for player in self.players:
+            player.leaderboard = None
+
+
+def summarize_names(players, limit=NAMES_SHOWN):
+    """"A, B, C og 12 andre" for lange lister med spillere"""
+    names = [player.name for player in players[:limit]]
+    if len(players) > limit:
+        return f"{', '.join(names)} og {len(players) - limit} andre"
+    return ", ".join(names)
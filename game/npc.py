@@ -1,32 +1,90 @@
 # npc.py
 
+from .presenter import DEFAULT_PRESENTER
+
 class NPC:
-    def __init__(self, name, effects=None, display_text=""):
+    __slots__ = ("id", "name", "effects", "display_text")
+
+    def __init__(self, name, effects=None, display_text="", npc_id=None):
+        self.id = npc_id  # Liten heltalls-id (indeks i NPC-dataene), brukes i snapshots
         self.name = name
         self.effects = effects or {}
         self.display_text = display_text
 
-    def apply_effects(self, player):
+    def apply_effects(self, player, presenter=DEFAULT_PRESENTER):
         """Bruk NPC-effekter på spilleren når de hentes"""
         if "promille_bonus" in self.effects:
             player.add_promille(self.effects["promille_bonus"])
-            print(f"{player.name} får {self.effects['promille_bonus']} ekstra promille fra {self.name}!")
+            presenter.say("{} får {} ekstra promille fra {}!", player.name, self.effects["promille_bonus"], self.name)
             
         if "promille_penalty" in self.effects:
             player.add_promille(self.effects["promille_penalty"])
-            print(f"{player.name} får {self.effects['promille_penalty']} promille fra {self.name}!")
+            presenter.say("{} får {} promille fra {}!", player.name, self.effects["promille_penalty"], self.name)
             
         if "memory_bonus" in self.effects:
             player.add_memory(self.effects["memory_bonus"])
-            print(f"{player.name} får {self.effects['memory_bonus']} minnepoeng fra {self.name}!")
-
-    def apply_card_effects(self, player, card_name):
-        """Bruk NPC-effekter når kort spilles"""
-        if "double_beer" in self.effects and card_name in ["Drikk en øl", "Drikk en drink"]:
-            player.add_promille(0.5)  # Doble øl/drink-effekten
-            print(f"{self.name} dobler {card_name.lower()}-effekten for {player.name}!")
-        
-        # Sjefen sin spesialeffekt for "Kjenner dere ølet!"
-        if "enhance_know_beer" in self.effects and card_name == "Kjenner dere ølet!":
-            print(f"{self.name} forsterker effekten av 'Kjenner dere ølet!'!")
-            return "enhanced_know_beer"  # Signal til GameEngine om forsterket effekt
+            presenter.say("{} får {} minnepoeng fra {}!", player.name, self.effects["memory_bonus"], self.name)
+
+
+class NPCPool:
+    """NPC-er som ikke er i bruk (verken ute på byen eller hos en spiller).
+
+    Lagret som en liste med id-er over delte NPC-prototyper, med posisjonen til hver
+    id, så tilfeldig uttak, uttak av en bestemt NPC og tilbakelegging er O(1).
+    """
+
+    __slots__ = ("npcs", "ids", "positions")
+
+    def __init__(self, npcs):
+        self.npcs = npcs  # Prototyper, indeksert på NPC-id
+        self.ids = []
+        self.positions = [None] * len(npcs)  # NPC-id -> indeks i self.ids (None = i bruk)
+        self.reset()
+
+    def __len__(self):
+        return len(self.ids)
+
+    def __contains__(self, npc):
+        return self.positions[npc.id] is not None
+
+    def reset(self):
+        """Legg alle NPC-er tilbake i poolen"""
+        self.restore(bytes(range(len(self.npcs))))
+
+    def take_random(self, rng):
+        """Ta ut en tilfeldig NPC, eller None hvis poolen er tom"""
+        if not self.ids:
+            return None
+        return self._take_at(rng.randrange(len(self.ids)))
+
+    def take(self, npc):
+        """Ta ut en bestemt NPC"""
+        return self._take_at(self.positions[npc.id])
+
+    def give_back(self, npc):
+        """Legg en NPC tilbake i poolen"""
+        if self.positions[npc.id] is None:
+            self.positions[npc.id] = len(self.ids)
+            self.ids.append(npc.id)
+
+    def _take_at(self, index):
+        # Bytt med siste id og fjern fra slutten
+        ids = self.ids
+        npc_id = ids[index]
+        last = ids.pop()
+        if last != npc_id:
+            ids[index] = last
+            self.positions[last] = index
+        self.positions[npc_id] = None
+        return self.npcs[npc_id]
+
+    def snapshot(self):
+        return bytes(self.ids)
+
+    def restore(self, ids):
+        self.ids[:] = ids
+        positions = self.positions
+        for index in range(len(positions)):
+            positions[index] = None
+        for index, npc_id in enumerate(self.ids):
+            positions[npc_id] = index
@@ -1,34 +1,79 @@
 # player.py
 
-import random
+from .presenter import DEFAULT_PRESENTER
+from .effects import npc_flag_mask
+
+MAX_PROMILLE_TENTHS = 50  # Promille kan ikke overstige 5
+
+# Typer terningkast med hver sine NPC-bonuser
+ROLL_SKILL = "skill"  # Vanlige ferdighetskast (ringe en venn, Dring, sende vekk venn ...)
+ROLL_RESCUE = "rescue"
+ROLL_BOUNCER = "bouncer"
+ROLL_AUCTION = "auction"
+ROLL_CHUG = "chug"
+ROLL_ICING = "icing"
+ROLL_TYPES = (ROLL_SKILL, ROLL_RESCUE, ROLL_BOUNCER, ROLL_AUCTION, ROLL_CHUG, ROLL_ICING)
+
+# NPC-effekt -> (kast-typer den gjelder for, beskrivelse av kastet)
+NPC_ROLL_BONUSES = (
+    ("rescue_bonus", (ROLL_RESCUE,), "redningskast"),
+    ("bouncer_bonus", (ROLL_BOUNCER,), "dørvaktkast"),
+    ("skill_bonus", (ROLL_SKILL, ROLL_RESCUE, ROLL_BOUNCER, ROLL_AUCTION), "ferdighetskast"),
+    ("chug_bonus", (ROLL_CHUG,), "chuggekast"),
+)
 
 class Player:
-    def __init__(self, name, is_human=True):
+    __slots__ = ("name", "is_human", "agent", "promille_tenths", "memory", "hand", "npcs",
+                 "last_drink_card", "last_card_promille", "status", "_modifiers", "_modifier_sweetspot",
+                 "_npc_flags", "leaderboard")
+
+    def __init__(self, name, is_human=True, agent=None):
         self.name = name
         self.is_human = is_human
-        self.promille = 0
+        self.agent = agent  # Objekt med choose(engine, player, kind, num_options); None = tilfeldig AI
+        self.promille_tenths = 0  # Promille lagres som heltall i tideler (0.5 -> 5), så 0.5-steg ikke driver
         self.memory = 0
         self.hand = []  # Spillerens hånd med kort
         self.npcs = []  # NPC-er spilleren har hentet
         self.last_drink_card = None
         self.last_card_promille = 0
         self.status = "active"  # active, outside, standby, etc.
+        self._modifiers = None  # Cache fra dice_modifiers(), nullstilles når NPC-ene endres
+        self._modifier_sweetspot = False
+        self._npc_flags = None  # Cache fra npc_flags()
+        self.leaderboard = None  # Leaderboard i stor lobby (game/lobby.py), ellers None
+
+    @property
+    def promille(self):
+        return self.promille_tenths / 10
+
+    @promille.setter
+    def promille(self, value):
+        self.promille_tenths = min(max(round(value * 10), 0), MAX_PROMILLE_TENTHS)
 
     def add_promille(self, amount):
-        self.promille += amount
-        if self.promille < 0:
-            self.promille = 0
+        self.promille_tenths += round(amount * 10)
+        if self.promille_tenths < 0:
+            self.promille_tenths = 0
         # Promille kan ikke overstige 5
-        if self.promille > 5:
-            self.promille = 5
+        if self.promille_tenths > MAX_PROMILLE_TENTHS:
+            self.promille_tenths = MAX_PROMILLE_TENTHS
 
     def add_memory(self, amount):
         self.memory += amount
+        if self.leaderboard is not None:
+            self.leaderboard.moved(self, self.memory - amount)
 
-    def add_npc(self, npc):
+    def add_npc(self, npc, presenter=DEFAULT_PRESENTER):
         """Legg til en NPC til spilleren"""
         self.npcs.append(npc)
-        print(f"{self.name} har nå {len(self.npcs)} NPC-er")
+        self._modifiers = self._npc_flags = None
+        presenter.say("{} har nå {} NPC-er", self.name, len(self.npcs))
+
+    def remove_npc(self, index):
+        """Fjern og returner NPC-en på gitt plass"""
+        self._modifiers = self._npc_flags = None
+        return self.npcs.pop(index)
 
     def get_hand_size(self):
         """Hent antall kort på hånden"""
@@ -39,7 +84,7 @@ class Player:
         bonus = 0
         
         # Sweetspot bonus (1-3 promille)
-        if 1 <= self.promille <= 3:
+        if 10 <= self.promille_tenths <= 30:
             bonus += 1
             
         # Her kan vi legge til flere bonuser senere:
@@ -48,3 +93,48 @@ class Player:
         # - Sted-effekter som gir terningbonus
         
         return bonus
+
+    def dice_modifiers(self):
+        """Samlet terningbonus per kast-type: {type: (standard_bonus, npc_bonus, kilder)}.
+
+        kilder er (NPC-navn, bonus, beskrivelse) for visning. Tabellen bygges bare på
+        nytt når NPC-ene endres eller spilleren går inn/ut av sweetspot-promillen.
+        """
+        sweetspot = 10 <= self.promille_tenths <= 30
+        if self._modifiers is None or sweetspot != self._modifier_sweetspot:
+            self._modifier_sweetspot = sweetspot
+            self._modifiers = self._build_modifiers()
+        return self._modifiers
+
+    def npc_flags(self):
+        """Bitmaske over NPC-effekter som endrer kortspill (nøkkel i kort-effekttabellen)"""
+        if self._npc_flags is None:
+            self._npc_flags = npc_flag_mask(self.npcs)
+        return self._npc_flags
+
+    def _build_modifiers(self):
+        standard = self.get_dice_bonus()
+        special = dict.fromkeys(ROLL_TYPES, 0)
+        sources = {roll_type: [] for roll_type in ROLL_TYPES}
+        for effect_key, roll_types, label in NPC_ROLL_BONUSES:
+            for npc in self.npcs:
+                if effect_key in npc.effects:
+                    value = npc.effects[effect_key]
+                    for roll_type in roll_types:
+                        special[roll_type] += value
+                        sources[roll_type].append((npc.name, value, label))
+        return {roll_type: (standard, special[roll_type], tuple(sources[roll_type])) for roll_type in ROLL_TYPES}
+
+    def snapshot(self):
+        """Kompakt, uforanderlig kopi av spillerens tilstand (kort og NPC-er som id-bytes)"""
+        return (self.promille_tenths, self.memory,
+                bytes([card.id for card in self.hand]), bytes([npc.id for npc in self.npcs]),
+                self.last_drink_card, self.last_card_promille, self.status)
+
+    def restore(self, state, cards, npcs):
+        """Gjenopprett tilstand fra snapshot() (cards/npcs er prototyper indeksert på id)"""
+        (self.promille_tenths, self.memory, hand, npc_ids,
+         self.last_drink_card, self.last_card_promille, self.status) = state
+        self.hand = [cards[i] for i in hand]
+        self.npcs = [npcs[i] for i in npc_ids]
+        self._modifiers = self._npc_flags = None
@@ -0,0 +1,146 @@
+# -*- coding: utf-8 -*-
+# policy.py
+"""Policy-tabellen fra DP-løseren (game/solver.py) og agenten som spiller etter den.
+
+Tabellen leses med mmap, så et oppslag er én indeksberegning og tre byte, og flere
+prosesser deler de samme sidene. Filformat (little-endian):
+  header: b"SMRP", versjon, faser, steder, NPC-masker, promillenivåer, kort, maks håndstørrelse,
+          fingeravtrykk av regelsettet (16 byte)
+  deretter tre byte per (fase, sted, NPC-maske, promillenivå, hånd):
+          kort-id å spille, kort-id å kaste, Bong-valg (NO_ACTION = ingen verdi)
+
+Hånden er en multimengde av kort-id-er med 0 til maks kort og rangeres med HandIndex.
+Bong-valget slås opp med hånden uten Bong-kortet, slik den er når valget tas.
+"""
+
+import hashlib
+import math
+import mmap
+import os
+import struct
+from .player import ROLL_CHUG, MAX_PROMILLE_TENTHS
+from .probability import chug_expectation
+
+MAGIC = b"SMRP"
+TABLE_VERSION = 1
+HEADER = struct.Struct("<4sHBBBBBB16s")
+ENTRY_SIZE = 3
+NO_ACTION = 255
+
+# Promille i tabellen: nivåer med 0.5 promille mellom
+PROMILLE_STEP = 5
+LEVELS = MAX_PROMILLE_TENTHS // PROMILLE_STEP + 1
+
+
+def promille_level(tenths):
+    """Promillenivå for promille i tideler (avrundet til nærmeste nivå)"""
+    tenths = min(max(tenths, 0), MAX_PROMILLE_TENTHS)
+    return (tenths + PROMILLE_STEP // 2) // PROMILLE_STEP
+
+
+def rules_fingerprint(rulebook):
+    """16 byte som identifiserer regelsettet tabellen er løst for"""
+    return hashlib.sha256(rulebook.content_hash.encode()).digest()[:16]
+
+
+class HandIndex:
+    """Rangering av hender (sorterte kort-id-er, 0 til max_hand kort) til 0..count-1.
+
+    Hender med k kort kommer etter alle mindre hender; innenfor en størrelse brukes
+    kombinatorisk rangering av a_i + i, som er strengt stigende for en sortert multimengde.
+    """
+
+    __slots__ = ("num_cards", "max_hand", "binom", "offsets", "count")
+
+    def __init__(self, num_cards, max_hand):
+        self.num_cards = num_cards
+        self.max_hand = max_hand
+        self.binom = [[math.comb(n, k) for k in range(max_hand + 2)] for n in range(num_cards + max_hand + 1)]
+        self.offsets = [0]
+        for size in range(max_hand + 1):
+            self.offsets.append(self.offsets[-1] + math.comb(num_cards + size - 1, size))
+        self.count = self.offsets.pop()
+
+    def rank(self, card_ids):
+        rank = self.offsets[len(card_ids)]
+        binom = self.binom
+        for i, card in enumerate(card_ids):
+            rank += binom[card + i][i + 1]
+        return rank
+
+
+def write_table(path, fingerprint, shape, num_cards, max_hand, body):
+    """Skriv tabellen atomisk: shape er (faser, steder, masker, nivåer), body er alle oppslagene"""
+    if num_cards >= NO_ACTION:
+        raise ValueError(f"Policy-tabellen støtter høyst {NO_ACTION - 1} kort")
+    header = HEADER.pack(MAGIC, TABLE_VERSION, *shape, num_cards, max_hand, fingerprint)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(header)
+        f.write(body)
+    os.replace(tmp_path, path)
+
+
+class PolicyTable:
+    """Policy-tabell åpnet med mmap"""
+
+    __slots__ = ("path", "file", "data", "phases", "places", "masks", "levels", "hands", "fingerprint")
+
+    def __init__(self, path):
+        self.path = path
+        self.file = open(path, "rb")
+        try:
+            self.data = mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ)
+            magic, version, self.phases, self.places, self.masks, self.levels, num_cards, max_hand, \
+                self.fingerprint = HEADER.unpack_from(self.data)
+        except (ValueError, struct.error):
+            self.file.close()
+            raise ValueError(f"{path} er ikke en policy-tabell")
+        self.hands = HandIndex(num_cards, max_hand)
+        size = HEADER.size + self.phases * self.places * self.masks * self.levels * self.hands.count * ENTRY_SIZE
+        if magic != MAGIC or version != TABLE_VERSION or len(self.data) != size:
+            self.close()
+            raise ValueError(f"{path} er ikke en policy-tabell (versjon {TABLE_VERSION})")
+
+    def check(self, rulebook):
+        """Feil hvis tabellen er løst for et annet regelsett"""
+        if self.fingerprint != rules_fingerprint(rulebook):
+            raise ValueError(f"{self.path} er løst for et annet regelsett; kjør 'python main.py solve' på nytt")
+
+    def lookup(self, phase, place, mask, tenths, card_ids):
+        """(kort-id å spille, kort-id å kaste, Bong-valg) for tilstanden; card_ids må være sortert"""
+        level = min(promille_level(tenths), self.levels - 1)
+        index = (((phase * self.places + place) * self.masks + mask % self.masks) * self.levels + level)
+        offset = HEADER.size + ENTRY_SIZE * (index * self.hands.count + self.hands.rank(card_ids))
+        data = self.data
+        return data[offset], data[offset + 1], data[offset + 2]
+
+    def close(self):
+        self.data.close()
+        self.file.close()
+
+
+class PolicyAgent:
+    """Spiller etter policy-tabellen: kort, kast og Bong slås opp, chugging som OddsAgent, resten tilfeldig"""
+
+    def __init__(self, table):
+        self.table = table
+
+    def choose(self, engine, player, kind, num_options):
+        if kind == "chug":
+            standard_bonus, chug_bonus, _ = player.dice_modifiers()[ROLL_CHUG]
+            return 0 if chug_expectation(standard_bonus + chug_bonus) > 0 else 1
+        hand = player.hand
+        if kind in ("card", "discard", "dring_discard", "bong") and len(hand) <= self.table.hands.max_hand:
+            play, discard, bong = self.table.lookup(engine.current_phase_index, engine.current_place.id,
+                                                    player.npc_flags(), player.promille_tenths,
+                                                    sorted(card.id for card in hand))
+            if kind == "bong":
+                if bong < num_options:
+                    return bong
+            else:
+                wanted = play if kind == "card" else discard
+                for index, card in enumerate(hand):
+                    if card.id == wanted:
+                        return index
+        return engine.rng.randrange(num_options)
@@ -0,0 +1,350 @@
+# -*- coding: utf-8 -*-
+# presenter.py
+
+import sys
+from .clock import AnimationClock
+from .lobby import LEADERS_SHOWN, STANDINGS_SHOWN
+
+# Sekunder mellom hver skriving i typewriter-effekten (flere tegn per skriving)
+TYPEWRITER_FRAME = 0.1
+
+
+class Presenter:
+    """Grensesnitt for all utskrift, input og pauser fra spillmotoren.
+
+    Tekst sendes som mal + argumenter (``say("{} får {}", navn, poeng)``), slik at
+    formateringen bare skjer hvis presenteren faktisk viser teksten.
+    """
+
+    verbose = False  # True hvis presenteren viser noe (brukes for å hoppe over tunge paneler)
+
+    def attach(self, engine):
+        """Motoren som bruker presenteren (kalles av GameEngine)"""
+
+    def say(self, text, *args):
+        """Skriv ut en linje"""
+
+    def typewriter(self, text, *args, speed=0.03):
+        """Skriv ut en linje med typewriter-effekt"""
+
+    def loading(self, message, *args, duration=1.5):
+        """Vis en loading-effekt med melding"""
+
+    def quick_delay(self, duration=0.8):
+        """Kort delay for bedre flyt"""
+
+    def long_delay(self, duration=1.2):
+        """Lengre delay for viktige hendelser"""
+
+    def ask(self, prompt):
+        """Les et svar fra en ekte spiller"""
+        raise RuntimeError(f"{type(self).__name__} kan ikke lese input fra ekte spillere")
+
+    # ---- Paneler ----
+
+    def show_phase_header(self, engine):
+        """Vis fase, sted og sted-effekter ved starten av en fase"""
+
+    def show_npcs_in_town(self, engine, numbered=False):
+        """Vis NPC-ene som er ute på byen"""
+
+    def show_turn_overview(self, engine, player):
+        """Vis sted, NPC-er, spillerstatus og hånd før spilleren velger kort"""
+
+    def show_hand(self, player, title="📋 Hånden din:", skip=None):
+        """Vis kortene på hånden (skip er et 1-basert kortnummer som utelates)"""
+
+    def show_standings(self, engine, title, show_cards=False):
+        """Vis statustabell for alle spillere"""
+
+    def show_final_result(self, engine, winner):
+        """Vis sluttresultatet"""
+
+
+class NullPresenter(Presenter):
+    """Presenter uten utskrift, pauser eller formatering (AI-spill, bots og batch-jobber)"""
+
+
+class TerminalPresenter(Presenter):
+    """Standard terminal-presenter med input, pauser og typewriter-effekter.
+
+    Alle pauser går gjennom en AnimationClock (game/clock.py) med felles tidsskala,
+    automatisk spoling når ingen ekte spillere følger med og hopp over ved tastetrykk.
+
+    Utskriften bygges opp i en ramme (buffer) og skrives med én write() og én flush()
+    før hver pause, input eller animasjon, så en tur blir noen få skrivinger i stedet for
+    flere titalls print-kall. Sted-effektene formateres én gang per sted og fase, og
+    panelene i turoversikten tegnes bare på nytt når innholdet deres har endret seg.
+    """
+
+    verbose = True
+
+    def __init__(self, stream=None, buffered=True, clock=None):
+        self.stream = stream  # None = sys.stdout slik den er når det skrives
+        self.buffered = buffered
+        self.clock = clock or AnimationClock()
+        self.frame = []  # Linjer som ikke er skrevet ennå
+        self.effect_cache = {}  # (sted, fase) -> lesbare sted-effekter
+        self.panels = {}  # Panel -> nøkkel for innholdet som sist ble vist
+
+    def attach(self, engine):
+        self.clock.watch(engine)
+
+    def flush(self):
+        """Skriv rammen som er bygget opp så langt"""
+        stream = self.stream or sys.stdout
+        if self.frame:
+            self.frame.append("")
+            stream.write("\n".join(self.frame))
+            self.frame.clear()
+        stream.flush()
+
+    def _line(self, text):
+        self.frame.append(text)
+        if not self.buffered:
+            self.flush()
+
+    def say(self, text, *args):
+        self._line(text.format(*args) if args else text)
+
+    def typewriter(self, text, *args, speed=0.03):
+        if args:
+            text = text.format(*args)
+        clock = self.clock
+        if speed <= 0 or clock.factor() == 0:
+            self._line(text)  # Ingen animasjon: bare en vanlig linje i rammen
+            return
+        self.flush()
+        stream = self.stream or sys.stdout
+        # Skriv noen tegn per bilde i stedet for å flushe hvert tegn
+        chunk = max(1, round(TYPEWRITER_FRAME / (speed * clock.factor())))
+        for start in range(0, len(text), chunk):
+            if clock.skipping:
+                stream.write(text[start:])  # Tastetrykk: resten av teksten med en gang
+                break
+            stream.write(text[start:start + chunk])
+            stream.flush()
+            clock.sleep(speed * len(text[start:start + chunk]))
+        stream.write("\n")
+
+    def loading(self, message, *args, duration=1.5):
+        if args:
+            message = message.format(*args)
+        if self.clock.factor() == 0:
+            self._line(f"⏳ {message} ✅")
+            return
+        self.frame.append(f"⏳ {message}")
+        stream = self.stream or sys.stdout
+        stream.write("\n".join(self.frame))
+        self.frame.clear()
+        stream.flush()
+        self.clock.sleep(duration)
+        self._line(" ✅")
+
+    def quick_delay(self, duration=0.8):
+        self._pause(duration)
+
+    def long_delay(self, duration=1.2):
+        self._pause(duration)
+
+    def _pause(self, duration):
+        if self.clock.factor() == 0:
+            return  # Ingen pause, så rammen kan bygges videre
+        self.flush()
+        self.clock.sleep(duration)
+
+    def ask(self, prompt):
+        self.flush()
+        self.clock.reset()
+        typed, complete = self.clock.typed_answer()
+        if not typed and not complete:
+            return input(prompt)
+        # Svaret ble (delvis) skrevet under animasjonen: vis det og les resten av linjen
+        stream = self.stream or sys.stdout
+        stream.write(prompt + typed + ("\n" if complete else ""))
+        stream.flush()
+        return typed if complete else typed + input()
+
+    # ---- Paneler ----
+
+    def _place_effect_descriptions(self, place, phase=None):
+        """Lesbare sted-effekter fra JSON-beskrivelsene (filtrert på fase hvis oppgitt), mellomlagret"""
+        key = (place, phase)
+        effects_text = self.effect_cache.get(key)
+        if effects_text is None:
+            effects_text = self.effect_cache[key] = _describe_place_effects(place, phase)
+        return effects_text
+
+    def _changed(self, panel, key):
+        """True hvis panelet skal tegnes (innholdet er nytt siden sist det ble vist)"""
+        if self.panels.get(panel) == key:
+            return False
+        self.panels[panel] = key
+        return True
+
+    def show_phase_header(self, engine):
+        place = engine.current_place
+        effects_text = self._place_effect_descriptions(place, engine.current_phase)
+        self.say(f"\n{'='*50}")
+        self.typewriter(f"🎯 FASE: {engine.current_phase}")
+        self.typewriter(f"📍 Sted: {place.name}")
+
+        # Vis sted-beskrivelse
+        if place.display_text:
+            self.typewriter(f"📖 {place.display_text}")
+
+        # Vis sted-effekter
+        if effects_text:
+            self.typewriter(f"⚡ Sted-effekter: {', '.join(effects_text)}")
+        else:
+            self.typewriter("⚡ Ingen spesielle sted-effekter")
+
+    def show_npcs_in_town(self, engine, numbered=False):
+        for idx, npc in enumerate(engine.npcs_in_town, 1):
+            prefix = f"{idx}." if numbered else "•"
+            if npc.display_text:
+                self.frame.append(f"  {prefix} {npc.name} - {npc.display_text}")
+            else:
+                self.frame.append(f"  {prefix} {npc.name}")
+
+    def show_turn_overview(self, engine, player):
+        place = engine.current_place
+        frame = self.frame
+
+        # Sted og fase vises alltid; effektene bare når sted eller fase er nytt
+        frame.append(f"📍 Sted: {place.name}")
+        frame.append(f"🎯 Fase: {engine.current_phase}")
+        if place.effects and self._changed("place", (place, engine.current_phase)):
+            frame.append("\n⚡ Stedseffekter:")
+            for description in self._place_effect_descriptions(place):
+                frame.append(f"  • {description}")
+
+        # NPC-er på byen
+        if self._changed("town", tuple(npc.id for npc in engine.npcs_in_town)):
+            frame.append("\n👥 NPC-er ute på byen:")
+            self.show_npcs_in_town(engine)
+
+        # Spilleren sin status
+        frame.append(f"\n👤 {player.name} sin status:")
+        frame.append(f"  🍺 Promille: {player.promille}")
+        frame.append(f"  🧠 Minner: {player.memory}")
+        frame.append(f"  🃏 Kort på hånden: {len(player.hand)}")
+        if player.npcs:
+            frame.append("  👥 NPC-er:")
+            for npc in player.npcs:
+                frame.append(f"    • {npc.name} - {npc.display_text}")
+        else:
+            frame.append("  👥 NPC-er: Ingen")
+
+        # Oversikt over alle spillere (bare når noen har endret seg eller turen har gått videre,
+        # så ⭐ alltid står ved spilleren som har turen)
+        leaderboard = engine.leaderboard
+        if leaderboard is not None:
+            # Stor lobby: toppliste og plassering, tegnet på nytt når minnene eller spilleren har endret seg
+            if self._changed("players", (player, leaderboard.version)):
+                frame.append("\n🏆 Toppliste:")
+                for rank, p in enumerate(leaderboard.leaders(LEADERS_SHOWN), 1):
+                    marker = " ⭐" if p == player else ""
+                    frame.append(f"  {rank}. {p.name}: {p.memory} minner{marker}")
+            frame.append(f"  {player.name} er nr. {leaderboard.rank(player)} av {len(engine.players)}")
+        elif self._changed("players", (player, tuple((p.promille_tenths, p.memory, len(p.hand), len(p.npcs))
+                                                     for p in engine.players))):
+            frame.append("\n📊 Alle spillere:")
+            for p in engine.players:
+                marker = " ⭐" if p == player else ""
+                frame.append(f"  👤 {p.name}: {p.promille} promille, {p.memory} minner, {len(p.hand)} kort, "
+                             f"{len(p.npcs)} NPC-er{marker}")
+
+        # Kort på hånden
+        self.show_hand(player)
+        self._line(f"{'='*60}")
+
+    def show_hand(self, player, title="📋 Hånden din:", skip=None):
+        frame = self.frame
+        frame.append(f"\n{title}")
+        for idx, card in enumerate(player.hand, 1):
+            if idx == skip:
+                continue
+            if card.display_text:
+                frame.append(f"  {idx}. {card.name} - {card.display_text}")
+            else:
+                frame.append(f"  {idx}. {card.name}")
+        if not self.buffered:
+            self.flush()
+
+    def show_standings(self, engine, title, show_cards=False):
+        frame = self.frame
+        frame.append(f"\n📊 {title}:")
+        if show_cards:
+            frame.append(f"{'Spiller':<12} {'Promille':<8} {'Minner':<7} {'Kort':<5} {'NPC-er'}")
+            frame.append("-" * 45)
+        else:
+            frame.append(f"{'Spiller':<12} {'Promille':<8} {'Minner':<7} {'NPC-er'}")
+            frame.append("-" * 40)
+        players = engine.players
+        if engine.leaderboard is not None:
+            players = engine.leaderboard.leaders(STANDINGS_SHOWN)
+        for player in players:
+            npc_names = ", ".join([npc.name for npc in player.npcs]) if player.npcs else "Ingen"
+            if show_cards:
+                frame.append(f"{player.name:<12} {player.promille:<8.1f} {player.memory:<7} {len(player.hand):<5} {npc_names}")
+            else:
+                frame.append(f"{player.name:<12} {player.promille:<8.1f} {player.memory:<7} {npc_names}")
+        if len(players) < len(engine.players):
+            self._summary_line(engine, len(engine.players) - len(players))
+        self._line("")
+
+    def _summary_line(self, engine, others):
+        count = len(engine.players)
+        self.frame.append(f"... og {others} andre (snitt {sum(p.promille for p in engine.players) / count:.1f} "
+                          f"promille, {sum(p.memory for p in engine.players) / count:.1f} minner)")
+
+    def show_final_result(self, engine, winner):
+        self.say(f"\n{'='*50}")
+        self.typewriter(f"🏁 SPILLET ER SLUTT!")
+        self.say(f"{'='*50}")
+        self.long_delay()
+
+        self.typewriter(f"\n📊 ENDELIG RESULTAT:")
+        self.say(f"{'Spiller':<12} {'Minner':<7} {'Promille':<8} {'Status'}")
+        self.say("-" * 40)
+
+        players = engine.players
+        if engine.leaderboard is not None:
+            players = engine.leaderboard.leaders(STANDINGS_SHOWN)
+        for player in players:
+            status = "🏆 VINNER!" if player.memory == winner.memory else "💀 Taper"
+            self.typewriter(f"{player.name:<12} {player.memory:<7} {player.promille:<8.1f} {status}")
+            self.quick_delay()
+        if len(players) < len(engine.players):
+            self._summary_line(engine, len(engine.players) - len(players))
+
+        self.long_delay()
+        self.typewriter(f"\n🎉 GRATULERER {winner.name.upper()}! 🎉")
+        self.typewriter(f"🏆 Du vant med {winner.memory} minnepoeng! 🏆")
+        self.say(f"{'='*50}")
+        self.flush()
+
+
+def _describe_place_effects(place, phase=None):
+    """Lesbare sted-effekter fra JSON-beskrivelsene (filtrert på fase hvis oppgitt)"""
+    effects_text = []
+    for effect_key, effect_value in place.effects.items():
+        if effect_key not in place.effect_descriptions:
+            continue
+        # Herslebs Vors-/Nach-effekter vises kun i sin egen fase
+        if phase is not None:
+            if effect_key == "vors_promille_bonus" and phase != "Vors":
+                continue
+            if effect_key == "nach_rescue_threshold" and phase != "Nach":
+                continue
+        description = place.effect_descriptions[effect_key]
+        # Erstatt eventuelle placeholders med faktiske verdier
+        if isinstance(effect_value, (int, float)) and effect_value != 0:
+            description = description.replace("1", str(effect_value))
+        effects_text.append(description)
+    return effects_text
+
+
+# Brukes av kort/NPC/sted når de kalles uten presenter (bakoverkompatibel utskrift)
+DEFAULT_PRESENTER = TerminalPresenter(buffered=False, clock=AnimationClock(skip_on_key=False))
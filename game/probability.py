@@ -0,0 +1,108 @@
+# -*- coding: utf-8 -*-
+# probability.py
+"""Eksakte sannsynligheter for terningkastene i spillet (d6 + bonuser mot et mål).
+
+Alle funksjoner er memoisert på argumentene (heltall og tupler), så gjentatte
+oppslag fra AI, hint og simulering koster bare et dict-oppslag. Sannsynligheter
+returneres som Fraction; bruk float() ved behov.
+"""
+
+from fractions import Fraction
+from functools import lru_cache
+from itertools import product
+from math import comb
+
+SIDES = range(1, 7)
+SIXTH = Fraction(1, 6)
+
+# Grense for auction_odds: antall par (auksjon, omkast blant en del av deltakerne) som må regnes ut
+MAX_AUCTION_WORK = 10000
+
+
+@lru_cache(maxsize=None)
+def roll_success(target, modifier=0):
+    """P(d6 + modifier >= target): roll_dice, redningskast, dørvakt og chugging"""
+    return Fraction(sum(1 for roll in SIDES if roll + modifier >= target), 6)
+
+
+@lru_cache(maxsize=None)
+def chug_expectation(modifier=0):
+    """Forventede minnepoeng ved å chugge (+2 ved 6+, ellers -1) med samlet bonus"""
+    success = roll_success(6, modifier)
+    return 2 * success - (1 - success)
+
+
+@lru_cache(maxsize=None)
+def icing_match(player_bonus, other_bonus):
+    """P(en annen spillers ice'ing-kast er innen 1 fra spillerens)"""
+    return sum((SIXTH * SIXTH for a in SIDES for b in SIDES
+                if abs((a + player_bonus) - (b + other_bonus)) <= 1), Fraction(0))
+
+
+@lru_cache(maxsize=None)
+def icing_matches(player_bonus, other_bonuses):
+    """Fordeling av antall som matcher spilleren: liste der [k] = P(k matcher).
+
+    Kastene til de andre er uavhengige gitt spillerens kast, så vi summerer over det.
+    """
+    distribution = [Fraction(0)] * (len(other_bonuses) + 1)
+    for roll in SIDES:
+        total = roll + player_bonus
+        counts = [Fraction(1)]  # Fordeling over antall matcher så langt
+        for bonus in other_bonuses:
+            p = Fraction(sum(1 for other in SIDES if abs(other + bonus - total) <= 1), 6)
+            counts = [(counts[k] if k < len(counts) else 0) * (1 - p) + (counts[k - 1] * p if k else 0)
+                      for k in range(len(counts) + 1)]
+        for k, share in enumerate(counts):
+            distribution[k] += SIXTH * share
+    return distribution
+
+
+@lru_cache(maxsize=None)
+def auction_odds(modifiers):
+    """P(hver spiller får NPC-en) i auksjonen: lavest kast vinner, de som deler laveste kaster på nytt.
+
+    modifiers er en tuppel med samlet bonus per deltaker; svaret har samme rekkefølge.
+    Deltakere med samme bonus er like, så det regnes på antall per bonus, ikke på hvert kast.
+    """
+    bonuses = tuple(sorted(set(modifiers)))
+    counts = tuple(modifiers.count(bonus) for bonus in bonuses)
+    work = 1
+    for count in counts:
+        work *= comb(count + 2, 2)
+    if work > MAX_AUCTION_WORK:
+        raise ValueError(f"For mange ulike deltakere i auksjonen ({len(modifiers)} med {len(bonuses)} bonuser)")
+    wins = _auction_groups(bonuses, counts)
+    return tuple(wins[bonuses.index(bonus)] / counts[bonuses.index(bonus)] for bonus in modifiers)
+
+
+@lru_cache(maxsize=None)
+def _auction_groups(bonuses, counts):
+    """P(noen med hver bonus vinner) når counts[g] deltakere har bonuses[g]"""
+    if sum(counts) == 1:
+        return tuple(Fraction(count) for count in counts)
+    wins = [Fraction(0)] * len(bonuses)
+    all_tie = Fraction(0)  # Alle deler laveste kast: samme auksjon på nytt
+    outcomes = 6 ** sum(counts)
+    for lowest in range(bonuses[0] + 1, bonuses[-1] + 7):
+        # Antall terningsider (av 6) som gir akkurat lowest og som gir mer, per bonus
+        equal = [1 if 1 <= lowest - bonus <= 6 else 0 for bonus in bonuses]
+        above = [min(max(6 + bonus - lowest, 0), 6) for bonus in bonuses]
+        for tied in product(*(range(count + 1) if equal[g] else (0,) for g, count in enumerate(counts))):
+            if not any(tied):
+                continue
+            ways = 1
+            for count, k, a in zip(counts, tied, above):
+                ways *= comb(count, k) * a ** (count - k)
+            if not ways:
+                continue
+            share = Fraction(ways, outcomes)
+            if sum(tied) == 1:
+                wins[tied.index(1)] += share
+            elif tied == counts:
+                all_tie += share
+            else:
+                for g, p in enumerate(_auction_groups(bonuses, tied)):
+                    wins[g] += share * p
+    # P = a + all_tie * P  =>  P = a / (1 - all_tie)
+    return tuple(p / (1 - all_tie) for p in wins)
@@ -0,0 +1,234 @@
+# -*- coding: utf-8 -*-
+# profiler.py
+"""Valgfri måling av hvor motoren bruker tiden (GameEngine(..., profiler=Profiler())).
+
+Uten profiler er motoren urørt. Med profiler byttes metodene i SECTIONS ut med
+tidtakende innpakninger på akkurat den motor-instansen, så kostnaden betales bare av
+spill som måles. Tidene er inklusive: player_turn inneholder også kortets handlere.
+
+I tillegg telles hvert terningkast per kast-type og hver runde i NPC-auksjonen, og med
+trace_memory tas et tracemalloc-snapshot ved start og slutt av hver fase.
+"""
+
+import json
+import time
+import tracemalloc
+from collections import Counter
+
+# Metoder som måles: navn i motoren -> seksjon i rapporten
+SECTIONS = {
+    "run": "run",
+    "player_turn": "player_turn",
+    "roll_dice": "roll_dice",
+    "draw_cards": "draw_cards",
+    "check_rescue_roll": "check_rescue_roll",
+    "check_npc_turn_effects": "check_npc_turn_effects",
+    "offer_npc_interaction": "offer_npc_interaction",
+    "give_random_npc_on_failure": "give_random_npc_on_failure",
+    "handle_bouncer": "handle_bouncer",
+    "handle_special_options": "handle_special_options",
+    "handle_card_trade": "handle_card_trade",
+    "handle_send_away_venn": "handle_send_away_venn",
+    "handle_npc_auction": "handle_npc_auction",
+    "handle_vomiting": "handle_vomiting",
+    "handle_beer_chug": "handle_beer_chug",
+    "handle_bong_choice": "handle_bong_choice",
+    "handle_round_drinks": "handle_round_drinks",
+    "handle_icing": "handle_icing",
+    "handle_know_beer_effect": "handle_know_beer_effect",
+    "handle_eddie_brings_npc": "handle_eddie_brings_npc",
+    "handle_dring_effect": "handle_dring_effect",
+}
+
+# Fasens arbeid måles per fase-navn, med fasen som etikett
+PHASE_METHODS = ("begin_phase", "play_turns")
+
+# Antall allokeringssteder som tas med per fase i minnerapporten
+MEMORY_TOP = 10
+
+
+class Profiler:
+    """Tellere og tider for motorens metoder, samlet over alle spill den er koblet til.
+
+    sections: (seksjon, etikett) -> [kall, sekunder, lengste kall]
+    counts: (teller, etikett) -> antall (terningkast per type, auksjonsrunder)
+    memory: fase -> {"current", "peak", "sites": Counter(fil:linje -> bytes)}
+    """
+
+    def __init__(self, trace_memory=False):
+        self.trace_memory = trace_memory
+        self.sections = {}
+        self.counts = Counter()
+        self.memory = {}
+        self._phase_snapshot = None
+
+    # ---- Kobling til motoren ----
+
+    def attach(self, engine):
+        """Mål denne motoren (kalles av GameEngine når profiler er gitt)"""
+        engine.profiler = self
+        for name, section in SECTIONS.items():
+            setattr(engine, name, self._timed(getattr(engine, name), section))
+        for name in PHASE_METHODS:
+            setattr(engine, name, self._timed_phase(engine, getattr(engine, name)))
+        engine.finish_phase = self._finishing_phase(engine, engine.finish_phase)
+        engine.log_roll = self._counted_roll(engine.log_roll)
+        if self.trace_memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+
+    @staticmethod
+    def detach(engine):
+        """Fjern målingen fra en motor (f.eks. en clone() som deler instans-attributtene)"""
+        for name in (*SECTIONS, *PHASE_METHODS, "finish_phase", "log_roll"):
+            engine.__dict__.pop(name, None)
+        engine.profiler = None
+
+    def _timed(self, method, section, label=""):
+        stats = self.sections.setdefault((section, label), [0, 0.0, 0.0])
+        clock = time.perf_counter
+
+        def timed(*args, **kwargs):
+            start = clock()
+            try:
+                return method(*args, **kwargs)
+            finally:
+                elapsed = clock() - start
+                stats[0] += 1
+                stats[1] += elapsed
+                if elapsed > stats[2]:
+                    stats[2] = elapsed
+        return timed
+
+    def _timed_phase(self, engine, method):
+        wrapped = {}  # fase -> tidtakende innpakning
+
+        def timed(*args, **kwargs):
+            phase = args[0] if method.__name__ == "begin_phase" else engine.current_phase
+            if method.__name__ == "begin_phase" and self.trace_memory:
+                self._phase_snapshot = tracemalloc.take_snapshot()
+            inner = wrapped.get(phase)
+            if inner is None:
+                inner = wrapped[phase] = self._timed(method, method.__name__, phase)
+            return inner(*args, **kwargs)
+        return timed
+
+    def _finishing_phase(self, engine, method):
+        def finish(*args, **kwargs):
+            if self.trace_memory and self._phase_snapshot is not None:
+                self._record_memory(engine.current_phase)
+            return method(*args, **kwargs)
+        return finish
+
+    def _counted_roll(self, method):
+        counts = self.counts
+
+        def log_roll(player, roll_type, *values):
+            counts["roll", roll_type] += 1
+            return method(player, roll_type, *values)
+        return log_roll
+
+    def count(self, name, label=""):
+        """Tell en hendelse uten egen metode (f.eks. en ny runde i NPC-auksjonen)"""
+        self.counts[name, label] += 1
+
+    def _record_memory(self, phase):
+        snapshot = tracemalloc.take_snapshot()
+        current, peak = tracemalloc.get_traced_memory()
+        entry = self.memory.setdefault(phase, {"current": 0, "peak": 0, "sites": Counter()})
+        entry["current"] = max(entry["current"], current)
+        entry["peak"] = max(entry["peak"], peak)
+        for stat in snapshot.compare_to(self._phase_snapshot, "lineno")[:MEMORY_TOP]:
+            if stat.size_diff > 0:
+                frame = stat.traceback[0]
+                entry["sites"][f"{frame.filename}:{frame.lineno}"] += stat.size_diff
+        self._phase_snapshot = None
+
+    # ---- Sammenslåing og eksport ----
+
+    def merge(self, other):
+        """Slå sammen målinger fra en annen prosess"""
+        for key, (calls, seconds, longest) in other.sections.items():
+            stats = self.sections.setdefault(key, [0, 0.0, 0.0])
+            stats[0] += calls
+            stats[1] += seconds
+            stats[2] = max(stats[2], longest)
+        self.counts.update(other.counts)
+        for phase, theirs in other.memory.items():
+            entry = self.memory.setdefault(phase, {"current": 0, "peak": 0, "sites": Counter()})
+            entry["current"] = max(entry["current"], theirs["current"])
+            entry["peak"] = max(entry["peak"], theirs["peak"])
+            entry["sites"].update(theirs["sites"])
+        return self
+
+    def __getstate__(self):
+        state = dict(self.__dict__)
+        state["_phase_snapshot"] = None
+        return state
+
+    def to_dict(self):
+        """Målingene som JSON-vennlig dict, sortert etter total tid"""
+        sections = [{"section": section, "label": label, "calls": calls, "seconds": round(seconds, 6),
+                     "mean_us": round(seconds / calls * 1e6, 3) if calls else 0.0, "max_us": round(longest * 1e6, 3)}
+                    for (section, label), (calls, seconds, longest) in self.sections.items() if calls]
+        sections.sort(key=lambda entry: -entry["seconds"])
+        return {
+            "sections": sections,
+            "counts": [{"name": name, "label": label, "count": count}
+                       for (name, label), count in sorted(self.counts.items())],
+            "memory": {phase: {"current_bytes": entry["current"], "peak_bytes": entry["peak"],
+                               "top_sites": entry["sites"].most_common(MEMORY_TOP)}
+                       for phase, entry in self.memory.items()},
+        }
+
+    def to_json(self):
+        return json.dumps(self.to_dict(), ensure_ascii=False, indent=2)
+
+    def to_prometheus(self, prefix="smor"):
+        """Målingene i Prometheus' tekstformat"""
+        lines = []
+
+        def metric(name, kind, help_text, samples):
+            lines.append(f"# HELP {prefix}_{name} {help_text}")
+            lines.append(f"# TYPE {prefix}_{name} {kind}")
+            for labels, value in samples:
+                text = ",".join(f'{key}="{_escape(value)}"' for key, value in labels if value != "")
+                lines.append(f"{prefix}_{name}{{{text}}} {value}" if text else f"{prefix}_{name} {value}")
+
+        sections = sorted(self.sections.items())
+        metric("section_calls_total", "counter", "Antall kall per seksjon i motoren",
+               [((("section", s), ("phase", l)), stats[0]) for (s, l), stats in sections])
+        metric("section_seconds_total", "counter", "Samlet tid (inklusive) per seksjon",
+               [((("section", s), ("phase", l)), repr(stats[1])) for (s, l), stats in sections])
+        metric("section_max_seconds", "gauge", "Lengste enkeltkall per seksjon",
+               [((("section", s), ("phase", l)), repr(stats[2])) for (s, l), stats in sections])
+        metric("events_total", "counter", "Terningkast per type og runder i NPC-auksjonen",
+               [((("event", name), ("type", label)), count) for (name, label), count in sorted(self.counts.items())])
+        if self.memory:
+            metric("phase_memory_peak_bytes", "gauge", "Høyeste tracemalloc-topp ved slutten av fasen",
+                   [((("phase", phase),), entry["peak"]) for phase, entry in sorted(self.memory.items())])
+        return "\n".join(lines) + "\n"
+
+    def write(self, path):
+        """Skriv målingene til path: JSON hvis filen slutter på .json, ellers Prometheus-tekst"""
+        text = self.to_json() if path.endswith(".json") else self.to_prometheus()
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(text)
+
+    def report(self, limit=15):
+        """Lesbar tabell over de dyreste seksjonene"""
+        lines = [f"  {'seksjon':<28} {'kall':>10} {'sum s':>9} {'snitt µs':>10} {'maks µs':>10}"]
+        for entry in self.to_dict()["sections"][:limit]:
+            name = f"{entry['section']}[{entry['label']}]" if entry["label"] else entry["section"]
+            lines.append(f"  {name:<28} {entry['calls']:>10} {entry['seconds']:>9.3f} {entry['mean_us']:>10.1f} "
+                         f"{entry['max_us']:>10.1f}")
+        rolls = [(label, count) for (name, label), count in sorted(self.counts.items()) if name == "roll"]
+        if rolls:
+            lines.append("  Terningkast: " + ", ".join(f"{label}={count}" for label, count in rolls))
+        rounds = self.counts.get(("auction_round", ""))
+        if rounds:
+            lines.append(f"  Auksjonsrunder: {rounds}")
+        return "\n".join(lines)
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace("\"", "\\\"").replace("\n", "\\n")
@@ -0,0 +1,133 @@
+# -*- coding: utf-8 -*-
+# protocol.py
+"""Maskinprotokoll for eksterne boter: én JSON-melding per linje på stdin/stdout.
+
+    python main.py --protocol jsonl --seats 4 --bots 1 --games 1000 --seed 1
+
+Spillet kjøres med NullPresenter (ingen pauser eller pynt), og botene sitter på de
+første --bots plassene med samme valgmuligheter som ekte spillere. Resten er tilfeldig AI.
+
+Spill -> bot:
+  {"type": "hello", "protocol": 1, "cards": [...], "npcs": [...], "places": [...], "phases": [...]}
+  {"type": "start", "game": 0, "seed": 123, "players": ["BOT_1", "AI_2", ...], "bots": [0]}
+  {"type": "decision", "seat": 0, "kind": "card", "legal": [0, 1, 2, 3, 4, -1], "state": {...}}
+  {"type": "error", "message": "..."}                     Ugyldig svar; send et nytt
+  {"type": "game_over", "game": 0, "winner": 2, "memory": [...], "promille": [...]}
+
+Bot -> spill (én linje per decision):
+  {"choice": 3}     (eller bare 3)
+
+state er kompakt og bruker id-ene fra hello: phase (indeks), place, town (NPC-id-er),
+hand (kort-id-er for plassen som velger), players ([promille, minner, kort, [NPC-id-er]])
+og for "trade_pick" også offers (kort-id-ene som tilbys). Valget er en indeks i listen
+beslutningen gjelder:
+  card, discard, dring_discard, send_away_card, trade_discard -> hand (-1 = spesielle alternativer for card)
+  npc -> town (-1 = ikke nå), send_away_npc -> egne NPC-er, trade_pick -> offers
+  special: 0 tilbake, 1 bytt kort, 2 send vekk venn; chug: 0 chug, 1 feig ut; bong: 0 øl, 1 drink, 2 shot
+Andre trade_discard er en indeks i hånden uten kortet som ble valgt først.
+"""
+
+import json
+import random
+from .player import Player
+from .engine import GameEngine
+from .presenter import NullPresenter
+from .server import EXTRA_CHOICES
+from .lobby import LARGE_LOBBY, MAX_PLAYERS
+
+PROTOCOL_VERSION = 1
+
+
+class ProtocolClosed(Exception):
+    """Boten lukket input-strømmen"""
+
+
+class JsonLinesAgent:
+    """Agent som sender hver beslutning som én JSON-linje og leser valget fra reader"""
+
+    def __init__(self, reader, writer):
+        self.reader = reader
+        self.writer = writer
+        self.encode = json.JSONEncoder(separators=(",", ":")).encode  # Ren ASCII, uansett konsoll
+
+    def send(self, message):
+        self.writer.write(self.encode(message) + "\n")
+        self.writer.flush()
+
+    def choose(self, engine, player, kind, num_options):
+        seat = engine.players.index(player)
+        legal = list(range(num_options))
+        if kind in EXTRA_CHOICES:
+            legal.append(EXTRA_CHOICES[kind][0])
+        self.send({"type": "decision", "seat": seat, "kind": kind, "legal": legal, "state": state(engine, seat, kind)})
+        while True:
+            line = self.reader.readline()
+            if not line:
+                raise ProtocolClosed()
+            try:
+                choice = parse_choice(line)
+            except ValueError as error:
+                self.send({"type": "error", "message": str(error)})
+                continue
+            if choice in legal:
+                return choice
+            self.send({"type": "error", "message": f"Ugyldig valg: {choice!r}"})
+
+
+def parse_choice(line):
+    """Valget i en linje fra boten: {"choice": n} eller bare n"""
+    text = line.strip()
+    if text.lstrip("-").isdigit():
+        return int(text)  # Raskeste vei: bare tallet
+    message = json.loads(text)
+    if isinstance(message, dict):
+        message = message.get("choice")
+    if not isinstance(message, int) or isinstance(message, bool):
+        raise ValueError("Svaret må være et heltall eller {\"choice\": heltall}")
+    return message
+
+
+def state(engine, seat, kind=None):
+    """Kompakt spilltilstand sett fra plassen som skal velge"""
+    result = {
+        "phase": engine.current_phase_index,
+        "place": engine.current_place.id,
+        "town": [npc.id for npc in engine.npcs_in_town],
+        "hand": [card.id for card in engine.players[seat].hand],
+        "players": [[p.promille_tenths / 10, p.memory, len(p.hand), [npc.id for npc in p.npcs]]
+                    for p in engine.players],
+    }
+    if kind == "trade_pick":
+        result["offers"] = [card.id for card in engine.trade_offers]
+    return result
+
+
+def run_protocol(rulebook, reader, writer, num_players=4, bots=1, games=1, seed=None):
+    """Spill games spill (0 = til boten lukker input) med botene på de første plassene"""
+    if not 2 <= num_players <= MAX_PLAYERS:
+        raise ValueError(f"--seats må være mellom 2 og {MAX_PLAYERS}")
+    if not 1 <= bots <= num_players:
+        raise ValueError(f"--bots må være mellom 1 og {num_players}")
+    places, cards, npcs = rulebook.game_data()
+    agent = JsonLinesAgent(reader, writer)
+    agent.send({"type": "hello", "protocol": PROTOCOL_VERSION, "cards": [card.name for card in cards],
+                "npcs": [npc.name for npc in npcs], "places": [place.name for place in places],
+                "phases": list(rulebook.phases)})
+    seeds = random.Random(seed)
+    game = 0
+    try:
+        while not games or game < games:
+            players = [Player(f"BOT_{i+1}", is_human=True, agent=agent) if i < bots else Player(f"AI_{i+1}", is_human=False)
+                       for i in range(num_players)]
+            engine = GameEngine(players, places, cards, npcs, presenter=NullPresenter(), seed=seeds.getrandbits(64),
+                                large_lobby=num_players > LARGE_LOBBY)
+            engine.record_turns = False  # Boten svarer med en gang, så turer spilles aldri på nytt
+            agent.send({"type": "start", "game": game, "seed": engine.seed, "players": [p.name for p in players],
+                        "bots": list(range(bots))})
+            winner = engine.start_game()
+            agent.send({"type": "game_over", "game": game, "winner": players.index(winner),
+                        "memory": [p.memory for p in players], "promille": [p.promille for p in players]})
+            game += 1
+    except ProtocolClosed:
+        pass
+    return game
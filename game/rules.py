@@ -0,0 +1,223 @@
+# -*- coding: utf-8 -*-
+# rules.py
+
+import hashlib
+import json
+import os
+import pickle
+import sys
+from .card import Card
+from .place import Place
+from .npc import NPC
+from .effects import DRINK_KINDS, SPECIAL_HANDLERS, compile_card_effects, register_card_effects
+
+PHASES = ("Vors", "Fest", "Nach")
+DATA_FILES = ("cards.json", "places.json", "npcs.json")
+
+# Øk når formatet på det kompilerte regelsettet endres, så gamle cache-filer forkastes
+RULES_FORMAT = 1
+
+# Lovlige felt og typer i JSON-dataene ("promille" er tall som må gå opp i tideler)
+CARD_FIELDS = {"name": "text", "displayText": "text", "promille_change": "promille",
+               "minne_change": "int", "special_effect": "text", "kind": "text"}
+PLACE_FIELDS = {"name": "text", "displayText": "text", "effects": "dict", "effectDescriptions": "dict",
+                "hasBouncer": "bool"}
+NPC_FIELDS = {"name": "text", "displayText": "text", "effects": "dict"}
+PLACE_EFFECTS = {"beer_double": "bool", "beer_as_drink": "bool", "memory_bonus": "int",
+                 "promille_reduction": "promille", "vors_promille_bonus": "promille",
+                 "nach_rescue_threshold": "promille", "call_friend_target": "int"}
+NPC_EFFECTS = {"double_beer": "bool", "enhance_know_beer": "bool", "dring_effect": "bool",
+               "brings_random_npc": "bool", "promille_bonus": "promille", "promille_penalty": "promille",
+               "turn_start_promille": "promille", "memory_bonus": "int", "turn_start_memory": "int",
+               "rescue_bonus": "int", "bouncer_bonus": "int", "skill_bonus": "int", "chug_bonus": "int"}
+
+
+class RulesError(ValueError):
+    """Ugyldige spilldata (feil felt, type eller verdi) oppdaget ved innlasting"""
+
+
+class Rulebook:
+    """Ferdig validert og kompilert regelsett: kort, steder og NPC-prototyper med id-er.
+
+    Navn er internert og slås opp til id-er via card_ids/place_ids/npc_ids.
+    Regelsettet er skrivebeskyttet og deles av alle spill i prosessen.
+    """
+
+    __slots__ = ("content_hash", "cards", "places", "npcs", "phases", "card_ids", "place_ids", "npc_ids",
+                 "card_effects")
+
+    def __init__(self, content_hash, cards, places, npcs, phases=PHASES):
+        set_attr = object.__setattr__
+        set_attr(self, "content_hash", content_hash)
+        set_attr(self, "cards", tuple(cards))
+        set_attr(self, "places", tuple(places))
+        set_attr(self, "npcs", tuple(npcs))
+        set_attr(self, "phases", tuple(phases))
+        set_attr(self, "card_ids", {card.name: card.id for card in self.cards})
+        set_attr(self, "place_ids", {place.name: place.id for place in self.places})
+        set_attr(self, "npc_ids", {npc.name: npc.id for npc in self.npcs})
+        set_attr(self, "card_effects", compile_card_effects(self.cards, self.places, self.phases))
+
+    def __setattr__(self, name, value):
+        raise AttributeError("Rulebook kan ikke endres")
+
+    def __getstate__(self):
+        return tuple(getattr(self, name) for name in self.__slots__)
+
+    def __setstate__(self, state):
+        for name, value in zip(self.__slots__, state):
+            object.__setattr__(self, name, value)
+        # Tabellen i cachen gjenbrukes av motorer i denne prosessen
+        register_card_effects(self.card_effects, self.cards, self.places, self.phases)
+
+    def game_data(self):
+        """(steder, kort, NPC-er) slik GameEngine tar dem"""
+        return self.places, self.cards, self.npcs
+
+
+def _check_value(kind, value, where):
+    if kind == "text":
+        ok = isinstance(value, str)
+    elif kind == "bool":
+        ok = isinstance(value, bool)
+    elif kind == "dict":
+        ok = isinstance(value, dict)
+    elif kind == "int":
+        ok = isinstance(value, int) and not isinstance(value, bool)
+    else:  # promille
+        ok = (isinstance(value, (int, float)) and not isinstance(value, bool)
+              and abs(value * 10 - round(value * 10)) < 1e-9)
+    if not ok:
+        expected = {"text": "tekst", "bool": "true/false", "dict": "objekt", "int": "heltall",
+                    "promille": "tall i hele tideler"}[kind]
+        raise RulesError(f"{where}: ventet {expected}, fikk {value!r}")
+
+
+def _check_fields(entry, fields, where):
+    if not isinstance(entry, dict):
+        raise RulesError(f"{where}: ventet objekt, fikk {entry!r}")
+    if not isinstance(entry.get("name"), str) or not entry["name"]:
+        raise RulesError(f"{where}: mangler navn")
+    for key, value in entry.items():
+        if key not in fields:
+            raise RulesError(f"{where}: ukjent felt '{key}'")
+        _check_value(fields[key], value, f"{where}.{key}")
+
+
+def _check_effects(effects, allowed, where):
+    for key, value in effects.items():
+        if key not in allowed:
+            raise RulesError(f"{where}: ukjent effekt '{key}'")
+        _check_value(allowed[key], value, f"{where}.{key}")
+
+
+def _check_list(data, filename):
+    if not isinstance(data, list) or not data:
+        raise RulesError(f"{filename}: ventet en ikke-tom liste")
+    names = set()
+    for index, entry in enumerate(data):
+        name = entry.get("name") if isinstance(entry, dict) else None
+        if name in names:
+            raise RulesError(f"{filename}[{index}]: navnet '{name}' finnes fra før")
+        names.add(name)
+    if len(data) > 256:
+        raise RulesError(f"{filename}: maks 256 oppføringer (id-er lagres som bytes)")
+
+
+def compile_rules(cards_data, places_data, npcs_data, content_hash=""):
+    """Valider rå JSON-data og bygg et Rulebook (RulesError ved feil)"""
+    cards = []
+    _check_list(cards_data, "cards.json")
+    for card_id, c in enumerate(cards_data):
+        where = f"cards.json[{card_id}]"
+        _check_fields(c, CARD_FIELDS, where)
+        if c.get("special_effect") is not None and c["special_effect"] not in SPECIAL_HANDLERS:
+            raise RulesError(f"{where}: ukjent special_effect '{c['special_effect']}'")
+        if c.get("kind") is not None and c["kind"] not in DRINK_KINDS:
+            raise RulesError(f"{where}: ukjent kind '{c['kind']}'")
+        cards.append(Card(sys.intern(c["name"]), c.get("promille_change", 0), c.get("minne_change", 0),
+                          c.get("special_effect"), c.get("displayText", ""), card_id, c.get("kind")))
+
+    places = []
+    _check_list(places_data, "places.json")
+    for place_id, p in enumerate(places_data):
+        where = f"places.json[{place_id}]"
+        _check_fields(p, PLACE_FIELDS, where)
+        effects = p.get("effects", {})
+        _check_effects(effects, PLACE_EFFECTS, f"{where}.effects")
+        descriptions = p.get("effectDescriptions", {})
+        for key, text in descriptions.items():
+            _check_value("text", text, f"{where}.effectDescriptions.{key}")
+        places.append(Place(sys.intern(p["name"]), effects, p.get("displayText", ""), descriptions,
+                            p.get("hasBouncer", False), place_id))
+
+    npcs = []
+    _check_list(npcs_data, "npcs.json")
+    for npc_id, n in enumerate(npcs_data):
+        where = f"npcs.json[{npc_id}]"
+        _check_fields(n, NPC_FIELDS, where)
+        effects = n.get("effects", {})
+        _check_effects(effects, NPC_EFFECTS, f"{where}.effects")
+        npcs.append(NPC(sys.intern(n["name"]), effects, n.get("displayText", ""), npc_id))
+
+    return Rulebook(content_hash, cards, places, npcs)
+
+
+# Regelsett som allerede er lastet i denne prosessen: (mappe, innholds-hash) -> Rulebook
+_loaded = {}
+
+
+def clear_loaded():
+    """Glem regelsettene som er lastet i prosessen (neste load_rulebook leser cache-filen)"""
+    _loaded.clear()
+
+
+def _cache_path(data_dir):
+    return os.path.join(data_dir, "__pycache__", "rules.pickle")
+
+
+def load_rulebook(data_dir="data", use_cache=True):
+    """Last regelsettet fra data_dir, via kompilert cache hvis JSON-filene ikke er endret"""
+    raw = []
+    for filename in DATA_FILES:
+        with open(os.path.join(data_dir, filename), "rb") as f:
+            raw.append(f.read())
+    digest = hashlib.sha256()
+    for filename, content in zip(DATA_FILES, raw):
+        digest.update(filename.encode())
+        digest.update(len(content).to_bytes(8, "big"))
+        digest.update(content)
+    content_hash = f"{RULES_FORMAT}:{digest.hexdigest()}"
+
+    loaded = _loaded.get((os.path.abspath(data_dir), content_hash))
+    if loaded is not None:
+        return loaded
+
+    cache_path = _cache_path(data_dir)
+    if use_cache:
+        try:
+            with open(cache_path, "rb") as f:
+                cached_hash, rulebook = pickle.load(f)
+            if cached_hash == content_hash:
+                _loaded[(os.path.abspath(data_dir), content_hash)] = rulebook
+                return rulebook
+        except (OSError, EOFError, pickle.UnpicklingError, AttributeError, ImportError, TypeError, ValueError):
+            pass  # Mangler eller er utdatert: kompiler på nytt
+
+    try:
+        cards_data, places_data, npcs_data = [json.loads(content.decode("utf-8")) for content in raw]
+    except ValueError as error:
+        raise RulesError(f"Ugyldig JSON i {data_dir}: {error}") from error
+    rulebook = compile_rules(cards_data, places_data, npcs_data, content_hash)
+
+    if use_cache:
+        try:
+            os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+            tmp_path = f"{cache_path}.{os.getpid()}.tmp"
+            with open(tmp_path, "wb") as f:
+                pickle.dump((content_hash, rulebook), f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, cache_path)
+        except OSError:
+            pass  # Skrivebeskyttet datamappe: bruk regelsettet uten cache
+    _loaded[(os.path.abspath(data_dir), content_hash)] = rulebook
+    return rulebook
@@ -0,0 +1,402 @@
+# -*- coding: utf-8 -*-
+# server.py
+"""Asyncio-server som kjører mange spill (sesjoner) i én prosess.
+
+Protokoll: TCP med én JSON-melding per linje (UTF-8).
+
+Klient -> server:
+  {"type": "create", "name": "Ola", "players": 4, "seed": 42}   Nytt bord, du får plass 0
+  {"type": "join", "session": 1, "name": "Kari"}                Sett deg på ledig plass
+  {"type": "join", "session": 1, "seat": 2, "token": "..."}     Ta tilbake plassen etter frakobling
+  {"type": "start"}                                             Start (ledige plasser blir AI)
+  {"type": "action", "choice": 0}                               Svar på en prompt
+  {"type": "state"}                                             Be om spilltilstanden
+
+Server -> klient:
+  {"type": "joined", "session": 1, "seat": 0, "token": "...", "players": [...]}
+  {"type": "log", "lines": [...]}                               Tekst fra spillet
+  {"type": "prompt", "kind": "card", "options": [...], "state": {...}}
+  {"type": "waiting", "player": "Kari", "kind": "card"}         Noen andre skal velge
+  {"type": "state", "state": {...}}
+  {"type": "game_over", "winner": "Ola", "standings": [...]}
+  {"type": "error", "message": "..."}
+
+Motoren er synkron, så en sesjon drives av spillerhandlinger: når motoren trenger et
+valg fra en ekte spiller kaster RemoteAgent AwaitingAction og spillet stopper. Når
+svaret kommer gjenopprettes snapshotet fra starten av turen, og turen spilles av på
+nytt med de samme valgene (uten utskrift) pluss det nye valget.
+
+Med en Profiler (game/profiler.py) måles motoren i alle sesjoner, og målingene skrives
+jevnlig til metrics_path (JSON eller Prometheus-tekst).
+
+Sesjonene ligger i en SessionStore (game/store.py): inaktive bord kastes ut av minnet
+til kompakte snapshots (seed + valglogg) og lastes inn igjen når noen kobler seg på.
+"""
+
+import asyncio
+import json
+import os
+import secrets
+from collections import deque
+from .player import Player
+from .engine import GameEngine, SPECIAL_OPTIONS, NO_CHOICE
+from .presenter import Presenter
+
+# Valg utover 0..n-1 som ekte spillere har: kind -> (verdi, tekst)
+EXTRA_CHOICES = {
+    "card": (SPECIAL_OPTIONS, "Spesielle alternativer"),
+    "npc": (NO_CHOICE, "Ikke nå"),
+}
+
+# Faste alternativer for enkelte beslutninger
+FIXED_LABELS = {
+    "special": ["Tilbake", "Bytt 2 kort mot 1 nytt kort", "Send vekk venn"],
+    "chug": ["Chug ølen", "Feig ut"],
+    "bong": ["Øl", "Drink", "Shot"],
+}
+
+# Sekunder mellom hver skriving av målingene til metrics_path
+METRICS_INTERVAL = 10.0
+
+
+class AwaitingAction(Exception):
+    """Motoren venter på et valg fra en ekte spiller"""
+
+    def __init__(self, player, kind, num_options):
+        super().__init__(kind)
+        self.player = player
+        self.kind = kind
+        self.num_options = num_options
+
+
+class RemoteAgent:
+    """Agent for spillere som svarer over nettverket: stopper motoren til svaret kommer"""
+
+    def choose(self, engine, player, kind, num_options):
+        raise AwaitingAction(player, kind, num_options)
+
+
+REMOTE_AGENT = RemoteAgent()
+
+
+class SessionPresenter(Presenter):
+    """Samler tekst fra spillet i en buffer; er stum mens en tur spilles av på nytt"""
+
+    verbose = True
+
+    def __init__(self):
+        self.engine = None
+        self.lines = []
+
+    def say(self, text, *args):
+        if self.engine.replay:
+            return  # Allerede sendt første gang turen ble spilt
+        self.lines.append(text.format(*args) if args else text)
+
+    def typewriter(self, text, *args, speed=0.03):
+        self.say(text, *args)
+
+    def loading(self, message, *args, duration=1.5):
+        self.say("⏳ " + message, *args)
+
+    def take_lines(self):
+        lines = self.lines
+        self.lines = []
+        return lines
+
+
+class GameSession:
+    """Ett bord: plasser, motor og hvilket valg spillet venter på"""
+
+    def __init__(self, session_id, rulebook, num_seats=4, seed=None):
+        self.id = session_id
+        self.rulebook = rulebook
+        self.seats = [None] * num_seats  # Navn på ekte spillere (None = ledig/AI)
+        self.tokens = [None] * num_seats  # Hemmelighet for å ta tilbake en plass
+        self.seed = seed
+        self.engine = None
+        self.pending = None  # AwaitingAction når spillet venter på en spiller
+        self.winner = None
+
+    @property
+    def started(self):
+        return self.engine is not None
+
+    @property
+    def finished(self):
+        return self.winner is not None
+
+    def join(self, name):
+        """Sett en spiller på første ledige plass og returner plassnummeret"""
+        if self.started:
+            raise ValueError("Spillet har allerede startet")
+        for seat, taken in enumerate(self.seats):
+            if taken is None:
+                self.seats[seat] = name
+                self.tokens[seat] = secrets.token_hex(8)
+                return seat
+        raise ValueError("Bordet er fullt")
+
+    def start(self, replay=None, profiler=None):
+        """Start spillet; ledige plasser spilles av AI (replay: valglogg å spille av først)"""
+        if self.started:
+            raise ValueError("Spillet har allerede startet")
+        players = [Player(name, is_human=True, agent=REMOTE_AGENT) if name is not None
+                   else Player(f"AI_{seat+1}", is_human=False)
+                   for seat, name in enumerate(self.seats)]
+        presenter = SessionPresenter()
+        self.engine = GameEngine(players, *self.rulebook.game_data(), presenter=presenter, seed=self.seed,
+                                 replay=replay, profiler=profiler)
+        presenter.engine = self.engine
+        self._advance(self.engine.start_game)
+
+    def act(self, seat, choice):
+        """Bruk et valg fra spilleren på gitt plass og kjør spillet til neste valg"""
+        if self.pending is None:
+            raise ValueError("Spillet venter ikke på noe valg")
+        engine = self.engine
+        if engine.players.index(self.pending.player) != seat:
+            raise ValueError(f"Det er {self.pending.player.name} sitt valg")
+        if not isinstance(choice, int) or isinstance(choice, bool) or choice not in self.legal_choices():
+            raise ValueError(f"Ugyldig valg: {choice!r}")
+
+        # Spill turen på nytt fra starten med samme valg, og så det nye valget
+        snapshot, decisions_before = engine.turn_start
+        replay = engine.decisions[decisions_before:]
+        replay.append(choice)
+        engine.restore(snapshot)
+        del engine.decisions[decisions_before:]
+        engine.replay = deque(replay)
+        self._advance(engine.run)
+
+    def _advance(self, step):
+        try:
+            self.winner = step()
+            self.pending = None
+        except AwaitingAction as waiting:
+            self.pending = waiting
+
+    def legal_choices(self):
+        pending = self.pending
+        choices = list(range(pending.num_options))
+        if pending.kind in EXTRA_CHOICES:
+            choices.append(EXTRA_CHOICES[pending.kind][0])
+        return choices
+
+    def options(self):
+        """Lesbare alternativer for valget spillet venter på"""
+        pending = self.pending
+        player = pending.player
+        kind, num = pending.kind, pending.num_options
+        if kind in FIXED_LABELS and len(FIXED_LABELS[kind]) == num:
+            labels = FIXED_LABELS[kind]
+        elif kind == "npc" and num == len(self.engine.npcs_in_town):
+            labels = [npc.name for npc in self.engine.npcs_in_town]
+        elif kind == "send_away_npc" and num == len(player.npcs):
+            labels = [npc.name for npc in player.npcs]
+        elif num == len(player.hand):
+            labels = [card.name for card in player.hand]
+        else:
+            labels = [str(i + 1) for i in range(num)]
+        options = [{"choice": i, "label": label} for i, label in enumerate(labels)]
+        if kind in EXTRA_CHOICES:
+            value, label = EXTRA_CHOICES[kind]
+            options.append({"choice": value, "label": label})
+        return options
+
+    def state(self, seat=None):
+        """Spilltilstanden som JSON-vennlig dict (hånden vises bare for egen plass)"""
+        if not self.started:
+            return {"session": self.id, "started": False, "seats": self.seats}
+        engine = self.engine
+        state = {
+            "session": self.id,
+            "started": True,
+            "finished": self.finished,
+            "phase": engine.current_phase,
+            "place": engine.current_place.name,
+            "town": [npc.name for npc in engine.npcs_in_town],
+            "players": [{"name": p.name, "promille": p.promille, "memory": p.memory, "cards": len(p.hand),
+                         "npcs": [npc.name for npc in p.npcs]} for p in engine.players],
+        }
+        if seat is not None:
+            state["hand"] = [card.name for card in engine.players[seat].hand]
+        return state
+
+    def standings(self):
+        return [{"name": p.name, "memory": p.memory, "promille": p.promille}
+                for p in sorted(self.engine.players, key=lambda p: -p.memory)]
+
+
+class _Connection:
+    __slots__ = ("writer", "session_id", "seat")
+
+    def __init__(self, writer):
+        self.writer = writer
+        self.session_id = None  # Sesjonen slås opp i storen, som kan ha kastet den ut
+        self.seat = None
+
+    def send(self, message):
+        self.writer.write((json.dumps(message, ensure_ascii=False) + "\n").encode("utf-8"))
+
+
+class GameServer:
+    """Holder alle sesjoner og tilkoblinger i én asyncio-prosess"""
+
+    def __init__(self, rulebook, max_seats=4, store=None, profiler=None, metrics_path=None):
+        from .store import SessionStore
+
+        self.rulebook = rulebook
+        self.max_seats = max_seats
+        self.store = store if store is not None else SessionStore(rulebook)  # id -> GameSession
+        self.connections = {}  # id -> {plass: _Connection}
+        self.profiler = profiler  # Måler motoren i alle sesjoner (None = av)
+        self.metrics_path = metrics_path
+
+    async def serve(self, host="127.0.0.1", port=8765):
+        server = await asyncio.start_server(self.handle_client, host, port)
+        background = [asyncio.ensure_future(self.store.run())]
+        if self.profiler is not None and self.metrics_path:
+            background.append(asyncio.ensure_future(self.write_metrics_forever()))
+        try:
+            async with server:
+                await server.serve_forever()
+        finally:
+            for task in background:
+                task.cancel()
+            await self.store.flush()
+            if self.profiler is not None and self.metrics_path:
+                self.write_metrics()
+
+    async def write_metrics_forever(self):
+        while True:
+            await asyncio.sleep(METRICS_INTERVAL)
+            try:
+                self.write_metrics()
+            except OSError as error:
+                print(f"⚠️  Kunne ikke skrive målinger: {error}")
+
+    def write_metrics(self):
+        """Skriv målingene til metrics_path (via en midlertidig fil, så lesere aldri ser en halv fil)"""
+        tmp = self.metrics_path + ".tmp"
+        self.profiler.write(tmp)
+        os.replace(tmp, self.metrics_path)
+
+    async def handle_client(self, reader, writer):
+        conn = _Connection(writer)
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                try:
+                    message = json.loads(line)
+                    if not isinstance(message, dict):
+                        raise ValueError("Meldingen må være et JSON-objekt")
+                    self.handle_message(conn, message)
+                except ValueError as error:
+                    conn.send({"type": "error", "message": str(error)})
+                await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            self._leave(conn)
+            writer.close()
+
+    def handle_message(self, conn, message):
+        kind = message.get("type")
+        if kind == "create":
+            num_seats = message.get("players", 4)
+            if not isinstance(num_seats, int) or not 2 <= num_seats <= self.max_seats:
+                raise ValueError(f"players må være mellom 2 og {self.max_seats}")
+            seed = message.get("seed")
+            if seed is not None and (not isinstance(seed, int) or isinstance(seed, bool)):
+                raise ValueError("seed må være et heltall")
+            name = self._name(message)
+            session = self.store.create(num_seats, seed)
+            self._sit(conn, session, session.join(name))
+        elif kind == "join":
+            session_id = message.get("session")
+            session = self.store.get(session_id) if isinstance(session_id, int) else None
+            if session is None:
+                raise ValueError("Ukjent sesjon")
+            seat = message.get("seat")
+            if seat is None:
+                seat = session.join(self._name(message))
+            elif (not isinstance(seat, int) or isinstance(seat, bool) or seat not in range(len(session.seats))
+                  or session.seats[seat] is None or message.get("token") != session.tokens[seat]):
+                raise ValueError("Ugyldig plass eller token")
+            elif seat in self.connections.get(session.id, {}):
+                raise ValueError("Plassen er allerede tilkoblet")
+            self._sit(conn, session, seat)
+            self.store.mark_dirty(session)
+            if session.started:
+                conn.send({"type": "state", "state": session.state(seat)})
+                self._announce(session)
+        elif conn.session_id is None:
+            raise ValueError("Opprett eller bli med i et spill først")
+        elif kind not in ("start", "action", "state"):
+            raise ValueError(f"Ukjent meldingstype: {kind!r}")
+        else:
+            session = self.store.get(conn.session_id)
+            if session is None:
+                raise ValueError("Sesjonen finnes ikke lenger")
+            if kind == "state":
+                conn.send({"type": "state", "state": session.state(conn.seat)})
+                return
+            if kind == "start":
+                session.start(profiler=self.profiler)
+            else:
+                if self.profiler is not None and session.started and session.engine.profiler is None:
+                    self.profiler.attach(session.engine)  # Lastet inn igjen fra lageret
+                session.act(conn.seat, message.get("choice"))
+            self.store.mark_dirty(session)
+            self._announce(session)
+
+    def _name(self, message):
+        name = message.get("name")
+        if not isinstance(name, str) or not name.strip():
+            raise ValueError("name mangler")
+        return name.strip()[:20]
+
+    def _sit(self, conn, session, seat):
+        self._leave(conn)
+        conn.session_id = session.id
+        conn.seat = seat
+        self.connections.setdefault(session.id, {})[seat] = conn
+        conn.send({"type": "joined", "session": session.id, "seat": seat, "token": session.tokens[seat],
+                   "players": session.seats})
+
+    def _leave(self, conn):
+        if conn.session_id is None:
+            return
+        seated = self.connections.get(conn.session_id, {})
+        if seated.get(conn.seat) is conn:
+            del seated[conn.seat]
+        if not seated:
+            self.connections.pop(conn.session_id, None)
+            session = self.store.get(conn.session_id)
+            if session is not None and (session.finished or not session.started):
+                self.store.discard(session.id)
+        conn.session_id = None
+
+    def _announce(self, session):
+        """Send ny tekst til alle ved bordet og en prompt til den som skal velge"""
+        seated = self.connections.get(session.id, {})
+        lines = session.engine.presenter.take_lines()
+        if lines:
+            for conn in seated.values():
+                conn.send({"type": "log", "lines": lines})
+        if session.finished:
+            result = {"type": "game_over", "winner": session.winner.name, "standings": session.standings()}
+            for conn in seated.values():
+                conn.send(result)
+            return
+        pending = session.pending
+        seat = session.engine.players.index(pending.player)
+        for other_seat, conn in seated.items():
+            if other_seat == seat:
+                conn.send({"type": "prompt", "kind": pending.kind, "options": session.options(),
+                           "state": session.state(seat)})
+            else:
+                conn.send({"type": "waiting", "player": pending.player.name, "kind": pending.kind})
@@ -0,0 +1,185 @@
+# -*- coding: utf-8 -*-
+# simulate.py
+
+import os
+import random
+import time
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from .player import Player
+from .engine import GameEngine
+from .loader import load_game_data
+from .presenter import NullPresenter
+from .ai import MCTSAgent
+from .policy import PolicyTable, PolicyAgent
+from .analytics import BalanceStats
+from .profiler import Profiler
+
+# Spilldata lastes én gang per arbeiderprosess (settes av _init_worker)
+_worker_data = None
+
+
+class SimulationStats:
+    """Aggregerte resultater fra mange AI-spill (små nok til å sendes mellom prosesser)"""
+
+    def __init__(self, num_players):
+        self.num_players = num_players
+        self.games = 0
+        self.wins = [0] * num_players  # Seire per plass (delt seier teller for alle)
+        self.ties = 0  # Spill med mer enn én vinner
+        self.promille_counts = Counter()  # Sluttpromille (i halve promille-steg) -> antall
+        self.memory_counts = Counter()  # Sluttminner -> antall
+        self.memory_total = 0
+        self.balance = None  # BalanceStats per kort/NPC/sted/fase når analytics er slått på
+        self.profile = None  # Profiler med tider per seksjon i motoren når profilering er slått på
+
+    def record_game(self, players):
+        """Registrer sluttstillingen i ett spill"""
+        self.games += 1
+        best = max(p.memory for p in players)
+        winners = 0
+        for seat, player in enumerate(players):
+            if player.memory == best:
+                self.wins[seat] += 1
+                winners += 1
+            self.promille_counts[round(player.promille * 2)] += 1
+            self.memory_counts[player.memory] += 1
+            self.memory_total += player.memory
+        if winners > 1:
+            self.ties += 1
+
+    def merge(self, other):
+        """Slå sammen resultater fra en annen batch"""
+        self.games += other.games
+        self.wins = [a + b for a, b in zip(self.wins, other.wins)]
+        self.ties += other.ties
+        self.promille_counts.update(other.promille_counts)
+        self.memory_counts.update(other.memory_counts)
+        self.memory_total += other.memory_total
+        if other.balance is not None:
+            self.balance = (self.balance or BalanceStats()).merge(other.balance)
+        if other.profile is not None:
+            self.profile = (self.profile or Profiler()).merge(other.profile)
+        return self
+
+    def memory_percentile(self, fraction):
+        """Finn minne-verdien ved gitt andel (0-1) av fordelingen"""
+        total = sum(self.memory_counts.values())
+        if not total:
+            return 0
+        limit = fraction * total
+        seen = 0
+        for memory in sorted(self.memory_counts):
+            seen += self.memory_counts[memory]
+            if seen >= limit:
+                return memory
+        return max(self.memory_counts)
+
+    def report(self, elapsed):
+        """Lag en lesbar rapport over resultatene"""
+        lines = []
+        rate = self.games / elapsed if elapsed > 0 else float("inf")
+        lines.append(f"🎲 {self.games} spill med {self.num_players} AI-spillere på {elapsed:.2f} s ({rate:.0f} spill/s)")
+
+        lines.append("\n🏆 Vinnerrate per plass:")
+        for seat, wins in enumerate(self.wins):
+            lines.append(f"  AI_{seat+1:<4} {wins / max(self.games, 1):6.1%}")
+        lines.append(f"  Delt seier: {self.ties / max(self.games, 1):.1%}")
+
+        samples = sum(self.promille_counts.values())
+        lines.append("\n🍺 Sluttpromille:")
+        for half_steps in sorted(self.promille_counts):
+            share = self.promille_counts[half_steps] / samples
+            lines.append(f"  {half_steps / 2:>4.1f}  {share:6.1%}  {'█' * round(share * 50)}")
+
+        samples = sum(self.memory_counts.values())
+        if samples:
+            lines.append("\n🧠 Sluttminner:")
+            lines.append(f"  Snitt {self.memory_total / samples:.2f}, min {min(self.memory_counts)}, maks {max(self.memory_counts)}")
+            lines.append("  Persentiler: " + ", ".join(
+                f"p{int(q * 100)}={self.memory_percentile(q)}" for q in (0.1, 0.25, 0.5, 0.75, 0.9)))
+        return "\n".join(lines)
+
+
+def play_ai_game(places, cards, npcs, num_players, seed=None, mcts_seats=0, mcts_budget=0.05, ai_trading=False,
+                 event_log=None, profiler=None, policy_seats=0, policy_table=None):
+    """Spill ett headless AI-spill og returner spillerne i sluttstilling.
+
+    De første mcts_seats plassene spilles av MCTSAgent, de neste policy_seats av
+    PolicyAgent med policy_table (en PolicyTable), resten tilfeldig.
+    Med ai_trading kan AI-ene også bytte kort og sende vekk venner.
+    event_log får hendelsene i spillet (f.eks. en BalanceStats), og profiler måler motoren.
+    """
+    def agent(i):
+        if i < mcts_seats:
+            return MCTSAgent(time_budget=mcts_budget, seed=seed + i if seed is not None else None)
+        if i < mcts_seats + policy_seats:
+            return PolicyAgent(policy_table)
+        return None
+
+    players = [Player(f"AI_{i+1}", is_human=False, agent=agent(i)) for i in range(num_players)]
+    engine = GameEngine(players, places, cards, npcs, presenter=NullPresenter(), seed=seed, ai_trading=ai_trading,
+                        event_log=event_log, profiler=profiler)
+    engine.record_turns = False  # Agentene svarer med en gang (MCTS slår det på selv)
+    engine.start_game()
+    return players
+
+
+def _init_worker(data_dir):
+    """Last spilldata én gang per arbeiderprosess"""
+    global _worker_data
+    _worker_data = load_game_data(data_dir)
+
+
+def _run_batch(task):
+    """Spill en hel batch med spill i arbeiderprosessen og returner aggregerte tall"""
+    num_games, num_players, seed, mcts_seats, mcts_budget, ai_trading, analytics, profile, policy_seats, policy_path = task
+    places, cards, npcs = _worker_data
+    # Tabellen åpnes med mmap per batch; prosessene deler sidene
+    table = PolicyTable(policy_path) if policy_seats else None
+    # Hver batch har sin egen RNG-strøm som gir seed til hvert spill
+    seeds = random.Random(seed)
+    stats = SimulationStats(num_players)
+    if analytics:
+        stats.balance = BalanceStats()
+    if profile:
+        stats.profile = Profiler(trace_memory=profile == "memory")
+    for _ in range(num_games):
+        stats.record_game(play_ai_game(places, cards, npcs, num_players, seeds.getrandbits(64),
+                                       mcts_seats, mcts_budget, ai_trading, stats.balance, stats.profile,
+                                       policy_seats, table))
+    if table is not None:
+        table.close()
+    return stats
+
+
+def run_simulation(num_games, num_players=4, workers=None, batch_size=500, seed=None, data_dir="data",
+                   mcts_seats=0, mcts_budget=0.05, ai_trading=False, analytics=False, profile=None,
+                   policy_seats=0, policy_path=None):
+    """Spill num_games AI-spill fordelt på alle kjerner. Returnerer (stats, sekunder).
+
+    Med analytics samles også BalanceStats (stats.balance) i hver batch og slås sammen.
+    Med profile ("time" eller "memory") måles motoren med en Profiler (stats.profile).
+    policy_seats plasser etter MCTS-plassene spilles av PolicyAgent med tabellen i policy_path.
+    """
+    workers = workers or os.cpu_count() or 1
+    seed_source = random.Random(seed)
+    tasks = []
+    remaining = num_games
+    while remaining > 0:
+        size = min(batch_size, remaining)
+        tasks.append((size, num_players, seed_source.getrandbits(64), mcts_seats, mcts_budget, ai_trading,
+                      analytics, profile, policy_seats, policy_path))
+        remaining -= size
+
+    stats = SimulationStats(num_players)
+    start = time.perf_counter()
+    if workers == 1:
+        _init_worker(data_dir)
+        for task in tasks:
+            stats.merge(_run_batch(task))
+    else:
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(data_dir,)) as pool:
+            for partial in pool.map(_run_batch, tasks):
+                stats.merge(partial)
+    return stats, time.perf_counter() - start
@@ -0,0 +1,293 @@
+# -*- coding: utf-8 -*-
+# solver.py
+"""Eksakt DP-løser for spillet sett fra én spiller, som skriver en policy-tabell (krever numpy).
+
+    python main.py solve --out policy.smr
+    python main.py --ai policy --policy-table policy.smr
+
+Løseren finner valgene som gir flest forventede minner, eksakt innenfor en forenklet
+modell. Tilstanden er (fase, sted, NPC-maske, promillenivå, hånd): promille i steg på
+0.5, hånden som multimengde av kort-id-er og NPC-ene som kort-masken (Tutti/Sjefen).
+Verdiene regnes baklengs, fase for fase og hånd for hånd: hver hånd bygger på de
+lagrede verdiene for hendene med ett kort mindre, og alle hender med samme størrelse
+regnes samtidig med NumPy.
+
+Minner er ikke en del av tilstanden. Oppkast halverer minnene og alt annet legger til,
+så verdien er affin i minnene (A * minner + B) og føres eksakt baklengs. Bare valgene
+avhenger av minnene; de tas ved TYPICAL_MEMORY for fasen.
+
+Forenklinger i modellen:
+  - Motspillerne er ikke med: deres oppkast, runder og "Kjenner dere ølet" endrer ikke
+    egne valg. Ice'ing regnes mot num_players - 1 motspillere uten promille-bonus
+  - "Ring en venn" gir forventet effekt av en tilfeldig NPC, men masken endres ikke.
+    Dring, Eddie og NPC-bonuser på kast og ved turstart er ikke med
+  - Dørvakt kastes ved hvert besøk på steder med dørvakt
+  - Chugging er ikke i tabellen: det endrer bare minner, så det lønner seg nøyaktig
+    når chug_expectation > 0, som i OddsAgent
+
+Filformatet og agenten som spiller etter tabellen er i game/policy.py.
+"""
+
+import math
+from itertools import combinations_with_replacement
+import numpy as np
+from .effects import NPC_CARD_FLAGS
+from .probability import roll_success, chug_expectation, icing_match
+from .vectorsim import VectorRules, HAND_SIZE, H_CALL_FRIEND, H_KNOW_BEER, H_BONG, H_ROUND, H_ICING
+from .policy import (PROMILLE_STEP, LEVELS, NO_ACTION, HandIndex, promille_level, rules_fingerprint,
+                     write_table)
+
+# Typiske minner ved starten av hver fase (tilfeldig AI, 4 spillere); valgene tas ved disse
+TYPICAL_MEMORY = (0, 5, 11)
+
+# Eksemplarer av hvert kort i kortstokken (som Deck)
+COPIES = 5
+
+
+def _shift(level, tenths):
+    """Promillenivå etter en endring i tideler (begrenset som Player.add_promille)"""
+    return promille_level(level * PROMILLE_STEP + tenths)
+
+
+def _sweetspot(level):
+    """Standard terningbonus på promillenivået (Player.get_dice_bonus)"""
+    return 1 if 10 <= level * PROMILLE_STEP <= 30 else 0
+
+
+def _spread(outcomes, step):
+    """Bruk step(nivå, minner) -> [((nivå, minner), p), ...] på hvert utfall og slå sammen like"""
+    result = {}
+    for (level, memory), p in outcomes.items():
+        for key, q in step(level, memory):
+            result[key] = result.get(key, 0.0) + p * q
+    return result
+
+
+class _Model:
+    """Utfall av ett kortspill for én spiller: {(promillenivå, minner lagt til): sannsynlighet}"""
+
+    def __init__(self, rules, num_players):
+        self.rules = rules
+        self.opponents = num_players - 1
+        self.npc_outcomes = [(int(rules.npc_promille_bonus[n] + rules.npc_promille_penalty[n]),
+                              int(rules.npc_memory_bonus[n])) for n in range(len(rules.npcs))]
+        self.cache = {}
+
+    def play(self, card, place, phase, mask, level):
+        """Utfallene av kortet; for Bong utfallene før valget (se is_bong)"""
+        key = (card, place, phase, mask, level)
+        outcomes = self.cache.get(key)
+        if outcomes is None:
+            outcomes = self.cache[key] = self._play(*key)
+        return outcomes
+
+    def is_bong(self, card, place, phase, mask):
+        return self.rules.handler[card, place, phase, mask] == H_BONG
+
+    def _play(self, card, place, phase, mask, level):
+        rules = self.rules
+        key = (card, place, phase, mask)
+        outcomes = {(level, 0.0): 1.0}
+        if card < 0:
+            return outcomes  # Kortet finnes ikke i regelsettet; motoren gjør ingenting
+        if rules.chug[key]:
+            bonus = _sweetspot(level)
+            if chug_expectation(bonus) > 0:
+                success = float(roll_success(6, bonus))
+                outcomes = {(level, 2.0): success, (level, -1.0): 1 - success}
+
+        # Kortets effekt og ekstra steg fra sted og NPC-er, i samme rekkefølge som Card.play
+        changes = [(int(rules.promille[key]), int(rules.memory[key]))]
+        changes += zip(rules.step_promille[key].tolist(), rules.step_memory[key].tolist())
+        for tenths, memory in changes:
+            if tenths or memory:
+                outcomes = _spread(outcomes, lambda lv, m: [((_shift(lv, tenths), m + memory), 1.0)])
+
+        handler = rules.handler[key]
+        if handler == H_CALL_FRIEND:
+            outcomes = _spread(outcomes, self._call_friend)
+        elif handler == H_KNOW_BEER:
+            bonus = 4 if rules.enhanced[key] else 2
+            outcomes = _spread(outcomes, lambda lv, m: [((lv, m + (bonus if lv * PROMILLE_STEP >= 20 else -1)), 1.0)])
+        elif handler == H_ROUND:
+            outcomes = _spread(outcomes, lambda lv, m: [
+                ((new_level, m + gained), p)
+                for (new_level, gained), p in self.play(rules.beer_card, place, phase, mask, lv).items()])
+        elif handler == H_ICING:
+            outcomes = _spread(outcomes, lambda lv, m: [
+                ((lv, m + self.opponents * float(icing_match(_sweetspot(lv), 0))), 1.0)])
+        return outcomes
+
+    def _call_friend(self, level, memory):
+        """AI ringer med mål 3: kontakt gir +1 minne, og begge utfall gir en tilfeldig NPC"""
+        success = float(roll_success(3, _sweetspot(level)))
+        share = 1.0 / len(self.npc_outcomes)
+        result = []
+        for tenths, bonus in self.npc_outcomes:
+            new_level = _shift(level, tenths)
+            result.append(((new_level, memory + bonus + 1), success * share))
+            result.append(((new_level, memory + bonus), (1 - success) * share))
+        return result
+
+
+class _Best:
+    """Beste alternativ per rad (høyest A * minner + B) og valget som ga det"""
+
+    def __init__(self, rows, memory):
+        self.memory = memory
+        self.score = np.full(rows, -np.inf)
+        self.a = np.zeros(rows)
+        self.b = np.zeros(rows)
+        self.choice = np.full(rows, NO_ACTION, np.uint8)
+
+    def offer(self, rows, a, b, choice):
+        score = a * self.memory + b
+        better = score > self.score[rows]
+        rows = rows[better]
+        self.score[rows] = score[better]
+        self.a[rows] = a[better]
+        self.b[rows] = b[better]
+        self.choice[rows] = choice
+
+
+def _expect(value, rows, outcomes):
+    """Forventet verdi (A, B) for radene i value etter utfallene"""
+    values_a, values_b = value
+    a = np.zeros(len(rows))
+    b = np.zeros(len(rows))
+    for (level, memory), p in outcomes.items():
+        next_a = values_a[rows, level]
+        a += p * next_a
+        b += p * (values_b[rows, level] + next_a * memory)
+    return a, b
+
+
+class PolicySolver:
+    """Løser modellen og fyller policy-tabellen (fase, sted, maske, nivå, hånd, 3 byte)"""
+
+    def __init__(self, rulebook, num_players=4, copies=COPIES, typical_memory=TYPICAL_MEMORY):
+        self.rulebook = rulebook
+        self.rules = VectorRules.from_rulebook(rulebook)
+        self.model = _Model(self.rules, num_players)
+        self.typical_memory = typical_memory
+        self.num_cards = len(self.rules.cards)
+        self.index = HandIndex(self.num_cards, HAND_SIZE)
+        self.hands = [list(combinations_with_replacement(range(self.num_cards), size))
+                      for size in range(HAND_SIZE + 1)]
+        self.ranks = [np.array([self.index.rank(hand) for hand in hands], np.intp) for hands in self.hands]
+        self.removals = [None] + [self._removals(size) for size in range(1, HAND_SIZE + 1)]
+        # Sannsynligheten for hver hånd fra en full kortstokk
+        total = math.comb(self.num_cards * copies, HAND_SIZE)
+        self.deal = np.array([math.prod(math.comb(copies, hand.count(card)) for card in set(hand)) / total
+                              for hand in self.hands[HAND_SIZE]])
+        self.shape = (len(self.rules.phases), len(self.rules.places), 1 << len(NPC_CARD_FLAGS), LEVELS)
+        self.table = np.full(self.shape + (self.index.count, 3), NO_ACTION, np.uint8)
+        self.start = None
+
+    def _removals(self, size):
+        """[(kort, rader med kortet, raden til hånden uten ett av det)] for hender med size kort"""
+        smaller = {hand: row for row, hand in enumerate(self.hands[size - 1])}
+        result = []
+        for card in range(self.num_cards):
+            rows, rests = [], []
+            for row, hand in enumerate(self.hands[size]):
+                if card in hand:
+                    i = hand.index(card)
+                    rows.append(row)
+                    rests.append(smaller[hand[:i] + hand[i + 1:]])
+            if rows:
+                result.append((card, np.array(rows, np.intp), np.array(rests, np.intp)))
+        return result
+
+    def solve(self):
+        """Løs alle faser baklengs; returnerer tabellen og setter start (A, B) per (maske, nivå)"""
+        rules = self.rules
+        phases, places, masks, _ = self.shape
+        following = (np.ones((masks, LEVELS)), np.zeros((masks, LEVELS)))  # Etter siste fase: bare minnene
+        for phase in reversed(range(phases)):
+            start_a, start_b = np.zeros((masks, LEVELS)), np.zeros((masks, LEVELS))
+            for mask in range(masks):
+                next_a, next_b = following[0][mask], following[1][mask]
+                for place in range(places):
+                    full_a, full_b = self._phase(phase, place, mask, (next_a[None, :], next_b[None, :]))
+                    dealt_a, dealt_b = self.deal @ full_a, self.deal @ full_b
+                    for level in range(LEVELS):
+                        # Rundestart: sted-minner og promille-reduksjon, så fem nye kort
+                        after = _shift(level, -int(rules.place_reduction[place]))
+                        a = dealt_a[after]
+                        b = dealt_b[after] + a * int(rules.place_memory[place])
+                        if rules.has_bouncer[place]:
+                            admitted = float(roll_success(level * PROMILLE_STEP // 10 + 1, _sweetspot(level)))
+                            a = admitted * a + (1 - admitted) * next_a[level]
+                            b = admitted * b + (1 - admitted) * next_b[level]
+                        start_a[mask, level] += a / places
+                        start_b[mask, level] += b / places
+            following = (start_a, start_b)
+        self.start = following
+        return self.table
+
+    def _phase(self, phase, place, mask, end):
+        """Verdiene (A, B) ved turstart for alle fem-korts hender, og tabellen for (fase, sted, maske)"""
+        model = self.model
+        memory = self.typical_memory[min(phase, len(self.typical_memory) - 1)]
+        entries = self.table[phase, place, mask]
+        threshold = int(self.rules.rescue_threshold[place, phase])
+        target = int(self.rules.rescue_target[place, phase])
+        bong = model.is_bong
+        value = end
+        for size in range(1, HAND_SIZE + 1):
+            previous = value
+            rows = len(self.hands[size])
+            rests = len(self.hands[size - 1])
+            everything = np.arange(rests)
+            play_a, play_b = np.zeros((rows, LEVELS)), np.zeros((rows, LEVELS))
+            drop_a, drop_b = np.zeros((rows, LEVELS)), np.zeros((rows, LEVELS))
+            bong_a, bong_b = np.zeros((rests, LEVELS)), np.zeros((rests, LEVELS))
+            for level in range(LEVELS):
+                # Bong-valget for hånden uten Bong-kortet
+                best = _Best(rests, memory)
+                for choice, card in enumerate(self.rules.bong_cards):
+                    best.offer(everything, *_expect(previous, everything, model.play(int(card), place, phase, mask, level)),
+                               choice)
+                bong_a[:, level], bong_b[:, level] = best.a, best.b
+                entries[level, self.ranks[size - 1], 2] = best.choice
+
+            for level in range(LEVELS):
+                play = _Best(rows, memory)
+                drop = _Best(rows, memory)
+                for card, with_card, rest in self.removals[size]:
+                    outcomes = model.play(card, place, phase, mask, level)
+                    after = (bong_a, bong_b) if bong(card, place, phase, mask) else previous
+                    play.offer(with_card, *_expect(after, rest, outcomes), card)
+                    drop.offer(with_card, previous[0][rest, level], previous[1][rest, level], card)
+                play_a[:, level], play_b[:, level] = play.a, play.b
+                drop_a[:, level], drop_b[:, level] = drop.a, drop.b
+                entries[level, self.ranks[size], 0] = play.choice
+                entries[level, self.ranks[size], 1] = drop.choice
+
+            # Redningskast ved turstart: oppkast halverer minnene, gir -1 promille og et kastet kort
+            value_a, value_b = play_a.copy(), play_b.copy()
+            for level in range(LEVELS):
+                if level * PROMILLE_STEP >= threshold:
+                    rescued = float(roll_success(target, _sweetspot(level)))
+                    vomit = _shift(level, -10)
+                    value_a[:, level] = rescued * play_a[:, level] + (1 - rescued) * drop_a[:, vomit] / 2
+                    value_b[:, level] = rescued * play_b[:, level] + (1 - rescued) * drop_b[:, vomit]
+            value = (value_a, value_b)
+        return value
+
+    def expected_memory(self, mask=0):
+        """Forventede minner for én spiller fra spillstart (0 promille, 0 minner) i modellen"""
+        return float(self.start[1][mask, 0])
+
+    def write(self, path):
+        write_table(path, rules_fingerprint(self.rulebook), self.shape, self.num_cards, HAND_SIZE,
+                    self.table.tobytes())
+
+
+def solve_policy(rulebook, path, num_players=4):
+    """Løs modellen for regelsettet og skriv tabellen til path; returnerer løseren"""
+    solver = PolicySolver(rulebook, num_players)
+    solver.solve()
+    solver.write(path)
+    return solver
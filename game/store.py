@@ -0,0 +1,212 @@
+# -*- coding: utf-8 -*-
+# store.py
+
+import asyncio
+import os
+import pickle
+import time
+import zlib
+from array import array
+from collections import OrderedDict
+from .server import GameSession
+
+# Øk når formatet på lagrede sesjoner endres
+SESSION_FORMAT = 1
+
+
+def dump_session(session):
+    """Kompakt bytes-form av en sesjon: plasser, seed og valgloggen.
+
+    Resten av tilstanden følger av (seed, valg), så en sesjon tar bare noen hundre bytes.
+    """
+    engine = session.engine
+    seed = engine.seed if engine is not None else session.seed
+    decisions = array("b", engine.decisions).tobytes() if engine is not None else None
+    state = (SESSION_FORMAT, session.id, session.seats, session.tokens, seed, decisions)
+    return zlib.compress(pickle.dumps(state, protocol=pickle.HIGHEST_PROTOCOL))
+
+
+def load_session(blob, rulebook):
+    """Bygg sesjonen fra dump_session() ved å spille valgloggen av på nytt (uten utskrift)"""
+    version, session_id, seats, tokens, seed, decisions = pickle.loads(zlib.decompress(blob))
+    if version != SESSION_FORMAT:
+        raise ValueError(f"Ukjent sesjonsformat {version}")
+    session = GameSession(session_id, rulebook, len(seats), seed)
+    session.seats = seats
+    session.tokens = tokens
+    if decisions is not None:
+        session.start(replay=array("b", decisions).tolist())
+        session.engine.presenter.take_lines()  # Allerede sendt til spillerne
+    return session
+
+
+class SessionStore:
+    """Sesjoner i minnet med LRU-/TTL-utkastelse til kompakte snapshots.
+
+    Maks max_sessions sesjoner holdes i minnet; den minst nylig brukte kastes ut når
+    grensen nås, og sesjoner som ikke er brukt på ttl sekunder kastes ut av
+    bakgrunnsoppgaven. Utkastede sesjoner lastes inn igjen når noen spør etter dem.
+
+    Endringer skrives ikke med en gang: mark_dirty() merker sesjonen, og flush() (kalt
+    hvert flush_interval sekund fra run()) skriver alle endrede sesjoner samlet i en
+    tråd, én gang per sesjon uansett hvor mange trekk som er gjort. Uten directory
+    holdes snapshotene i minnet.
+    """
+
+    def __init__(self, rulebook, directory=None, max_sessions=10000, ttl=900.0, flush_interval=1.0, durable=False):
+        self.rulebook = rulebook
+        self.directory = directory
+        self.max_sessions = max_sessions
+        self.ttl = ttl
+        self.flush_interval = flush_interval
+        self.durable = durable  # fsync etter hver samlet skriving
+        self.hot = OrderedDict()  # id -> (GameSession, sist brukt), minst nylig brukt først
+        self.dirty = set()  # id-er som er endret siden forrige flush
+        self.pending = {}  # id -> snapshot som venter på å bli skrevet (None = slett)
+        self.writing = {}  # Snapshotene som skrives akkurat nå
+        self.write_future = None
+        self.cold = {}  # id -> snapshot når directory er None
+        self.next_id = 1
+        self.loads = 0
+        self.evictions = 0
+        if directory is not None:
+            os.makedirs(directory, exist_ok=True)
+            ids = [int(name[:-4]) for name in os.listdir(directory) if name.endswith(".bin") and name[:-4].isdigit()]
+            self.next_id = max(ids, default=0) + 1
+
+    def __len__(self):
+        return len(self.hot)
+
+    def create(self, num_seats=4, seed=None):
+        """Nytt bord med ny id"""
+        session = GameSession(self.next_id, self.rulebook, num_seats, seed)
+        self.next_id += 1
+        self._remember(session)
+        self.mark_dirty(session)
+        return session
+
+    def get(self, session_id):
+        """Hent sesjonen (lastes inn igjen hvis den er kastet ut), eller None"""
+        entry = self.hot.get(session_id)
+        if entry is not None:
+            self.hot[session_id] = (entry[0], time.monotonic())
+            self.hot.move_to_end(session_id)
+            return entry[0]
+        blob = self._read(session_id)
+        if blob is None:
+            return None
+        session = load_session(blob, self.rulebook)
+        self.loads += 1
+        self._remember(session)
+        return session
+
+    def mark_dirty(self, session):
+        self.dirty.add(session.id)
+
+    def discard(self, session_id):
+        """Fjern sesjonen helt (f.eks. ferdig spill)"""
+        self.hot.pop(session_id, None)
+        self.dirty.discard(session_id)
+        self.cold.pop(session_id, None)
+        if self.directory is not None:
+            self.pending[session_id] = None
+
+    def evict(self, session_id):
+        """Kast sesjonen ut av minnet (snapshotet skrives ved neste flush)"""
+        session, _ = self.hot.pop(session_id)
+        self.dirty.discard(session_id)
+        self.evictions += 1
+        if session.finished:
+            self.discard(session_id)
+            return
+        blob = dump_session(session)
+        if self.directory is None:
+            self.cold[session_id] = blob
+        else:
+            self.pending[session_id] = blob
+
+    def evict_idle(self, now=None):
+        """Kast ut sesjoner som ikke er brukt på ttl sekunder"""
+        now = time.monotonic() if now is None else now
+        while self.hot:
+            session_id, (_, last_used) = next(iter(self.hot.items()))
+            if now - last_used < self.ttl:
+                break
+            self.evict(session_id)
+
+    async def flush(self):
+        """Skriv alle endrede og utkastede sesjoner (samlet, i en egen tråd)"""
+        for session_id in self.dirty:
+            entry = self.hot.get(session_id)
+            if entry is not None and self.directory is not None:
+                self.pending[session_id] = dump_session(entry[0])
+        self.dirty.clear()
+        while self.write_future is not None:
+            await asyncio.shield(self.write_future)  # Forrige skriving er ikke ferdig
+        if not self.pending:
+            return
+        self.writing, self.pending = self.pending, {}
+        self.write_future = asyncio.get_running_loop().run_in_executor(None, self._write_batch, self.writing)
+        self.write_future.add_done_callback(self._written)
+        # shield: skrivingen fullføres selv om run() avbrytes midt i
+        await asyncio.shield(self.write_future)
+
+    async def run(self):
+        """Bakgrunnsoppgave: skriv endringer og kast ut inaktive sesjoner"""
+        while True:
+            await asyncio.sleep(self.flush_interval)
+            self.evict_idle()
+            try:
+                await self.flush()
+            except OSError as error:
+                print(f"⚠️ Kunne ikke lagre sesjoner: {error}")
+
+    def _remember(self, session):
+        self.hot[session.id] = (session, time.monotonic())
+        while len(self.hot) > self.max_sessions:
+            self.evict(next(iter(self.hot)))
+
+    def _written(self, future):
+        if future.cancelled() or future.exception() is not None:
+            # Skrivingen feilet (f.eks. full disk): prøv igjen ved neste flush
+            self.pending = {**self.writing, **self.pending}
+        self.writing = {}
+        self.write_future = None
+
+    def _path(self, session_id):
+        return os.path.join(self.directory, f"{session_id}.bin")
+
+    def _read(self, session_id):
+        if self.directory is None:
+            return self.cold.pop(session_id, None)
+        for unwritten in (self.pending, self.writing):
+            if session_id in unwritten:
+                return unwritten[session_id]  # Ikke skrevet ennå
+        try:
+            with open(self._path(session_id), "rb") as f:
+                return f.read()
+        except OSError:
+            return None
+
+    def _write_batch(self, batch):
+        for session_id, blob in batch.items():
+            path = self._path(session_id)
+            if blob is None:
+                try:
+                    os.remove(path)
+                except OSError:
+                    pass
+                continue
+            tmp_path = path + ".tmp"
+            with open(tmp_path, "wb") as f:
+                f.write(blob)
+                if self.durable:
+                    f.flush()
+                    os.fsync(f.fileno())
+            os.replace(tmp_path, path)
+        if self.durable:
+            dir_fd = os.open(self.directory, os.O_RDONLY)
+            try:
+                os.fsync(dir_fd)
+            finally:
+                os.close(dir_fd)
@@ -0,0 +1,312 @@
+# -*- coding: utf-8 -*-
+# tuner.py
+
+import copy
+import hashlib
+import json
+import math
+import os
+import random
+from concurrent.futures import ProcessPoolExecutor
+from .rules import DATA_FILES, CARD_FIELDS, PLACE_EFFECTS, NPC_EFFECTS, RulesError, compile_rules
+from .analytics import MEMORY_RANGE, BalanceStats
+from .simulate import play_ai_game
+
+SECTIONS = ("cards", "places", "npcs")
+
+# Z-verdi for 95 % konfidensintervall over batch-snitt
+CONFIDENCE_Z = 1.96
+
+# Minste antall spiller-spill med en NPC før den teller i npc_lift
+MIN_NPC_SAMPLES = 30
+
+# Regelsett kompilert i denne arbeiderprosessen: innholds-hash -> spilldata
+_worker_rules = {}
+
+
+def _npc_lift(stats, num_players):
+    """Største økning i vinnersjanse (mot 1/spillere) for spillere som har hatt en NPC"""
+    baseline = 1 / num_players
+    lift = -baseline
+    for games, wins in zip(stats.npc_player_games, stats.npc_player_wins):
+        if games >= MIN_NPC_SAMPLES:
+            lift = max(lift, wins / games - baseline)
+    return lift
+
+
+def _vomit_rate(stats, num_players):
+    """Gjennomsnittlig antall oppkast per spiller per spill"""
+    return sum(stats.vomits) / (stats.games * num_players)
+
+
+def _memory_mean(stats, num_players):
+    low = MEMORY_RANGE[0]
+    total = sum((low + i) * count for i, count in enumerate(stats.memory_histogram))
+    return total / (stats.games * num_players)
+
+
+def _bouncer_denial(stats, num_players):
+    attempts = sum(stats.bouncer_attempts)
+    return sum(stats.bouncer_denied) / attempts if attempts else 0.0
+
+
+# Mål som kan brukes i targets: navn -> funksjon(BalanceStats, spillere) -> tall
+METRICS = {
+    "npc_lift": _npc_lift,
+    "vomit_rate": _vomit_rate,
+    "memory_mean": _memory_mean,
+    "bouncer_denial": _bouncer_denial,
+}
+
+
+def load_raw_rules(data_dir="data"):
+    """Rå JSON-data (kort, steder, NPC-er) som lister av dicts"""
+    raw = []
+    for filename in DATA_FILES:
+        with open(os.path.join(data_dir, filename), encoding="utf-8") as f:
+            raw.append(json.load(f))
+    return tuple(raw)
+
+
+def _field_kind(section, key):
+    if section == "cards":
+        return CARD_FIELDS.get(key)
+    return (PLACE_EFFECTS if section == "places" else NPC_EFFECTS).get(key)
+
+
+def parse_param(spec):
+    """"npcs.Tord.chug_bonus=1:4" eller "cards.Shot.promille_change=0.5,1" -> (seksjon, navn, felt, verdier)"""
+    try:
+        path, values = spec.split("=", 1)
+        section, rest = path.split(".", 1)
+        name, key = rest.rsplit(".", 1)
+    except ValueError:
+        raise ValueError(f"Ugyldig parameter '{spec}' (ventet seksjon.navn.felt=verdier)") from None
+    if section not in SECTIONS:
+        raise ValueError(f"Ukjent seksjon '{section}' (velg {', '.join(SECTIONS)})")
+    kind = _field_kind(section, key)
+    if kind not in ("int", "promille"):
+        raise ValueError(f"{section}.{key} er ikke et tall-felt")
+    if ":" in values:
+        low, high = (float(value) for value in values.split(":"))
+        step = 1 if kind == "int" else 0.5
+        options = [low + i * step for i in range(int(round((high - low) / step)) + 1)]
+    else:
+        options = [float(value) for value in values.split(",")]
+    if kind == "int" and not all(value.is_integer() for value in options):
+        raise ValueError(f"{section}.{name}.{key} må ha hele tall, fikk {values}")
+    # Hele tall skrives som heltall, så like regelsett også blir like som JSON
+    options = [int(value) if value.is_integer() else value for value in options]
+    return section, name, key, options
+
+
+def default_params(raw):
+    """Alle tall-effekter på NPC-er og steder, med én verdi-steg opp og ned"""
+    params = []
+    for section, entries, allowed in (("places", raw[1], PLACE_EFFECTS), ("npcs", raw[2], NPC_EFFECTS)):
+        for entry in entries:
+            for key, value in entry.get("effects", {}).items():
+                kind = allowed.get(key)
+                if kind == "int":
+                    params.append((section, entry["name"], key, [value - 1, value, value + 1]))
+                elif kind == "promille":
+                    params.append((section, entry["name"], key, [value - 0.5, value, value + 0.5]))
+    return params
+
+
+def parse_target(spec):
+    """"vomit_rate=0.3:0.6", "npc_lift=:0.05" -> (mål, lav, høy) (tom grense = åpen)"""
+    try:
+        metric, bounds = spec.split("=", 1)
+        low, high = bounds.split(":")
+    except ValueError:
+        raise ValueError(f"Ugyldig mål '{spec}' (ventet navn=lav:høy)") from None
+    if metric not in METRICS:
+        raise ValueError(f"Ukjent mål '{metric}' (velg {', '.join(METRICS)})")
+    return metric, float(low) if low else None, float(high) if high else None
+
+
+def apply_params(raw, assignment):
+    """Kopi av rådataene med verdiene i assignment {(seksjon, navn, felt): verdi}"""
+    raw = copy.deepcopy(raw)
+    for (section, name, key), value in assignment.items():
+        entries = raw[SECTIONS.index(section)]
+        entry = next((e for e in entries if e.get("name") == name), None)
+        if entry is None:
+            raise ValueError(f"Fant ikke '{name}' i {section}")
+        if section == "cards":
+            entry[key] = value
+        else:
+            entry.setdefault("effects", {})[key] = value
+    return raw
+
+
+def _run_batch(task):
+    """Spill en batch med et gitt regelsett i arbeiderprosessen og returner BalanceStats"""
+    raw, num_games, num_players, seed = task
+    key = hashlib.sha256(json.dumps(raw, sort_keys=True).encode()).hexdigest()
+    game_data = _worker_rules.get(key)
+    if game_data is None:
+        if len(_worker_rules) > 16:
+            _worker_rules.clear()
+        game_data = _worker_rules[key] = compile_rules(*raw).game_data()
+    places, cards, npcs = game_data
+    seeds = random.Random(seed)
+    stats = BalanceStats()
+    for _ in range(num_games):
+        play_ai_game(places, cards, npcs, num_players, seeds.getrandbits(64), event_log=stats)
+    return stats
+
+
+class CandidateResult:
+    """Resultatet for ett kandidat-regelsett: snitt og konfidensintervall per mål"""
+
+    def __init__(self, assignment, raw):
+        self.assignment = assignment
+        self.raw = raw
+        self.samples = {metric: [] for metric in METRICS}  # Mål per batch
+        self.games = 0
+        self.error = None  # RulesError hvis regelsettet er ugyldig
+
+    def add_batch(self, stats, num_players):
+        self.games += stats.games
+        for metric, function in METRICS.items():
+            self.samples[metric].append(function(stats, num_players))
+
+    def mean(self, metric):
+        values = self.samples[metric]
+        return sum(values) / len(values)
+
+    def half_width(self, metric):
+        """Halv bredde av 95 %-intervallet (batch-snitt-metoden)"""
+        values = self.samples[metric]
+        if len(values) < 2:
+            return math.inf
+        mean = self.mean(metric)
+        variance = sum((value - mean) ** 2 for value in values) / (len(values) - 1)
+        return CONFIDENCE_Z * math.sqrt(variance / len(values))
+
+    def violation(self, targets):
+        """Hvor langt utenfor målene snittene ligger (0 = alle mål nådd)"""
+        if self.error is not None:
+            return math.inf
+        total = 0.0
+        for metric, low, high in targets:
+            mean = self.mean(metric)
+            if low is not None and mean < low:
+                total += low - mean
+            if high is not None and mean > high:
+                total += mean - high
+        return total
+
+    def decided(self, targets, tolerance):
+        """True når hvert mål er avgjort: intervallet er smalt nok eller helt på én side av grensene"""
+        for metric, low, high in targets:
+            mean, half = self.mean(metric), self.half_width(metric)
+            if half <= tolerance:
+                continue
+            lower, upper = mean - half, mean + half
+            inside = (low is None or lower >= low) and (high is None or upper <= high)
+            outside = (low is not None and upper < low) or (high is not None and lower > high)
+            if not (inside or outside):
+                return False
+        return True
+
+    def describe(self):
+        if not self.assignment:
+            return "(utgangspunkt)"
+        return ", ".join(f"{section}.{name}.{key}={value}" for (section, name, key), value in
+                         sorted(self.assignment.items()))
+
+
+def tune(raw, params, targets, num_candidates=20, num_players=4, batch_size=200, min_batches=4,
+         max_games=20000, tolerance=0.01, workers=None, seed=None, progress=None):
+    """Søk etter regelsett som treffer målene. Returnerer kandidatene sortert etter avvik.
+
+    Starter fra dagens regler og muterer én eller to parametre i beste kandidat så langt.
+    Hver kandidat spilles i batcher på alle kjerner til hvert mål er avgjort (eller
+    max_games er nådd). Alle kandidater bruker de samme seedene, så forskjellene mellom
+    dem skyldes reglene og ikke tilfeldighetene.
+    """
+    rng = random.Random(seed)
+    workers = workers or os.cpu_count() or 1
+    batch_seeds = [rng.getrandbits(64) for _ in range(max(1, max_games // batch_size))]
+    results = []
+    seen = set()  # Regelsett (som JSON) som allerede er prøvd
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        assignment = {}
+        attempts = 0
+        while len(results) < num_candidates and attempts < num_candidates * 20:
+            attempts += 1
+            candidate = apply_params(raw, assignment)
+            key = json.dumps(candidate, sort_keys=True)
+            if key in seen:
+                assignment = _mutate(_best(results, targets).assignment, params, rng)
+                continue
+            seen.add(key)
+            result = CandidateResult(assignment, candidate)
+            try:
+                compile_rules(*result.raw)
+            except RulesError as error:
+                result.error = error
+            else:
+                _evaluate(pool, result, num_players, batch_size, min_batches, batch_seeds, workers, targets, tolerance)
+            results.append(result)
+            if progress:
+                progress(result)
+            assignment = _mutate(_best(results, targets).assignment, params, rng)
+
+    return sorted(results, key=lambda result: (result.violation(targets), result.assignment != {}))
+
+
+def _evaluate(pool, result, num_players, batch_size, min_batches, batch_seeds, workers, targets, tolerance):
+    next_batch = 0
+    while next_batch < len(batch_seeds):
+        count = max(workers, min_batches - next_batch)
+        tasks = [(result.raw, batch_size, num_players, batch_seed)
+                 for batch_seed in batch_seeds[next_batch:next_batch + count]]
+        next_batch += len(tasks)
+        for stats in pool.map(_run_batch, tasks):
+            result.add_batch(stats, num_players)
+        if next_batch >= min_batches and result.decided(targets, tolerance):
+            break
+
+
+def _best(results, targets):
+    return min(results, key=lambda result: result.violation(targets))
+
+
+def _mutate(assignment, params, rng):
+    assignment = dict(assignment)
+    for section, name, key, values in rng.sample(params, min(len(params), rng.choice((1, 2)))):
+        assignment[(section, name, key)] = rng.choice(values)
+    return assignment
+
+
+def write_candidates(results, out_dir, keep=5):
+    """Skriv de beste kandidatene som out_dir/01/{cards,places,npcs}.json og returner mappene"""
+    directories = []
+    for rank, result in enumerate([r for r in results if r.error is None][:keep], 1):
+        directory = os.path.join(out_dir, f"{rank:02d}")
+        os.makedirs(directory, exist_ok=True)
+        for filename, data in zip(DATA_FILES, result.raw):
+            with open(os.path.join(directory, filename), "w", encoding="utf-8") as f:
+                json.dump(data, f, ensure_ascii=False, indent=2)
+                f.write("\n")
+        directories.append(directory)
+    return directories
+
+
+def report(results, targets):
+    """Lesbar rangering av kandidatene"""
+    lines = []
+    for rank, result in enumerate(results, 1):
+        if result.error is not None:
+            lines.append(f"{rank:>3}. ❌ {result.describe()}: {result.error}")
+            continue
+        metrics = "  ".join(f"{metric}={result.mean(metric):.3f}±{result.half_width(metric):.3f}"
+                            for metric, _, _ in targets)
+        lines.append(f"{rank:>3}. avvik {result.violation(targets):.3f}  {metrics}  ({result.games} spill)")
+        lines.append(f"     {result.describe()}")
+    return "\n".join(lines)
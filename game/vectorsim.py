@@ -0,0 +1,510 @@
+# -*- coding: utf-8 -*-
+# vectorsim.py
+"""Vektorisert simulering: N AI-spill spilles i takt med NumPy (krever numpy).
+
+Tilstanden er lagret kolonnevis (struct of arrays): promille (tideler), minner, hender
+som kort-id-matriser, NPC-er per spiller som bool-matriser, NPC-er på byen og i bunken,
+kortstokk og sted per spill. Alle spill tar samme steg samtidig: fase, runde og plass.
+Uten kortbytte fjerner hver tur nøyaktig ett kort, så hver fase er fem runder i alle
+spill. Alle terninger og valg for et steg trekkes i ett kall for alle spillene.
+
+Reglene følger GameEngine.play_phase/player_turn og Card.play (med den kompilerte
+kort-effekttabellen) for to AI-strategier:
+  "random": tilfeldige valg, som standard-AI-en
+  "odds":   chugger bare når det lønner seg (OddsAgent), ellers tilfeldig
+
+Spillene bruker NumPy sin RNG og kan derfor ikke sammenlignes spill for spill med
+motoren. cross_check() sammenligner i stedet fordelingene fra de to simulatorene.
+"""
+
+import math
+import random
+import numpy as np
+from .effects import NPC_FLAG_BITS, NPC_CARD_FLAGS, compile_card_effects
+from .player import Player, MAX_PROMILLE_TENTHS
+from .probability import chug_expectation
+from .simulate import SimulationStats
+from .engine import GameEngine
+from .presenter import NullPresenter
+from .eventlog import EV_VOMIT
+from .ai import OddsAgent
+
+HAND_SIZE = 5
+TOWN_SIZE = 3
+POLICIES = ("random", "odds")
+
+# Handler-metoder i GameEngine -> kode i tabellen
+HANDLERS = {None: 0, "offer_npc_interaction": 1, "handle_know_beer_effect": 2, "handle_bong_choice": 3,
+            "handle_round_drinks": 4, "handle_icing": 5}
+H_CALL_FRIEND, H_KNOW_BEER, H_BONG, H_ROUND, H_ICING = 1, 2, 3, 4, 5
+
+# Kortene Bong kan byttes mot, og kortet alle får i "Ta en runde" (slås opp på navn, som i motoren)
+BONG_CARDS = ("Drikk en øl", "Drikk en drink", "Shot")
+BEER_CARD = "Drikk en øl"
+
+# Bonus-område for oppslag i chug-tabellen
+BONUS_RANGE = (-20, 40)
+
+NEVER = np.iinfo(np.int16).max  # Rangering for NPC-er spilleren ikke har
+
+
+def _tenths(value):
+    return int(round(value * 10))
+
+
+class VectorRules:
+    """Regelsettet kompilert til NumPy-tabeller (kort-effekter, sted- og NPC-effekter)"""
+
+    def __init__(self, places, cards, npcs, phases):
+        self.places, self.cards, self.npcs, self.phases = places, cards, npcs, list(phases)
+        num_cards, num_places, num_phases = len(cards), len(places), len(phases)
+        num_masks = 1 << len(NPC_CARD_FLAGS)
+        table = compile_card_effects(cards, places, self.phases)
+
+        shape = (num_cards, num_places, num_phases, num_masks)
+        resolutions = {}
+        for c, card in enumerate(cards):
+            for l, place in enumerate(places):
+                for f, phase in enumerate(self.phases):
+                    for mask in range(num_masks):
+                        resolutions[c, l, f, mask] = table.lookup(card, place, phase, mask)
+        steps = max((len(resolution.steps) for resolution in resolutions.values()), default=0)
+        self.chug = np.zeros(shape, bool)
+        self.promille = np.zeros(shape, np.int16)
+        self.memory = np.zeros(shape, np.int32)
+        self.step_promille = np.zeros(shape + (steps,), np.int16)
+        self.step_memory = np.zeros(shape + (steps,), np.int32)
+        self.handler = np.zeros(shape, np.int8)
+        self.enhanced = np.zeros(shape, bool)
+        for key, resolution in resolutions.items():
+            if resolution.handler not in HANDLERS:
+                raise ValueError(f"Handleren {resolution.handler} støttes ikke i vektorisert simulering")
+            self.chug[key] = resolution.chug
+            self.promille[key] = _tenths(resolution.promille_change)
+            self.memory[key] = resolution.minne_change
+            for k, (_, _, promille_change, minne_change, _) in enumerate(resolution.steps):
+                self.step_promille[key + (k,)] = _tenths(promille_change)
+                self.step_memory[key + (k,)] = minne_change
+            self.handler[key] = HANDLERS[resolution.handler]
+            self.enhanced[key] = bool(resolution.handler_args)
+
+        names = {card.name: card.id for card in cards}
+        self.bong_cards = np.array([names.get(name, -1) for name in BONG_CARDS])
+        self.beer_card = names.get(BEER_CARD, -1)
+
+        # Steder
+        def place_effect(key, default=0, scale=1):
+            return np.array([round(place.effects.get(key, default) * scale) for place in places])
+
+        self.has_bouncer = np.array([place.has_bouncer for place in places])
+        self.place_memory = place_effect("memory_bonus")
+        self.place_reduction = place_effect("promille_reduction", scale=10)
+        # Redningskast: terskel (tideler) og terningkrav per (sted, fase)
+        self.rescue_threshold = np.full((num_places, num_phases), 50, np.int16)
+        self.rescue_target = np.full((num_places, num_phases), 4, np.int16)
+        if "Nach" in self.phases:
+            nach = self.phases.index("Nach")
+            for place in places:
+                if "nach_rescue_threshold" in place.effects:
+                    self.rescue_threshold[place.id, nach] = _tenths(place.effects["nach_rescue_threshold"])
+                    self.rescue_target[place.id, nach] = 3
+
+        # NPC-er
+        def npc_effect(key, scale=1):
+            return np.array([round(npc.effects.get(key, 0) * scale) for npc in npcs], np.int32)
+
+        self.npc_promille_bonus = npc_effect("promille_bonus", 10)
+        self.npc_promille_penalty = npc_effect("promille_penalty", 10)
+        self.npc_memory_bonus = npc_effect("memory_bonus")
+        self.turn_start = np.array([npc.id for npc in npcs
+                                    if "turn_start_promille" in npc.effects or "turn_start_memory" in npc.effects],
+                                   np.intp)
+        self.turn_promille = npc_effect("turn_start_promille", 10)
+        self.turn_memory = npc_effect("turn_start_memory")
+        skill = npc_effect("skill_bonus")
+        self.skill_bonus = skill
+        self.rescue_bonus = npc_effect("rescue_bonus") + skill
+        self.bouncer_bonus = npc_effect("bouncer_bonus") + skill
+        self.chug_bonus = npc_effect("chug_bonus")
+        self.dring = np.array(["dring_effect" in npc.effects for npc in npcs])
+        self.brings = np.array(["brings_random_npc" in npc.effects for npc in npcs])
+        self.flag_bits = np.array([sum(bit for flag, bit in NPC_FLAG_BITS.items() if flag in npc.effects)
+                                   for npc in npcs], np.int8)
+
+        # Chugger "odds"-strategien ved gitt samlet bonus?
+        low, high = BONUS_RANGE
+        self.chug_pays = np.array([chug_expectation(bonus) > 0 for bonus in range(low, high + 1)])
+
+    @classmethod
+    def from_rulebook(cls, rulebook):
+        places, cards, npcs = rulebook.game_data()
+        return cls(places, cards, npcs, rulebook.phases)
+
+
+class VectorGames:
+    """N spill med num_players AI-spillere hver, spilt i takt"""
+
+    def __init__(self, rules, num_games, num_players, seed=None, policy="random", copies=5):
+        if policy not in POLICIES:
+            raise ValueError(f"Ukjent strategi '{policy}' (velg {', '.join(POLICIES)})")
+        deck_size = len(rules.cards) * copies
+        if num_players * HAND_SIZE * len(rules.phases) > deck_size:
+            raise ValueError(f"Vektorisert simulering støtter maks {deck_size // (HAND_SIZE * len(rules.phases))} "
+                             f"spillere (kortstokken må holde hele spillet)")
+        self.rules = rules
+        self.n = num_games
+        self.num_players = num_players
+        self.policy = policy
+        self.rng = np.random.default_rng(seed)
+        num_npcs = len(rules.npcs)
+
+        n, p = num_games, num_players
+        self.promille = np.zeros((n, p), np.int16)
+        self.memory = np.zeros((n, p), np.int32)
+        self.active = np.ones((n, p), bool)
+        self.held = np.zeros((n, p, num_npcs), bool)
+        self.rank = np.full((n, p, num_npcs), NEVER, np.int16)  # Når NPC-en ble hentet (rekkefølge)
+        self.next_rank = np.zeros((n, p), np.int16)
+        self.town = np.zeros((n, num_npcs), bool)
+        self.pool = np.ones((n, num_npcs), bool)
+        self.hand = np.zeros((n, p, HAND_SIZE), np.int8)
+        self.hand_size = np.zeros((n, p), np.int8)
+        self.place = np.zeros(n, np.intp)
+        self.visited = np.zeros((n, len(rules.places)), bool)
+        self.phase = 0
+        # Hver kortstokk er en stokket permutasjon av hele settet; spillet trekker fra starten
+        cards = np.repeat(np.arange(len(rules.cards), dtype=np.int8), copies)
+        self.deck = cards[np.argsort(self.rng.random((n, deck_size)), axis=1)]
+        self.deck_pos = np.zeros(n, np.intp)
+        self.vomits = np.zeros((n, p), np.int32)
+
+    # ---- Hjelpere ----
+
+    def _dice(self, size):
+        return self.rng.integers(1, 7, size)
+
+    def _add_promille(self, g, p, tenths):
+        self.promille[g, p] = np.clip(self.promille[g, p] + tenths, 0, MAX_PROMILLE_TENTHS)
+
+    def _standard_bonus(self, g, p):
+        promille = self.promille[g, p]
+        return ((promille >= 10) & (promille <= 30)).astype(np.int32)
+
+    def _npc_bonus(self, g, p, bonus):
+        return self.held[g, p] @ bonus
+
+    def _take_random(self, available, g):
+        """Tilfeldig NPC blant de tilgjengelige i hvert spill: (npc-id-er, om det fantes en)"""
+        keys = np.where(available[g], self.rng.random((len(g), available.shape[1])), -1.0)
+        return keys.argmax(axis=1), available[g].any(axis=1)
+
+    def _give_npc(self, g, p, npc):
+        self.held[g, p, npc] = True
+        self.rank[g, p, npc] = self.next_rank[g, p]
+        self.next_rank[g, p] += 1
+
+    def _apply_npc(self, g, p, npc):
+        rules = self.rules
+        self._add_promille(g, p, rules.npc_promille_bonus[npc])
+        self._add_promille(g, p, rules.npc_promille_penalty[npc])
+        self.memory[g, p] += rules.npc_memory_bonus[npc]
+
+    def _pool_npc(self, g, p):
+        """Gi en tilfeldig NPC fra bunken (trøst ved mislykket oppringing, eller Eddie)"""
+        npc, found = self._take_random(self.pool, g)
+        g, npc = g[found], npc[found]
+        self.pool[g, npc] = False
+        self._give_npc(g, p, npc)
+        self._apply_npc(g, p, npc)
+
+    def _refill_town(self, g):
+        for _ in range(TOWN_SIZE):
+            short = self.town[g].sum(axis=1) < TOWN_SIZE
+            g = g[short]
+            if not len(g):
+                return
+            npc, found = self._take_random(self.pool, g)
+            g, npc = g[found], npc[found]
+            self.pool[g, npc] = False
+            self.town[g, npc] = True
+
+    def _discard_random(self, g, p):
+        """Fjern et tilfeldig kort fra hånden; returnerer kortet"""
+        size = self.hand_size[g, p].astype(np.intp)
+        slot = (self.rng.random(len(g)) * size).astype(np.intp)
+        card = self.hand[g, p, slot]
+        self.hand[g, p, slot] = self.hand[g, p, size - 1]
+        self.hand_size[g, p] -= 1
+        return card
+
+    def _roll(self, g, p, bonus):
+        """d6 + promille-bonus + NPC-bonus for kast-typen"""
+        return self._dice(len(g)) + self._standard_bonus(g, p) + self._npc_bonus(g, p, bonus)
+
+    # ---- Spillet ----
+
+    def run(self):
+        """Spill alle spillene ferdig og returner vinnerplassen i hvert spill"""
+        self._refill_town(np.arange(self.n))
+        for self.phase in range(len(self.rules.phases)):
+            self._begin_phase()
+            for _ in range(HAND_SIZE):
+                for seat in range(self.num_players):
+                    self._turn(seat)
+            self.active[:] = True
+        return self.memory.argmax(axis=1)
+
+    def _begin_phase(self):
+        rules = self.rules
+        everyone = np.arange(self.n)
+        self.place = self.rng.integers(0, len(rules.places), self.n)
+        # Dørvakt første gang på stedet
+        g = everyone[rules.has_bouncer[self.place] & ~self.visited[everyone, self.place]]
+        for p in range(self.num_players):
+            target = self.promille[g, p] // 10 + 1
+            self.active[g, p] = self._roll(g, p, rules.bouncer_bonus) >= target
+        self.visited[everyone, self.place] = True
+        # Del ut kort og bruk sted-effekter ved rundestart
+        offsets = np.arange(HAND_SIZE)
+        for p in range(self.num_players):
+            g = everyone[self.active[:, p]]
+            self.hand[g, p] = self.deck[g[:, None], self.deck_pos[g, None] + offsets]
+            self.deck_pos[g] += HAND_SIZE
+            self.hand_size[g, p] = HAND_SIZE
+            self.memory[g, p] += rules.place_memory[self.place[g]]
+            self._add_promille(g, p, -rules.place_reduction[self.place[g]])
+
+    def _turn(self, p):
+        rules = self.rules
+        g = np.flatnonzero((self.hand_size[:, p] > 0) & self.active[:, p])
+        if not len(g):
+            return
+
+        # NPC-effekter ved turstart, i den rekkefølgen spilleren hentet NPC-ene
+        if len(rules.turn_start):
+            order = np.argsort(self.rank[g, p][:, rules.turn_start], axis=1, kind="stable")
+            for column in range(len(rules.turn_start)):
+                npc = rules.turn_start[order[:, column]]
+                has = self.held[g, p, npc]
+                self._add_promille(g[has], p, rules.turn_promille[npc[has]])
+                self.memory[g[has], p] += rules.turn_memory[npc[has]]
+
+        # Redningskast
+        place = self.place[g]
+        needs = self.promille[g, p] >= rules.rescue_threshold[place, self.phase]
+        rescue = g[needs]
+        failed = self._roll(rescue, p, rules.rescue_bonus) < rules.rescue_target[self.place[rescue], self.phase]
+        self._vomit(rescue[failed], p)
+        g = np.setdiff1d(g, rescue[failed], assume_unique=True)
+
+        # Dring: kast 3+ eller kast et kort uten effekt
+        dring = g[(self.held[g, p] & rules.dring).any(axis=1)]
+        blocked = dring[self._roll(dring, p, rules.skill_bonus) < 3]
+        self._discard_random(blocked, p)
+        g = np.setdiff1d(g, blocked, assume_unique=True)
+
+        # Spill et tilfeldig kort
+        self._play(g, p, self._discard_random(g, p))
+
+    def _vomit(self, g, p):
+        memory = self.memory[g, p]
+        loss = np.where(memory >= 0, memory // 2, -((-memory) // 2))  # int(minner * 0.5)
+        self.memory[g, p] -= loss
+        self._add_promille(g, p, -10)
+        self.vomits[g, p] += 1
+        has_cards = g[self.hand_size[g, p] > 0]
+        self._discard_random(has_cards, p)
+        for other in range(self.num_players):
+            if other != p:
+                self.memory[g, other] += 3
+
+    def _mask(self, g, p):
+        return np.bitwise_or.reduce(np.where(self.held[g, p], self.rules.flag_bits, 0), axis=1)
+
+    def _play(self, g, p, card):
+        """Card.play for kortene card (ett per spill i g) for spilleren på plass p"""
+        rules = self.rules
+        if not len(g):
+            return
+        key = (card, self.place[g], self.phase, self._mask(g, p))
+
+        # Øl: tilbud om å chugge først
+        chug = rules.chug[key]
+        offered = g[chug]
+        bonus = self._standard_bonus(offered, p) + self._npc_bonus(offered, p, rules.chug_bonus)
+        if self.policy == "odds":
+            wants = rules.chug_pays[np.clip(bonus, *BONUS_RANGE) - BONUS_RANGE[0]]
+        else:
+            wants = self.rng.random(len(offered)) < 0.5
+        chuggers, bonus = offered[wants], bonus[wants]
+        success = self._dice(len(chuggers)) + bonus >= 6
+        self.memory[chuggers, p] += np.where(success, 2, -1)
+
+        # Kortets effekt og ekstra steg fra sted og NPC-er, i samme rekkefølge som motoren
+        self._add_promille(g, p, rules.promille[key])
+        self.memory[g, p] += rules.memory[key]
+        steps_promille, steps_memory = rules.step_promille[key], rules.step_memory[key]
+        for k in range(steps_promille.shape[1]):
+            self._add_promille(g, p, steps_promille[:, k])
+            self.memory[g, p] += steps_memory[:, k]
+
+        handler = rules.handler[key]
+        if handler.any():
+            self._call_friend(g[handler == H_CALL_FRIEND], p)
+            know = handler == H_KNOW_BEER
+            self._know_beer(g[know], p, rules.enhanced[key][know])
+            self._bong(g[handler == H_BONG], p)
+            self._round_drinks(g[handler == H_ROUND])
+            self._icing(g[handler == H_ICING], p)
+
+    def _call_friend(self, g, p):
+        rules = self.rules
+        g = g[self.town[g].any(axis=1)]
+        if not len(g):
+            return
+        npc, _ = self._take_random(self.town, g)
+        success = self._roll(g, p, rules.skill_bonus) >= 3
+        # Kontakt: NPC-en fra byen, +1 minne, Eddie tar med en til, effektene, fyll opp byen
+        g_ok, npc_ok = g[success], npc[success]
+        self.town[g_ok, npc_ok] = False
+        self._give_npc(g_ok, p, npc_ok)
+        self.memory[g_ok, p] += 1
+        self._pool_npc(g_ok[rules.brings[npc_ok]], p)
+        self._apply_npc(g_ok, p, npc_ok)
+        self._refill_town(g_ok)
+        # Ingen kontakt: tilfeldig NPC fra bunken som trøst
+        self._pool_npc(g[~success], p)
+
+    def _know_beer(self, g, p, enhanced):
+        for other in range(self.num_players):
+            drunk = self.promille[g, other] >= 20
+            bonus = np.where(enhanced, 4, 2) if other == p else 2
+            self.memory[g, other] += np.where(drunk, bonus, 0)
+        sober = (self.promille[g, p] < 20) & (self.memory[g, p] > 0)
+        self.memory[g[sober], p] -= 1
+
+    def _bong(self, g, p):
+        card = self.rules.bong_cards[self.rng.integers(0, len(BONG_CARDS), len(g))]
+        chosen = card >= 0
+        self._play(g[chosen], p, card[chosen])
+
+    def _round_drinks(self, g):
+        beer = self.rules.beer_card
+        if beer < 0:
+            return
+        for other in range(self.num_players):
+            self._play(g, other, np.full(len(g), beer))
+
+    def _icing(self, g, p):
+        player_roll = self._dice(len(g)) + self._standard_bonus(g, p)
+        matches = np.zeros(len(g), np.int32)
+        for other in range(self.num_players):
+            if other == p:
+                continue
+            match = np.abs(self._dice(len(g)) + self._standard_bonus(g, other) - player_roll) <= 1
+            self._add_promille(g[match], other, 5)
+            matches += match
+        self.memory[g, p] += matches
+
+    # ---- Resultater ----
+
+    def stats(self):
+        """Resultatene som SimulationStats (samme rapport som den vanlige simuleringen)"""
+        stats = SimulationStats(self.num_players)
+        best = self.memory.max(axis=1, keepdims=True)
+        winners = self.memory == best
+        stats.games = self.n
+        stats.wins = [int(count) for count in winners.sum(axis=0)]
+        stats.ties = int((winners.sum(axis=1) > 1).sum())
+        half_steps, counts = np.unique(np.round(self.promille / 5).astype(int), return_counts=True)
+        stats.promille_counts.update(dict(zip(half_steps.tolist(), counts.tolist())))
+        memories, counts = np.unique(self.memory, return_counts=True)
+        stats.memory_counts.update(dict(zip(memories.tolist(), counts.tolist())))
+        stats.memory_total = int(self.memory.sum())
+        return stats
+
+
+def run_vectorized(rulebook, num_games, num_players=4, seed=None, policy="random", batch_size=50000):
+    """Spill num_games spill i batcher på batch_size i takt; returnerer SimulationStats"""
+    rules = VectorRules.from_rulebook(rulebook)
+    seeds = np.random.SeedSequence(seed)
+    stats = SimulationStats(num_players)
+    remaining = num_games
+    for child in seeds.spawn(max(1, math.ceil(num_games / batch_size))):
+        size = min(batch_size, remaining)
+        if size <= 0:
+            break
+        games = VectorGames(rules, size, num_players, seed=child, policy=policy)
+        games.run()
+        stats.merge(games.stats())
+        remaining -= size
+    return stats
+
+
+def _summary(memory, promille, wins_seat0, vomits):
+    """(snitt, standardfeil) for målene som sammenlignes"""
+    def mean_se(values):
+        values = np.asarray(values, float)
+        return values.mean(), values.std(ddof=1) / math.sqrt(len(values))
+    return {
+        "minner per spiller": mean_se(memory),
+        "sluttpromille per spiller": mean_se(promille),
+        "vinnerrate plass 1": mean_se(wins_seat0),
+        "oppkast per spiller": mean_se(vomits),
+    }
+
+
+def cross_check(rulebook, num_games=5000, num_players=4, seed=None, policy="random"):
+    """Sammenlign vektorisert simulering med GameEngine over like mange spill med samme seed.
+
+    RNG-strømmene er ulike, så sammenligningen er statistisk: returnerer
+    [(mål, vektorisert, motor, z)] der |z| over ~4 tyder på en regelforskjell.
+    """
+    games = VectorGames(VectorRules.from_rulebook(rulebook), num_games, num_players, seed=seed, policy=policy)
+    winner = games.run()
+    vector = _summary(games.memory.ravel(), games.promille.ravel() / 10, winner == 0, games.vomits.ravel())
+
+    places, cards, npcs = rulebook.game_data()
+    seeds = random.Random(seed)
+    counter = _VomitCounter()
+    memory, promille, wins, vomits = [], [], [], []
+    for _ in range(num_games):
+        agent = OddsAgent() if policy == "odds" else None
+        players = [Player(f"AI_{i+1}", is_human=False, agent=agent) for i in range(num_players)]
+        GameEngine(players, places, cards, npcs, presenter=NullPresenter(), seed=seeds.getrandbits(64),
+                   event_log=counter).start_game()
+        memory.extend(player.memory for player in players)
+        promille.extend(player.promille for player in players)
+        wins.append(max(range(num_players), key=lambda seat: players[seat].memory) == 0)
+        vomits.extend(counter.take(num_players))
+    scalar = _summary(memory, promille, wins, vomits)
+
+    results = []
+    for name, (vector_mean, vector_se) in vector.items():
+        scalar_mean, scalar_se = scalar[name]
+        se = math.hypot(vector_se, scalar_se)
+        results.append((name, vector_mean, scalar_mean, (vector_mean - scalar_mean) / se if se else 0.0))
+    return results
+
+
+class _VomitCounter:
+    """Hendelsesmottaker som teller oppkast per plass i ett spill"""
+
+    def __init__(self):
+        self.counts = {}
+
+    def start(self, engine):
+        self.counts = {}
+
+    def begin_turn(self, engine, seat):
+        pass
+
+    def record(self, kind, *values):
+        if kind == EV_VOMIT:
+            self.counts[values[0]] = self.counts.get(values[0], 0) + 1
+
+    def game_over(self, engine, winner):
+        pass
+
+    def take(self, num_players):
+        return [self.counts.get(seat, 0) for seat in range(num_players)]
@@ -1,25 +1,32 @@
 # -*- coding: utf-8 -*-
 # main.py
 
-import json
+import argparse
+import sys
+import time
 from game.player import Player
-from game.card import Card
-from game.place import Place
 from game.engine import GameEngine
+from game.loader import load_game_data
+from game.ai import MCTSAgent, OddsAgent
+from game.policy import PolicyAgent
+from game.eventlog import EventLog
+from game.presenter import TerminalPresenter
+from game.clock import AnimationClock
+from game.lobby import LARGE_LOBBY, MAX_PLAYERS
 
-def setup_players():
-    """Opprett spillere basert på bruker-input"""
+def setup_players(make_agent=None):
+    """Opprett spillere basert på bruker-input (make_agent lager agent for AI-spillere)"""
     print("\n--- Velkommen til SMØR ---")
     print("Sjefen og Sårds ølduell")
     
     # Få antall spillere
     while True:
         try:
-            num_players = int(input("\nHvor mange spillere? (maks 4): "))
-            if 1 <= num_players <= 4:
+            num_players = int(input(f"\nHvor mange spillere? (maks {MAX_PLAYERS}, over {LARGE_LOBBY} gir stor lobby): "))
+            if 1 <= num_players <= MAX_PLAYERS:
                 break
             else:
-                print("Vennligst velg mellom 1 og 4 spillere.")
+                print(f"Vennligst velg mellom 1 og {MAX_PLAYERS} spillere.")
         except ValueError:
             print("Vennligst skriv inn et tall.")
     
@@ -48,35 +55,334 @@ def setup_players():
     
     # Opprett AI-spillere
     for i in range(num_players - num_humans):
-        players.append(Player(f"AI_{i+1}", is_human=False))
+        players.append(Player(f"AI_{i+1}", is_human=False, agent=make_agent() if make_agent else None))
     
     return players
 
-def main():
-    """Hovedfunksjonen"""
+def run_simulate(args):
+    """Spill mange AI-mot-AI-spill i parallell og skriv ut statistikk"""
+    from game.simulate import run_simulation
+
+    if args.vectorized or args.cross_check:
+        run_vectorized_simulate(args)
+        return
+    if args.policy_seats:
+        load_policy_table(args.policy_table, args.data).close()  # Feil her, ikke i hver prosess
+    stats, elapsed = run_simulation(args.games, num_players=args.players, workers=args.workers,
+                                    batch_size=args.batch, seed=args.seed, data_dir=args.data,
+                                    mcts_seats=args.mcts_seats, mcts_budget=args.mcts_budget,
+                                    ai_trading=args.ai_trading, analytics=args.analytics is not None,
+                                    profile=("memory" if args.trace_memory else "time") if args.profile else None,
+                                    policy_seats=args.policy_seats, policy_path=args.policy_table)
+    print(stats.report(elapsed))
+    if stats.balance is not None:
+        paths = stats.balance.to_csv(args.analytics)
+        print(f"\n📈 Balansetabeller skrevet til {', '.join(paths)}")
+    if stats.profile is not None:
+        stats.profile.write(args.profile)
+        print("\n⏱️  Dyreste deler av motoren:")
+        print(stats.profile.report())
+        print(f"Målinger skrevet til {args.profile}")
+
+def run_vectorized_simulate(args):
+    """Spill alle spillene i takt med NumPy (og sammenlign eventuelt med motoren)"""
     try:
-        # ---- Les inn data ----
-        with open("data/places.json", encoding='utf-8') as f:
-            places_data = json.load(f)
+        from game.vectorsim import run_vectorized, cross_check
+    except ImportError:
+        raise SystemExit("❌ Vektorisert simulering krever numpy (pip install numpy)")
+    from game.rules import load_rulebook
+
+    rulebook = load_rulebook(args.data)
+    try:
+        if args.cross_check:
+            print(f"🔍 Sammenligner vektorisert simulering med motoren over {args.games} spill ...")
+            print(f"  {'mål':<28} {'vektor':>9} {'motor':>9}")
+            for name, vector, scalar, z in cross_check(rulebook, args.games, args.players, args.seed, args.policy):
+                print(f"  {name:<28} {vector:>9.3f} {scalar:>9.3f}  z={z:+.2f}")
+            return
+        start = time.perf_counter()
+        stats = run_vectorized(rulebook, args.games, args.players, args.seed, args.policy)
+    except ValueError as error:
+        raise SystemExit(f"❌ {error}")
+    print(stats.report(time.perf_counter() - start))
+
+def load_policy_table(path, data_dir="data"):
+    """Åpne policy-tabellen og sjekk at den er løst for regelsettet i data_dir"""
+    from game.rules import load_rulebook
+    from game.policy import PolicyTable
+
+    try:
+        table = PolicyTable(path)
+    except OSError as error:
+        raise SystemExit(f"❌ Fant ikke policy-tabellen ({error.strerror}); lag den med 'python main.py solve --out {path}'")
+    except ValueError as error:
+        raise SystemExit(f"❌ {error}")
+    try:
+        table.check(load_rulebook(data_dir))
+    except ValueError as error:
+        table.close()
+        raise SystemExit(f"❌ {error}")
+    return table
+
+def run_solve(args):
+    """Løs DP-modellen for regelsettet og skriv policy-tabellen"""
+    try:
+        from game.solver import solve_policy
+    except ImportError:
+        raise SystemExit("❌ DP-løseren krever numpy (pip install numpy)")
+    from game.rules import load_rulebook
+
+    rulebook = load_rulebook(args.data)
+    start = time.perf_counter()
+    try:
+        solver = solve_policy(rulebook, args.out, num_players=args.players)
+    except ValueError as error:
+        raise SystemExit(f"❌ {error}")
+    print(f"🧮 Policy-tabell skrevet til {args.out} på {time.perf_counter() - start:.1f} s "
+          f"({solver.table.nbytes / 1e6:.1f} MB)")
+    print(f"🧠 Forventede minner i modellen (én spiller, uten motspillere): {solver.expected_memory():.2f}")
+
+def run_tune(args):
+    """Søk etter regelsett som treffer balansemålene og skriv de beste til args.out"""
+    from game.tuner import (load_raw_rules, parse_param, parse_target, default_params, tune, report,
+                            write_candidates)
+
+    raw = load_raw_rules(args.data)
+    try:
+        params = [parse_param(spec) for spec in args.param] or default_params(raw)
+        targets = [parse_target(spec) for spec in args.target]
+    except ValueError as error:
+        raise SystemExit(f"❌ {error}")
+    if not targets:
+        raise SystemExit("Oppgi minst ett mål med --target (f.eks. --target vomit_rate=0.3:0.6)")
 
-        with open("data/cards.json", encoding='utf-8') as f:
-            cards_data = json.load(f)
+    def progress(result):
+        status = "ugyldig" if result.error is not None else f"avvik {result.violation(targets):.3f}, {result.games} spill"
+        print(f"🔧 {result.describe()}: {status}")
 
-        with open("data/npcs.json", encoding='utf-8') as f:
-            npcs_data = json.load(f)
+    results = tune(raw, params, targets, num_candidates=args.candidates, num_players=args.players,
+                   batch_size=args.batch, max_games=args.max_games, tolerance=args.tolerance,
+                   workers=args.workers, seed=args.seed, progress=progress)
+    print("\n🏆 Rangerte kandidater:")
+    print(report(results, targets))
+    directories = write_candidates(results, args.out, keep=args.keep)
+    print(f"\n📁 Regelfiler skrevet til {', '.join(directories)}")
 
-        # ---- Lag objekter ----
-        places = [Place(p["name"], p.get("effects"), p.get("displayText", ""), p.get("effectDescriptions", {}), p.get("hasBouncer", False)) for p in places_data]
-        cards = [Card(c["name"], c.get("promille_change",0), c.get("minne_change",0), c.get("special_effect"), c.get("displayText", "")) for c in cards_data]
+def run_serve(args):
+    """Start spillserveren (mange samtidige spill i én prosess)"""
+    import asyncio
+    from game.rules import load_rulebook
+    from game.server import GameServer
+    from game.store import SessionStore
+    from game.profiler import Profiler
+
+    rulebook = load_rulebook(args.data)
+    store = SessionStore(rulebook, args.sessions_dir, max_sessions=args.max_sessions, ttl=args.ttl,
+                         durable=args.fsync)
+    profiler = Profiler(trace_memory=args.trace_memory) if args.metrics else None
+    server = GameServer(rulebook, store=store, profiler=profiler, metrics_path=args.metrics)
+    print(f"🌐 Spillserver lytter på {args.host}:{args.port}")
+    try:
+        asyncio.run(server.serve(args.host, args.port))
+    except KeyboardInterrupt:
+        print("\nServeren ble stoppet.")
+
+def run_client_command(args):
+    """Koble til en spillserver som spiller (eller bot)"""
+    import asyncio
+    from game.client import run_client
+
+    try:
+        asyncio.run(run_client(args.host, args.port, args.name, session=args.join, players=args.players,
+                               seed=args.seed, bot=args.bot, start=args.start))
+    except KeyboardInterrupt:
+        print("\n\nSpillet ble avbrutt.")
+
+def run_replay(args):
+    """Vis hendelsene i en hendelseslogg fra nærmeste keyframe før en gitt tur"""
+    from game.eventlog import EventLogReader
+
+    reader = EventLogReader(args.log)
+    header = reader.header
+    print(f"📼 Seed {header['seed']}, spillere: {', '.join(header['players'])}")
+    keyframe_turn, snapshot, events = reader.seek(args.turn)
+    if snapshot is not None:
+        print(f"\n📊 STATUS VED TUR {keyframe_turn}:")
+        for name, state in zip(header["players"], snapshot[-1]):
+            npc_names = ", ".join(header["npcs"][i] for i in state[3]) or "Ingen"
+            print(f"{name:<12} {state[0] / 10:<8.1f} {state[1]:<7} {npc_names}")
+        print()
+    last_turn = args.turn + args.turns
+    for turn, name, values in events:
+        if turn >= last_turn:
+            break
+        if turn >= args.turn or args.all:
+            print(f"[{turn:>3}] {reader.describe(name, values)}")
+
+def run_protocol_command(args):
+    """Spill mot en ekstern bot over stdin/stdout (JSON-linjer, ingen annen utskrift)"""
+    from game.rules import load_rulebook
+    from game.protocol import run_protocol
+
+    rulebook = load_rulebook("data")
+    try:
+        run_protocol(rulebook, sys.stdin, sys.stdout, num_players=args.seats, bots=args.bots, games=args.games,
+                     seed=args.seed)
+    except ValueError as error:
+        raise SystemExit(f"❌ {error}")
+    except (KeyboardInterrupt, BrokenPipeError):
+        pass
+
+def parse_args(argv=None):
+    """Les kommandolinje-argumenter (uten argumenter startes interaktivt spill)"""
+    parser = argparse.ArgumentParser(description="SMØR: Sjefen og Sårds ølduell")
+    parser.add_argument("--seed", type=int, default=None, help="Seed for terning, stokking og AI-valg")
+    parser.add_argument("--ai", choices=["random", "odds", "mcts", "policy"], default="random", help="Type AI-motstander")
+    parser.add_argument("--ai-budget", type=float, default=0.05, help="Tenketid per MCTS-beslutning i sekunder")
+    parser.add_argument("--policy-table", default="policy.smr", help="Policy-tabell fra 'solve' (med --ai policy og simulate --policy-seats)")
+    parser.add_argument("--event-log", default=None, help="Skriv alle hendelser i spillet til denne filen")
+    parser.add_argument("--time-scale", type=float, default=1.0,
+                        help="Ganges med alle pauser og animasjoner (0.5 = dobbel fart, 0 = ingen pauser)")
+    parser.add_argument("--protocol", choices=["jsonl"], default=None,
+                        help="Styr spillet fra en ekstern bot: én JSON-linje per beslutning på stdout/stdin")
+    parser.add_argument("--seats", type=int, default=4, help="Plasser ved bordet (med --protocol)")
+    parser.add_argument("--bots", type=int, default=1, help="Plasser (fra den første) styrt av boten (med --protocol)")
+    parser.add_argument("--games", type=int, default=None,
+                        help="Antall spill (med --protocol standard 1, 0 = til stdin lukkes; med simulate standard 10000)")
+    # Valg som også finnes på toppnivå har default=SUPPRESS i underkommandoene, så
+    # "main.py --seed 5 simulate" og "main.py simulate --seed 5" gir samme resultat
+    subparsers = parser.add_subparsers(dest="command")
+
+    simulate = subparsers.add_parser("simulate", help="Spill mange AI-spill og vis balanse-statistikk")
+    simulate.add_argument("--games", type=int, default=argparse.SUPPRESS, help="Antall spill (standard 10000)")
+    simulate.add_argument("--players", type=int, default=4, help="Spillere per spill (standard 4)")
+    simulate.add_argument("--workers", type=int, default=None, help="Antall prosesser (standard: alle kjerner)")
+    simulate.add_argument("--batch", type=int, default=500, help="Spill per oppgave til hver prosess")
+    simulate.add_argument("--seed", type=int, default=argparse.SUPPRESS, help="Seed for reproduserbare kjøringer")
+    simulate.add_argument("--data", default="data", help="Mappe med JSON-data")
+    simulate.add_argument("--mcts-seats", type=int, default=0, help="Antall plasser (fra AI_1) som spilles av MCTS")
+    simulate.add_argument("--mcts-budget", type=float, default=0.05, help="Tenketid per MCTS-beslutning i sekunder")
+    simulate.add_argument("--ai-trading", action="store_true", help="La AI-ene bytte kort og sende vekk venner")
+    simulate.add_argument("--analytics", default=None, metavar="DIR",
+                          help="Samle statistikk per kort/NPC/sted/fase og skriv CSV-tabeller til DIR")
+    simulate.add_argument("--profile", default=None, metavar="PATH",
+                          help="Mål tid per fase/tur/handler og skriv til PATH (.json, ellers Prometheus-tekst)")
+    simulate.add_argument("--trace-memory", action="store_true", help="Ta tracemalloc-snapshots per fase (med --profile)")
+    simulate.add_argument("--vectorized", action="store_true",
+                          help="Spill alle spillene i takt med NumPy (tilfeldig AI uten kortbytte)")
+    simulate.add_argument("--policy", choices=("random", "odds"), default="random",
+                          help="AI-strategi i vektorisert simulering (odds: chugger bare når det lønner seg)")
+    simulate.add_argument("--cross-check", action="store_true",
+                          help="Sammenlign vektorisert simulering med motoren over --games spill")
+    simulate.add_argument("--policy-seats", type=int, default=0,
+                          help="Antall plasser (etter MCTS-plassene) som spilles etter policy-tabellen")
+    simulate.add_argument("--policy-table", default=argparse.SUPPRESS, help="Policy-tabell fra 'solve'")
+
+    solve = subparsers.add_parser("solve", help="Løs spillet med DP og skriv policy-tabellen")
+    solve.add_argument("--out", default="policy.smr", help="Fil for policy-tabellen (standard policy.smr)")
+    solve.add_argument("--players", type=int, default=4, help="Spillere ved bordet (motspillere i Ice'ing)")
+    solve.add_argument("--data", default="data", help="Mappe med JSON-data")
+
+    tune = subparsers.add_parser("tune", help="Søk etter regelparametre som treffer balansemål")
+    tune.add_argument("--param", action="append", default=[],
+                      help="Parameter å variere, f.eks. npcs.Tord.chug_bonus=1:4 (standard: alle NPC-/sted-tall)")
+    tune.add_argument("--target", action="append", default=[],
+                      help="Mål, f.eks. npc_lift=:0.05 eller vomit_rate=0.3:0.6")
+    tune.add_argument("--candidates", type=int, default=20, help="Antall kandidat-regelsett")
+    tune.add_argument("--players", type=int, default=4, help="Spillere per spill")
+    tune.add_argument("--batch", type=int, default=200, help="Spill per batch")
+    tune.add_argument("--max-games", type=int, default=20000, help="Maks spill per kandidat")
+    tune.add_argument("--tolerance", type=float, default=0.01, help="Ønsket halv bredde på konfidensintervallene")
+    tune.add_argument("--workers", type=int, default=None, help="Antall prosesser (standard: alle kjerner)")
+    tune.add_argument("--seed", type=int, default=argparse.SUPPRESS, help="Seed for søket og spillene")
+    tune.add_argument("--data", default="data", help="Mappe med JSON-data")
+    tune.add_argument("--out", default="tuned", help="Mappe for de beste regelsettene")
+    tune.add_argument("--keep", type=int, default=5, help="Antall regelsett som skrives")
+
+    serve = subparsers.add_parser("serve", help="Start spillserver for nettverksspill")
+    serve.add_argument("--host", default="127.0.0.1", help="Adresse å lytte på")
+    serve.add_argument("--port", type=int, default=8765, help="Port å lytte på")
+    serve.add_argument("--data", default="data", help="Mappe med JSON-data")
+    serve.add_argument("--sessions-dir", default=None, help="Mappe for lagrede sesjoner (standard: kun i minnet)")
+    serve.add_argument("--max-sessions", type=int, default=10000, help="Maks antall sesjoner i minnet")
+    serve.add_argument("--ttl", type=float, default=900.0, help="Sekunder før en inaktiv sesjon kastes ut av minnet")
+    serve.add_argument("--fsync", action="store_true", help="fsync etter hver samlet skriving av sesjoner")
+    serve.add_argument("--metrics", default=None, metavar="PATH",
+                       help="Mål motoren i alle sesjoner og skriv jevnlig til PATH (.json, ellers Prometheus-tekst)")
+    serve.add_argument("--trace-memory", action="store_true", help="Ta tracemalloc-snapshots per fase (med --metrics)")
+
+    client = subparsers.add_parser("client", help="Koble til en spillserver")
+    client.add_argument("--host", default="127.0.0.1", help="Serverens adresse")
+    client.add_argument("--port", type=int, default=8765, help="Serverens port")
+    client.add_argument("--name", default="Spiller", help="Navnet ditt")
+    client.add_argument("--join", type=int, default=None, help="Bli med i en eksisterende sesjon (ellers nytt bord)")
+    client.add_argument("--players", type=int, default=4, help="Plasser ved nytt bord (ledige blir AI)")
+    client.add_argument("--seed", type=int, default=argparse.SUPPRESS, help="Seed for nytt bord (og bot-valg)")
+    client.add_argument("--bot", action="store_true", help="Velg tilfeldig i stedet for å spørre")
+    client.add_argument("--start", action="store_true", help="Start nytt bord med en gang")
+
+    replay = subparsers.add_parser("replay", help="Vis hendelser fra en hendelseslogg")
+    replay.add_argument("log", help="Hendelseslogg skrevet med --event-log")
+    replay.add_argument("--turn", type=int, default=0, help="Første tur som vises (hopper til nærmeste keyframe)")
+    replay.add_argument("--turns", type=int, default=1000, help="Antall turer som vises")
+    replay.add_argument("--all", action="store_true", help="Vis også hendelsene fra keyframen frem til --turn")
+    args = parser.parse_args(argv)
+    if args.games is None:
+        args.games = 10000 if args.command == "simulate" else 1
+    return args
+
+def main(argv=None):
+    """Hovedfunksjonen"""
+    args = parse_args(argv)
+    if args.command == "simulate":
+        run_simulate(args)
+        return
+    if args.command == "tune":
+        run_tune(args)
+        return
+    if args.command == "solve":
+        run_solve(args)
+        return
+    if args.command == "serve":
+        run_serve(args)
+        return
+    if args.command == "client":
+        run_client_command(args)
+        return
+    if args.command == "replay":
+        run_replay(args)
+        return
+    if args.protocol:
+        run_protocol_command(args)
+        return
+
+    try:
+        # ---- Les inn data ----
+        places, cards, npcs = load_game_data("data")
 
         # ---- Opprett spillere ----
-        players = setup_players()
+        if args.ai == "mcts":
+            make_agent = lambda: MCTSAgent(time_budget=args.ai_budget)
+        elif args.ai == "odds":
+            make_agent = OddsAgent
+        elif args.ai == "policy":
+            table = load_policy_table(args.policy_table)
+            make_agent = lambda: PolicyAgent(table)
+        else:
+            make_agent = None
+        players = setup_players(make_agent)
         
         print(f"\nSpillere: {', '.join([p.name for p in players])}")
 
         # ---- Start spillmotor ----
-        game = GameEngine(players, places, cards, npcs_data)
-        game.start_game()
+        event_log = EventLog(args.event_log) if args.event_log else None
+        presenter = TerminalPresenter(clock=AnimationClock(scale=args.time_scale))
+        game = GameEngine(players, places, cards, npcs, presenter=presenter, seed=args.seed, event_log=event_log)
+        try:
+            game.start_game()
+        finally:
+            if event_log is not None:
+                event_log.close()
         
     except KeyboardInterrupt:
         print("\n\nSpillet ble avbrutt.")